@@ -120,7 +120,8 @@ setup(name=PACKAGENAME,
                         'astropy>=1.3',
                         'scipy',
                         'pandas>=0.12.0',
-                        'matplotlib>=1.1'],
+                        'matplotlib>=1.1',
+                        'futures; python_version < "3"'],
       extras_require=extras_require,
       provides=[PACKAGENAME],
       author=AUTHOR,
@@ -1,9 +1,12 @@
 import numpy as np
 
 import astropy.units as u
+from astropy.time import Time
 from astropy.tests.helper import quantity_allclose
 
-from sunpy.coordinates import Helioprojective
+from sunpy import sun
+from sunpy.coordinates import Helioprojective, HeliographicStonyhurst, HeliographicCarrington
+from sunpy.coordinates import transformations
 
 
 def test_hpc_hpc():
@@ -44,3 +47,31 @@ def test_hpc_hpc_null():
     assert quantity_allclose(hpc_new.D0, hpc_in.D0)
     assert quantity_allclose(hpc_new.B0, hpc_in.B0)
     assert quantity_allclose(hpc_new.L0, hpc_in.L0)
+
+
+def test_carrington_offset_cache():
+    times = Time('2012-01-01T00:00:00') + np.arange(5) * u.hour
+    transformations._offset_cache.clear()
+
+    # Repeated times are only calculated once
+    offsets = transformations._carrington_offset(times[[0, 1, 1, 4, 0]])
+    assert offsets.shape == (5,)
+    assert len(transformations._offset_cache) == 3
+    for offset, time in zip(offsets, times[[0, 1, 1, 4, 0]]):
+        assert quantity_allclose(offset, sun.heliographic_solar_center(time)[0])
+
+    # A single time gives a single offset, from the cache
+    offset = transformations._carrington_offset(times[1])
+    assert offset.isscalar
+    assert quantity_allclose(offset, offsets[1])
+    assert len(transformations._offset_cache) == 3
+
+
+def test_hgs_hgc_roundtrip_cached():
+    hgs = HeliographicStonyhurst(np.arange(10) * u.deg, np.arange(10) * u.deg,
+                                 dateobs='2012-01-01T00:00:00')
+    hgc = hgs.transform_to(HeliographicCarrington(dateobs='2012-01-01T00:00:00'))
+    offset = sun.heliographic_solar_center(hgs.dateobs)[0]
+    assert quantity_allclose(hgc.lon, (hgs.lon + offset).wrap_at(180 * u.deg))
+    back = hgc.transform_to(HeliographicStonyhurst(dateobs='2012-01-01T00:00:00'))
+    assert quantity_allclose(back.lon, hgs.lon, atol=1e-10 * u.deg)
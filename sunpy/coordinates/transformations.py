@@ -7,9 +7,14 @@ This module contains the functions for converting one
 """
 from __future__ import absolute_import, division
 
+import threading
+from collections import OrderedDict
+
 import numpy as np
 
 from astropy import units as u
+from astropy.time import Time
+from astropy.coordinates import Longitude
 from astropy.coordinates.representation import (CartesianRepresentation,
                                                 UnitSphericalRepresentation)
 from astropy.coordinates.baseframe import frame_transform_graph
@@ -25,14 +30,53 @@ from .frames import (HeliographicStonyhurst, HeliographicCarrington,
 __all__ = ['hgs_to_hgc', 'hgc_to_hgs', 'hcc_to_hpc',
            'hpc_to_hcc', 'hcc_to_hgs', 'hgs_to_hcc']
 
+# The number of Carrington longitude offsets that are kept, by time
+_OFFSET_CACHE_SIZE = 4096
+_offset_cache = OrderedDict()
+_offset_lock = threading.Lock()
+
+
 def _carrington_offset(dateobs):
     """
     Calculate the HG Longitude offest based on a time
+
+    The offsets are cached by time, so that transforming many coordinates
+    with the same few observation times evaluates the ephemeris once per time.
+    If ``dateobs`` is an array of times, the offsets of all the distinct times
+    which are not cached yet are calculated in one vectorised call, and an
+    array of offsets is returned.
     """
     if dateobs is None:
         raise ValueError("To perform this transformation the coordinate"
                          " Frame needs a dateobs Attribute")
-    return sun.heliographic_solar_center(dateobs)[0]
+    if not isinstance(dateobs, Time):
+        return sun.heliographic_solar_center(dateobs)[0]
+
+    keys = [(dateobs.scale, jd1, jd2) for jd1, jd2 in
+            zip(np.ravel(dateobs.jd1), np.ravel(dateobs.jd2))]
+    offsets = {}
+    with _offset_lock:
+        for key in keys:
+            if key not in offsets:
+                offset = _offset_cache.pop(key, None)
+                if offset is not None:
+                    _offset_cache[key] = offset
+                    offsets[key] = offset
+    missing = [key for key in set(keys) if key not in offsets]
+
+    if missing:
+        times = Time([key[1] for key in missing], [key[2] for key in missing],
+                     format='jd', scale=dateobs.scale)
+        values = sun.heliographic_solar_center(times)[0].to(u.deg).value
+        offsets.update(zip(missing, values))
+        with _offset_lock:
+            for key, value in zip(missing, values):
+                _offset_cache[key] = value
+            while len(_offset_cache) > _OFFSET_CACHE_SIZE:
+                _offset_cache.popitem(last=False)
+
+    result = np.array([offsets[key] for key in keys]).reshape(dateobs.shape)
+    return Longitude(result, u.deg)
 
 # =============================================================================
 # ------------------------- Transformation Framework --------------------------
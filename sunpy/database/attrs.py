@@ -153,24 +153,24 @@ class FitsHeaderEntry(Attr):
 walker = AttrWalker()
 
 
-@walker.add_creator(AttrOr)
+@walker.add_creator(AttrAnd, AttrOr, ValueAttr)
 def _create(wlk, root, session):
-    entries = set()
-    for attr in root.attrs:
-        # make sure to add only new entries to the set to avoid duplicates
-        entries.update(set(wlk.create(attr, session)) - entries)
-    return list(entries)
+    return session.query(DatabaseEntry).filter(wlk.apply(root)).all()
 
 
-@walker.add_creator(AttrAnd)
-def _create(wlk, root, session):
-    entries = [set(wlk.create(attr, session)) for attr in root.attrs]
-    return list(set.intersection(*entries))
+@walker.add_applier(AttrOr)
+def _apply(wlk, root):
+    return or_(*[wlk.apply(attr) for attr in root.attrs])
 
 
-@walker.add_creator(ValueAttr)
-def _create(wlk, root, session):
-    query = session.query(DatabaseEntry)
+@walker.add_applier(AttrAnd)
+def _apply(wlk, root):
+    return and_(*[wlk.apply(attr) for attr in root.attrs])
+
+
+@walker.add_applier(ValueAttr)
+def _apply(wlk, root):
+    criteria = []
     for key, value in six.iteritems(root.attrs):
         typ = key[0]
         if typ == 'tag':
@@ -179,52 +179,52 @@ def _create(wlk, root, session):
             # that if it is True, the given tag must not be included in the
             # resulting entries.
             if key[1]:
-                query = query.filter(~DatabaseEntry.tags.any(criterion))
+                criteria.append(~DatabaseEntry.tags.any(criterion))
             else:
-                query = query.filter(DatabaseEntry.tags.any(criterion))
+                criteria.append(DatabaseEntry.tags.any(criterion))
         elif typ == 'fitsheaderentry':
             key, val, inverted = value
             key_criterion = TableFitsHeaderEntry.key == key
             value_criterion = TableFitsHeaderEntry.value == val
             if inverted:
-                query = query.filter(not_(and_(
+                criteria.append(not_(and_(
                     DatabaseEntry.fits_header_entries.any(key_criterion),
                     DatabaseEntry.fits_header_entries.any(value_criterion))))
             else:
-                query = query.filter(and_(
+                criteria.append(and_(
                     DatabaseEntry.fits_header_entries.any(key_criterion),
                     DatabaseEntry.fits_header_entries.any(value_criterion)))
         elif typ == 'download time':
             start, end, inverted = value
             if inverted:
-                query = query.filter(
+                criteria.append(
                     ~DatabaseEntry.download_time.between(start, end))
             else:
-                query = query.filter(
+                criteria.append(
                     DatabaseEntry.download_time.between(start, end))
         elif typ == 'path':
             path, inverted = value
             if inverted:
                 # pylint: disable=E711
-                query = query.filter(or_(
+                criteria.append(or_(
                     DatabaseEntry.path != path, DatabaseEntry.path == None))
             else:
-                query = query.filter(DatabaseEntry.path == path)
+                criteria.append(DatabaseEntry.path == path)
         elif typ == 'wave':
             wavemin, wavemax, waveunit = value
-            query = query.filter(and_(
+            criteria.append(and_(
                 DatabaseEntry.wavemin >= wavemin,
                 DatabaseEntry.wavemax <= wavemax))
         elif typ == 'time':
             start, end, near = value
-            query = query.filter(and_(
+            criteria.append(and_(
                 DatabaseEntry.observation_time_start < end,
                 DatabaseEntry.observation_time_end > start))
         else:
             if typ.lower() not in SUPPORTED_SIMPLE_VSO_ATTRS.union(SUPPORTED_NONVSO_ATTRS):
                 raise NotImplementedError("The attribute {0!r} is not yet supported to query a database.".format(typ))
-            query = query.filter_by(**{typ: value})
-    return query.all()
+            criteria.append(getattr(DatabaseEntry, typ) == value)
+    return and_(*criteria)
 
 
 @walker.add_converter(Tag)
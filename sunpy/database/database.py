@@ -6,12 +6,12 @@
 from __future__ import absolute_import, print_function
 
 import itertools
-import operator
 from datetime import datetime
 from contextlib import contextmanager
 import os.path
 
-from sqlalchemy import create_engine, exists
+from sqlalchemy import create_engine, exists, func, inspect, or_
+from sqlalchemy import and_ as and_sql
 from sqlalchemy.orm import sessionmaker, scoped_session
 
 from astropy import units
@@ -367,6 +367,21 @@ class Database(object):
         """
         metadata = tables.Base.metadata
         metadata.create_all(self._engine, checkfirst=checkfirst)
+        self._create_indexes()
+
+    def _create_indexes(self):
+        """Create the indexes of the schema which are missing in the database.
+        ``create_all`` skips the indexes of tables that already exist, so this
+        migrates databases created with an older version of the schema.
+
+        """
+        inspector = inspect(self._engine)
+        for table in tables.Base.metadata.sorted_tables:
+            existing = set(index['name'] for index in
+                           inspector.get_indexes(table.name))
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(self._engine)
 
     def commit(self):
         """Flush pending changes and commit the current transaction. This is a
@@ -540,6 +555,110 @@ class Database(object):
 
         >>> database.query(~attrs.Starred(), attrs.Tag('foo') | attrs.Tag('bar'))   # doctest: +SKIP
 
+        """
+        db_entries, sort_column = self._make_query(query, kwargs)
+        return db_entries.order_by(*self._sort_order(sort_column)).all()
+
+    def iter_query(self, *query, **kwargs):
+        """
+        iter_query(*query[, sortby, batch_size])
+        Send the given query to the database and return an iterator over the
+        database entries that satisfy all of the given attributes, in the
+        same order as :meth:`query` would return them.
+
+        The entries are fetched in batches using keyset pagination: every
+        batch continues after the sort value and ID of the last entry of the
+        previous batch. Only one batch is held in memory at a time.
+
+        Parameters
+        ----------
+        query, sortby
+            See :meth:`sunpy.database.Database.query`.
+        batch_size : int, optional
+            The number of entries fetched from the database at once. The
+            default is 1000.
+
+        Examples
+        --------
+        >>> for entry in database.iter_query(vso.attrs.Instrument('AIA'),
+        ...                                  batch_size=10000):   # doctest: +SKIP
+        ...     print(entry.path)
+
+        """
+        # Hack to get around Python 2.x not backporting PEP 3102.
+        batch_size = kwargs.pop('batch_size', 1000)
+        db_entries, sort_column = self._make_query(query, kwargs)
+        return self._iter_batches(db_entries, sort_column, batch_size)
+
+    def _iter_batches(self, db_entries, sort_column, batch_size):
+        """Iterate over the entries of the SQLAlchemy query ``db_entries``,
+        ordered by ``sort_column`` and ID, fetching ``batch_size`` entries at
+        a time.
+
+        """
+        id_column = tables.DatabaseEntry.id
+        order = self._sort_order(sort_column)
+        batch = db_entries.order_by(*order).limit(batch_size).all()
+        while batch:
+            for entry in batch:
+                yield entry
+            last = batch[-1]
+            if sort_column is id_column:
+                criterion = id_column > last.id
+            else:
+                value = getattr(last, sort_column.key)
+                criterion = or_(
+                    sort_column > value,
+                    and_sql(sort_column == value, id_column > last.id))
+            # keep only the current batch alive
+            del batch
+            batch = db_entries.filter(criterion).order_by(
+                *order).limit(batch_size).all()
+
+    def explain_query(self, *query, **kwargs):
+        """
+        explain_query(*query[, sortby])
+        Return the plan which the database backend uses to execute the query
+        that :meth:`query` sends for the same arguments. This is useful to see
+        which indexes a query uses.
+
+        Parameters
+        ----------
+        query, sortby
+            See :meth:`sunpy.database.Database.query`.
+
+        Returns
+        -------
+        list of str
+            One line of the query plan per row of the ``EXPLAIN`` output. For
+            SQLite this is the detail column of ``EXPLAIN QUERY PLAN``.
+
+        Examples
+        --------
+        >>> database.explain_query(vso.attrs.Instrument('AIA'))   # doctest: +SKIP
+        ['SEARCH TABLE data USING INDEX ix_data_instrument_observation_time (instrument=?)']
+
+        """
+        db_entries, sort_column = self._make_query(query, kwargs)
+        statement = db_entries.order_by(*self._sort_order(sort_column)).statement
+        connection = self.session.connection()
+        compiled = statement.compile(dialect=connection.dialect)
+        if compiled.positional:
+            params = tuple(
+                compiled.params[name] for name in compiled.positiontup)
+        else:
+            params = compiled.params
+        if connection.dialect.name == 'sqlite':
+            rows = connection.execute(
+                'EXPLAIN QUERY PLAN ' + compiled.string, params)
+            return [row[-1] for row in rows]
+        rows = connection.execute('EXPLAIN ' + compiled.string, params)
+        return [' '.join(str(value) for value in row) for row in rows]
+
+    def _make_query(self, query, kwargs):
+        """Create the unordered SQLAlchemy query and the column to sort by
+        for the arguments of :meth:`query`.
+
         """
         if not query:
             raise TypeError('at least one attribute required')
@@ -548,15 +667,30 @@ class Database(object):
             k, v = kwargs.popitem()
             raise TypeError('unexpected keyword argument {0!r}'.format(k))
 
-        db_entries = walker.create(and_(*query), self.session)
+        db_entries = self.session.query(tables.DatabaseEntry).filter(
+            walker.apply(and_(*query)))
+        sort_column = getattr(tables.DatabaseEntry, sortby)
 
         # If any of the DatabaseEntry-s lack the sorting attribute, the
-        # sorting key should fall back to 'id', orherwise it fails with
-        # TypeError on py3
-        if any([getattr(entry, sortby) is None for entry in db_entries]):
-            sortby = 'id'
+        # sorting key should fall back to 'id', as NULL values cannot be
+        # ordered consistently
+        # pylint: disable=E711
+        lacks_sortby = db_entries.filter(sort_column == None).exists()
+        if self.session.query(lacks_sortby).scalar():
+            sort_column = tables.DatabaseEntry.id
+
+        return db_entries, sort_column
+
+    @staticmethod
+    def _sort_order(sort_column):
+        """Return the columns to order the entries by: the sort column, and
+        the ID to break ties between entries with the same sort value.
 
-        return sorted(db_entries, key=operator.attrgetter(sortby))
+        """
+        id_column = tables.DatabaseEntry.id
+        if sort_column is id_column:
+            return [id_column]
+        return [sort_column, id_column]
 
     def get_entry_by_id(self, entry_id):
         """Get a database entry by its unique ID number. If an entry with the
@@ -567,7 +701,11 @@ class Database(object):
         try:
             return self._cache[entry_id]
         except KeyError:
-            raise EntryNotFoundError(entry_id)
+            # entries added with bulk_add are not in the cache
+            entry = self.session.query(tables.DatabaseEntry).get(entry_id)
+            if entry is None:
+                raise EntryNotFoundError(entry_id)
+            return entry
 
     @property
     def tags(self):
@@ -698,6 +836,125 @@ class Database(object):
         if cmds:
             self._command_manager.do(cmds)
 
+    def bulk_add(self, database_entries, chunksize=1000):
+        """Add a large number of database entries using batched SQL
+        statements. The entries, their FITS header entries, FITS key comments
+        and tags are inserted with one statement per table for every chunk of
+        ``chunksize`` entries, and each chunk is committed in its own
+        transaction. Any pending changes in the session are committed as well.
+
+        This is much faster than :meth:`add_many` but nothing is saved in the
+        undo history, the entries are not checked for duplicates and the given
+        entry objects are not attached to the session.
+
+        Parameters
+        ----------
+        database_entries : iterable of sunpy.database.tables.DatabaseEntry
+            The database entries that will be added to the database.
+
+        chunksize : int, optional
+            The number of entries which are inserted and committed together.
+
+        """
+        database_entries = iter(database_entries)
+        while True:
+            chunk = list(itertools.islice(database_entries, chunksize))
+            if not chunk:
+                break
+            self._bulk_insert(chunk)
+
+    def bulk_add_from_dir(self, path, recursive=False, pattern='*',
+                          time_string_parse_format=None, fast_header=True,
+                          chunksize=1000, resume=True):
+        """Search the given directory for FITS files and add entries for their
+        FITS headers to the database using :meth:`bulk_add`. The files are
+        committed in chunks of ``chunksize`` files, so an interrupted run
+        leaves only complete files in the database.
+
+        Parameters
+        ----------
+        path, recursive, pattern, time_string_parse_format
+            See :meth:`sunpy.database.Database.add_from_dir`.
+
+        fast_header : bool, optional
+            See :func:`sunpy.database.tables.entries_from_file`. The default is
+            `True`.
+
+        chunksize : int, optional
+            The number of files whose entries are inserted and committed
+            together.
+
+        resume : bool, optional
+            If True (the default), files whose path is already saved in the
+            database are skipped without being read, so that an interrupted
+            ingestion continues where it stopped.
+
+        """
+        if resume:
+            done = set(
+                filepath for filepath, in
+                self.session.query(tables.DatabaseEntry.path).distinct())
+        else:
+            done = set()
+        filepaths = (filepath for filepath in
+                     tables._fits_files_in_dir(path, recursive, pattern)
+                     if filepath not in done)
+        while True:
+            chunk = []
+            for filepath in itertools.islice(filepaths, chunksize):
+                chunk.extend(tables.entries_from_file(
+                    filepath, self.default_waveunit,
+                    time_string_parse_format=time_string_parse_format,
+                    fast_header=fast_header))
+            if not chunk:
+                break
+            self._bulk_insert(chunk)
+
+    def _bulk_insert(self, database_entries):
+        """Insert the given database entries with SQLAlchemy Core statements
+        and commit them in a single transaction.
+
+        """
+        entry_table = tables.DatabaseEntry.__table__
+        next_id = (self.session.query(
+            func.max(tables.DatabaseEntry.id)).scalar() or 0) + 1
+
+        entry_rows, header_rows, comment_rows, tag_rows = [], [], [], []
+        for entry_id, entry in enumerate(database_entries, next_id):
+            row = dict((column.name, getattr(entry, column.name))
+                       for column in entry_table.columns)
+            row['id'] = entry_id
+            row['starred'] = bool(entry.starred)
+            entry_rows.append(row)
+            header_rows.extend(
+                {'dbentry_id': entry_id, 'key': header.key, 'value': header.value}
+                for header in entry.fits_header_entries)
+            comment_rows.extend(
+                {'dbentry_id': entry_id, 'key': comment.key, 'value': comment.value}
+                for comment in entry.fits_key_comments)
+            tag_rows.extend(
+                {'tag_name': tag.name, 'entry_id': entry_id}
+                for tag in entry.tags)
+
+        tag_names = set(row['tag_name'] for row in tag_rows)
+        new_tag_rows = [{'name': name} for name in
+                        tag_names - set(tag.name for tag in self.tags)]
+
+        inserts = [
+            (entry_table, entry_rows),
+            (tables.FitsHeaderEntry.__table__, header_rows),
+            (tables.FitsKeyComment.__table__, comment_rows),
+            (tables.Tag.__table__, new_tag_rows),
+            (tables.association_table, tag_rows)]
+        try:
+            for table, rows in inserts:
+                if rows:
+                    self.session.execute(table.insert(), rows)
+            self.session.commit()
+        except:
+            self.session.rollback()
+            raise
+
     def add(self, database_entry, ignore_already_added=False):
         """Add the given database entry to the database table.
 
@@ -788,7 +1045,8 @@ class Database(object):
             ignore_already_added)
 
     def add_from_dir(self, path, recursive=False, pattern='*',
-                     ignore_already_added=False, time_string_parse_format=None):
+                     ignore_already_added=False, time_string_parse_format=None,
+                     fast_header=False):
         """Search the given directory for FITS files and use their FITS headers
         to add new entries to the database. Note that one entry in the database
         is assigned to a list of FITS headers, so not the number of FITS headers
@@ -823,11 +1081,15 @@ class Database(object):
             `~datetime.datetime.strftime` if `sunpy.time.parse_time` is unable to
             automatically read the `date-obs` metadata.
 
+        fast_header : bool, optional
+            See :func:`sunpy.database.tables.entries_from_file`.
+
         """
         cmds = CompositeOperation()
         entries = tables.entries_from_dir(
             path, recursive, pattern, self.default_waveunit,
-            time_string_parse_format=time_string_parse_format)
+            time_string_parse_format=time_string_parse_format,
+            fast_header=fast_header)
         for database_entry, filepath in entries:
             if database_entry in list(self) and not ignore_already_added:
                 raise EntryAlreadyAddedError(database_entry)
@@ -840,7 +1102,8 @@ class Database(object):
         if cmds:
             self._command_manager.do(cmds)
 
-    def add_from_file(self, file, ignore_already_added=False):
+    def add_from_file(self, file, ignore_already_added=False,
+                      fast_header=False):
         """Generate as many database entries as there are FITS headers in the
         given file and add them to the database.
 
@@ -854,9 +1117,13 @@ class Database(object):
         ignore_already_added : bool, optional
             See :meth:`sunpy.database.Database.add`.
 
+        fast_header : bool, optional
+            See :func:`sunpy.database.tables.entries_from_file`.
+
         """
         self.add_many(
-            tables.entries_from_file(file, self.default_waveunit),
+            tables.entries_from_file(file, self.default_waveunit,
+                                     fast_header=fast_header),
             ignore_already_added)
 
     def edit(self, database_entry, **kwargs):
@@ -1010,7 +1277,9 @@ class Database(object):
 
     def __iter__(self):
         """iterate over all database entries that have been saved."""
-        return iter(self.session.query(tables.DatabaseEntry))
+        return self._iter_batches(
+            self.session.query(tables.DatabaseEntry),
+            tables.DatabaseEntry.id, 1000)
 
     def __len__(self):
         """Get the number of rows in the table."""
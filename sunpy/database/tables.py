@@ -12,7 +12,7 @@ import os
 from astropy.units import Unit, nm, equivalencies
 import astropy.table
 from sqlalchemy import Column, Integer, Float, String, DateTime, Boolean,\
-    Table, ForeignKey
+    Table, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -98,6 +98,9 @@ class JSONDump(Base):
 
 class FitsHeaderEntry(Base):
     __tablename__ = 'fitsheaderentries'
+    __table_args__ = (
+        Index('ix_fitsheaderentries_key_value', 'key', 'value'),
+        Index('ix_fitsheaderentries_dbentry_id', 'dbentry_id'))
 
     dbentry_id = Column(Integer, ForeignKey('data.id'))
     id = Column(Integer, primary_key=True)
@@ -127,6 +130,8 @@ class FitsHeaderEntry(Base):
 
 class FitsKeyComment(Base):
     __tablename__ = 'fitskeycomments'
+    __table_args__ = (
+        Index('ix_fitskeycomments_dbentry_id', 'dbentry_id'), )
 
     dbentry_id = Column(Integer, ForeignKey('data.id'))
     id = Column(Integer, primary_key=True)
@@ -237,6 +242,15 @@ class DatabaseEntry(Base):
 
     """
     __tablename__ = 'data'
+    # the time, instrument and wavelength indexes serve the filters created
+    # by the attributes in sunpy.database.attrs
+    __table_args__ = (
+        Index('ix_data_observation_time',
+              'observation_time_start', 'observation_time_end'),
+        Index('ix_data_instrument_observation_time',
+              'instrument', 'observation_time_start'),
+        Index('ix_data_wavelength', 'wavemin', 'wavemax'),
+        Index('ix_data_path', 'path'))
 
     # FIXME: primary key is data provider + file ID + download_time!
     id = Column(Integer, primary_key=True)
@@ -435,7 +449,7 @@ def entries_from_query_result(qr, default_waveunit=None):
 
 
 def entries_from_file(file, default_waveunit=None,
-                      time_string_parse_format=None):
+                      time_string_parse_format=None, fast_header=False):
     """Use the headers of a FITS file to generate an iterator of
     :class:`sunpy.database.tables.DatabaseEntry` instances. Gathered
     information will be saved in the attribute `fits_header_entries`. If the
@@ -462,6 +476,11 @@ def entries_from_file(file, default_waveunit=None,
         `~datetime.datetime.strftime` if `sunpy.time.parse_time` is unable to
         automatically read the `date-obs` metadata.
 
+    fast_header : bool, optional
+        If True, only the header blocks of the file are read, using the
+        minimal card parser of :func:`sunpy.io.fits.get_header`, and the
+        headers are not verified. The default is `False`.
+
     Raises
     ------
     sunpy.database.WaveunitNotFoundError
@@ -494,7 +513,7 @@ def entries_from_file(file, default_waveunit=None,
     111
 
     """
-    headers = fits.get_header(file)
+    headers = fits.get_header(file, fast=fast_header)
     if isinstance(file, (str, six.text_type)):
         filename = file
     else:
@@ -548,7 +567,8 @@ def entries_from_file(file, default_waveunit=None,
 
 
 def entries_from_dir(fitsdir, recursive=False, pattern='*',
-                     default_waveunit=None, time_string_parse_format=None):
+                     default_waveunit=None, time_string_parse_format=None,
+                     fast_header=False):
     """Search the given directory for FITS files and use the corresponding FITS
     headers to generate instances of :class:`DatabaseEntry`. FITS files are
     detected by reading the content of each file, the `pattern` argument may be
@@ -581,6 +601,9 @@ def entries_from_dir(fitsdir, recursive=False, pattern='*',
         `~datetime.datetime.strftime` if `sunpy.time.parse_time` is unable to
         automatically read the `date-obs` metadata.
 
+    fast_header : bool, optional
+        See :func:`sunpy.database.tables.entries_from_file`.
+
     Returns
     -------
     generator of (DatabaseEntry, str) pairs
@@ -600,6 +623,20 @@ def entries_from_dir(fitsdir, recursive=False, pattern='*',
     >>> len(entries)
     59
 
+    """
+    for path in _fits_files_in_dir(fitsdir, recursive, pattern):
+        for entry in entries_from_file(
+                path, default_waveunit,
+                time_string_parse_format=time_string_parse_format,
+                fast_header=fast_header
+                ):
+            yield entry, path
+
+
+def _fits_files_in_dir(fitsdir, recursive=False, pattern='*'):
+    """Generate the paths of all the FITS files in the given directory. See
+    :func:`entries_from_dir` for the meaning of the parameters.
+
     """
     for dirpath, dirnames, filenames in os.walk(fitsdir):
         filename_paths = (os.path.join(dirpath, name) for name in filenames)
@@ -611,11 +648,7 @@ def entries_from_dir(fitsdir, recursive=False, pattern='*',
                     sunpy_filetools.InvalidJPEG2000FileExtension):
                 continue
             if filetype == 'fits':
-                for entry in entries_from_file(
-                        path, default_waveunit,
-                        time_string_parse_format=time_string_parse_format
-                        ):
-                    yield entry, path
+                yield path
         if not recursive:
             break
 
@@ -5,6 +5,7 @@
 
 from __future__ import absolute_import
 
+import datetime
 import glob
 import os
 import os.path
@@ -492,6 +493,38 @@ def test_add_fom_path_ignore_duplicates(database):
     assert len(database) == 8
 
 
+def test_bulk_add(database):
+    entries = [DatabaseEntry(instrument='EIT') for _ in range(5)]
+    entries[0].fits_header_entries.append(FitsHeaderEntry('TELESCOP', 'SOHO'))
+    entries[1].tags.append(Tag('bulk'))
+    database.bulk_add(entries, chunksize=2)
+    assert len(database) == 5
+    assert [entry.id for entry in database] == [1, 2, 3, 4, 5]
+    assert database.get_entry_by_id(1).fits_header_entries == [
+        FitsHeaderEntry('TELESCOP', 'SOHO')]
+    assert database.get_entry_by_id(2).tags == [Tag('bulk')]
+    assert database.get_tag('bulk') == Tag('bulk')
+    # nothing is saved in the undo history
+    with pytest.raises(EmptyCommandStackError):
+        database.undo()
+
+
+def test_bulk_add_from_dir(database):
+    database.add_from_dir(waveunitdir)
+    expected = sorted((entry.path, entry.hdu_index, entry.observation_time_start)
+                      for entry in database)
+    database.undo()
+    database.bulk_add_from_dir(waveunitdir, chunksize=1)
+    assert len(database) == 4
+    assert sorted((entry.path, entry.hdu_index, entry.observation_time_start)
+                  for entry in database) == expected
+    # already ingested files are skipped when resuming
+    database.bulk_add_from_dir(waveunitdir)
+    assert len(database) == 4
+    database.bulk_add_from_dir(waveunitdir, resume=False)
+    assert len(database) == 8
+
+
 def test_add_from_file(database):
     assert len(database) == 0
     database.add_from_file(RHESSI_IMAGE)
@@ -728,6 +761,79 @@ def test_query(filled_database):
         DatabaseEntry(id=10, tags=[bar])]
 
 
+def test_query_sortby(database):
+    for instrument in ['EIT', 'AIA', 'MDI']:
+        database.add(DatabaseEntry(instrument=instrument))
+    database.commit()
+    entries = database.query(
+        ~attrs.Tag('foo') & ~attrs.Starred(), sortby='instrument')
+    assert [entry.instrument for entry in entries] == ['AIA', 'EIT', 'MDI']
+    # entries without the sorting attribute make the query sort by id
+    entries = database.query(~attrs.Starred())
+    assert [entry.id for entry in entries] == [1, 2, 3]
+
+
+@pytest.mark.parametrize('batch_size', [1, 2, 3, 100])
+def test_iter_query(database, batch_size):
+    for instrument in ['EIT', 'AIA', 'MDI', 'AIA', 'EIT']:
+        database.add(DatabaseEntry(instrument=instrument))
+    database.commit()
+    expected = database.query(~attrs.Starred(), sortby='instrument')
+    entries = database.iter_query(
+        ~attrs.Starred(), sortby='instrument', batch_size=batch_size)
+    assert not isinstance(entries, list)
+    assert list(entries) == expected
+    assert [entry.id for entry in expected] == [2, 4, 1, 5, 3]
+    entries = database.iter_query(
+        ~attrs.Starred(), batch_size=batch_size)
+    assert [entry.id for entry in entries] == [1, 2, 3, 4, 5]
+
+
+def test_query_ties_sorted_by_id(database):
+    # The index on (instrument, observation_time_start) orders these entries
+    # by time, so only the ID makes query and iter_query agree
+    for hour in [2, 1, 0]:
+        database.add(DatabaseEntry(
+            instrument='AIA',
+            observation_time_start=datetime.datetime(2012, 1, 1, hour)))
+    database.commit()
+    query = vso.attrs.Instrument('AIA'),
+    expected = database.query(*query, sortby='instrument')
+    assert [entry.id for entry in expected] == [1, 2, 3]
+    entries = database.iter_query(*query, sortby='instrument', batch_size=2)
+    assert list(entries) == expected
+
+
+def test_iter_query_unexpected_kwarg(database):
+    with pytest.raises(TypeError):
+        list(database.iter_query(attrs.Starred(), foo=42))
+
+
+def test_explain_query(database):
+    plan = ' '.join(database.explain_query(attrs.Path('/tmp')))
+    assert 'ix_data_path' in plan
+    plan = ' '.join(database.explain_query(
+        vso.attrs.Instrument('EIT'), sortby='id'))
+    assert 'ix_data_instrument_observation_time' in plan
+
+
+def test_create_missing_indexes(tmpdir):
+    url = 'sqlite:///' + str(tmpdir.join('old.sqlite'))
+    database = Database(url)
+    database.add(DatabaseEntry(path='/tmp'))
+    database.commit()
+    database.session.execute('DROP INDEX ix_data_path')
+    database.commit()
+    database.session.remove()
+    indexes = sqlalchemy.inspect(database._engine).get_indexes('data')
+    assert 'ix_data_path' not in [index['name'] for index in indexes]
+
+    database = Database(url)
+    indexes = sqlalchemy.inspect(database._engine).get_indexes('data')
+    assert 'ix_data_path' in [index['name'] for index in indexes]
+    assert len(database.query(attrs.Path('/tmp'))) == 1
+
+
 def test_download_missing_arg(database):
     with pytest.raises(TypeError):
         database.download()
@@ -269,6 +269,15 @@ def test_entries_from_dir():
         FitsKeyComment('EXPTIME', 'in seconds')].sort()
 
 
+def test_entries_from_dir_fast_header():
+    entries = list(entries_from_dir(waveunitdir, time_string_parse_format='%d/%m/%Y'))
+    fast_entries = list(entries_from_dir(waveunitdir, time_string_parse_format='%d/%m/%Y',
+                                         fast_header=True))
+    assert fast_entries == entries
+    for (entry, filename), (fast_entry, fast_filename) in zip(entries, fast_entries):
+        assert sorted(fast_entry.fits_key_comments) == sorted(entry.fits_key_comments)
+
+
 def test_entries_from_dir_recursively_true():
     entries = list(entries_from_dir(testdir, True,
                                     default_waveunit='angstrom',
@@ -6,7 +6,10 @@ Which is partially inspired by the SSWIDL routine
 `tr_get_disp.pro <http://hesperia.gsfc.nasa.gov/ssw/trace/idl/util/routines/tr_get_disp.pro>`_.
 
 In this implementation, the template matching is handled via the scikit-image
-routine :func:`skimage.feature.match_template`.
+routine :func:`skimage.feature.match_template`.  Alternatively the template can
+be matched in Fourier space, either by the same normalized cross-correlation
+or by phase correlation, which transforms the template once and the layers in
+batches.
 
 References
 ----------
@@ -19,6 +22,8 @@ Template matching algorithm:
 """
 from __future__ import absolute_import, division, print_function
 
+from collections import deque
+
 import numpy as np
 from scipy.ndimage.interpolation import shift
 from copy import deepcopy
@@ -32,12 +37,22 @@ import sunpy.map
 
 __author__ = 'J. Ireland'
 
+# Methods of calculate_match_template_shift that correlate in Fourier space
+_FFT_METHODS = ('fft', 'phase')
+
+# Fraction of the peak of the cross-power spectrum added to its magnitude
+# before the spectrum is whitened for phase correlation
+_PHASE_REGULARIZATION = 1e-3
+
+# Default size in bytes of a batch of layers transformed together
+_FFT_BATCH_BYTES = 2**28
+
 __all__ = ['calculate_shift', 'clip_edges', 'calculate_clipping',
            'match_template_to_layer', 'find_best_match_location',
            'get_correlation_shifts', 'parabolic_turning_point',
            'repair_image_nonfinite', 'apply_shifts',
            'mapcube_coalign_by_match_template',
-           'calculate_match_template_shift']
+           'calculate_match_template_shift', 'StreamingCoaligner']
 
 
 def _default_fmap_function(data):
@@ -199,6 +214,164 @@ def match_template_to_layer(layer, template):
     return match_template(layer, template)
 
 
+def _template_spectrum(template, shape):
+    """
+    Return the complex conjugate of the Fourier transform of the template,
+    less its mean, zero padded to the given layer shape.
+    """
+    template = np.asarray(template, dtype=np.float64)
+    return np.conj(np.fft.rfft2(template - template.mean(), s=shape))
+
+
+def _window_sums(stack, window):
+    """
+    Sums of each layer of a (nt, ny, nx) stack over every position of a
+    window of the given shape that lies entirely within the layer.
+    """
+    nt, ny, nx = stack.shape
+    wy, wx = window
+    cumulative = np.zeros((nt, ny + 1, nx + 1))
+    np.cumsum(stack, axis=1, out=cumulative[:, 1:, 1:])
+    np.cumsum(cumulative[:, 1:, 1:], axis=2, out=cumulative[:, 1:, 1:])
+    return (cumulative[:, wy:, wx:] - cumulative[:, :-wy, wx:] -
+            cumulative[:, wy:, :-wx] + cumulative[:, :-wy, :-wx])
+
+
+def _correlate_stack(stack, spectrum, template, method):
+    """
+    Correlate every layer of a (nt, ny, nx) stack with a template in Fourier
+    space.
+
+    Parameters
+    ----------
+    stack : `~numpy.ndarray`
+        The layers, of shape (nt, ny, nx).
+    spectrum : `~numpy.ndarray`
+        The template spectrum for layers of shape (ny, nx), as returned by
+        `_template_spectrum`.
+    template : `~numpy.ndarray`
+        The template, of shape (N, M) where N <= ny and M <= nx.
+    method : {'fft' | 'phase'}
+        'fft' returns the normalized cross-correlation, the same array as
+        `match_template_to_layer`.  'phase' returns the phase correlation.
+
+    Returns
+    -------
+    correlation : `~numpy.ndarray`
+        An array of shape (nt, ny - N + 1, nx - M + 1) giving the correlation
+        at each position of the template within the layers.
+    """
+    shape = stack.shape[1:]
+    ty, tx = template.shape
+    cross = np.fft.rfft2(stack, axes=(1, 2))
+    cross *= spectrum
+    if method == 'phase':
+        # Whiten the cross-power spectrum, regularized so that the frequencies
+        # where the zero padded template has almost no power are not
+        # amplified.
+        magnitude = np.abs(cross)
+        magnitude += _PHASE_REGULARIZATION * magnitude.max(axis=(1, 2), keepdims=True)
+        magnitude[magnitude == 0] = 1
+        cross /= magnitude
+    correlation = np.fft.irfft2(cross, s=shape, axes=(1, 2))
+    del cross
+    correlation = correlation[:, :shape[0] - ty + 1, :shape[1] - tx + 1]
+    if method == 'phase':
+        return correlation
+
+    # Normalize as Lewis (1995) does, with sums of the layers and their
+    # squares over the template window taken from cumulative sums.
+    template_ssd = np.sum((template - template.mean()) ** 2)
+    window_sum = _window_sums(stack, template.shape)
+    denominator = _window_sums(stack ** 2, template.shape)
+    denominator -= window_sum ** 2 / template.size
+    denominator *= template_ssd
+    np.maximum(denominator, 0, out=denominator)
+    np.sqrt(denominator, out=denominator)
+
+    response = np.zeros_like(correlation)
+    mask = denominator > np.finfo(np.float64).eps
+    response[mask] = correlation[mask] / denominator[mask]
+    return response
+
+
+def _match_stack(stack, spectrum, template, method):
+    """
+    Pixel location (y, x) of the best match of the template in each layer of
+    a stack, as an array of shape (nt, 2).
+    """
+    correlation = _correlate_stack(stack, spectrum, template, method)
+    locations = np.empty((len(stack), 2))
+    for i, corr in enumerate(correlation):
+        yloc, xloc = find_best_match_location(corr)
+        locations[i] = yloc.value, xloc.value
+    return locations
+
+
+def _fft_match_locations(maps, template, func, method, batch_size=None,
+                         max_workers=None, executor=None):
+    """
+    Pixel locations (y, x) of the best match of a template in each map, as an
+    array of shape (nt, 2), found by correlating in Fourier space.
+
+    The template is transformed once for each shape of layer.  Consecutive
+    layers of the same shape are transformed together in batches, which are
+    handed to an executor when one is given, or to a pool of ``max_workers``
+    processes.  Only ``2 * max_workers`` batches are in flight at once.
+    """
+    template = repair_image_nonfinite(template)
+    spectra = {}
+    locations = np.zeros((len(maps), 2))
+
+    def batches():
+        indices, layers = [], []
+        for i, m in enumerate(maps):
+            layer = repair_image_nonfinite(func(m.data))
+            if layer.shape[0] < template.shape[0] or layer.shape[1] < template.shape[1]:
+                raise ValueError('The template must be smaller than the layers.')
+            if layers and layer.shape != layers[0].shape:
+                yield indices, layers
+                indices, layers = [], []
+            indices.append(i)
+            layers.append(layer)
+            size = batch_size or max(1, _FFT_BATCH_BYTES // (8 * layer.size))
+            if len(layers) >= size:
+                yield indices, layers
+                indices, layers = [], []
+        if layers:
+            yield indices, layers
+
+    def arguments(layers):
+        stack = np.array(layers, dtype=np.float64)
+        shape = stack.shape[1:]
+        if shape not in spectra:
+            spectra[shape] = _template_spectrum(template, shape)
+        return stack, spectra[shape], template, method
+
+    if executor is None and (max_workers is None or max_workers <= 1):
+        for indices, layers in batches():
+            locations[indices] = _match_stack(*arguments(layers))
+        return locations
+
+    if executor is None:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            return _fft_match_locations(maps, template, func, method,
+                                        batch_size=batch_size,
+                                        max_workers=max_workers,
+                                        executor=pool)
+
+    pending = deque()
+    for indices, layers in batches():
+        pending.append((indices, executor.submit(_match_stack, *arguments(layers))))
+        if len(pending) > 2 * (max_workers or 1):
+            indices, future = pending.popleft()
+            locations[indices] = future.result()
+    for indices, future in pending:
+        locations[indices] = future.result()
+    return locations
+
+
 def find_best_match_location(corr):
     """
     Calculate an estimate of the location of the peak of the correlation
@@ -381,6 +554,9 @@ def apply_shifts(mc, yshift, xshift, clip=True, **kwargs):
     newmapcube : `sunpy.map.MapCube`
         A `~sunpy.map.MapCube` of the same shape as the input.  All layers in
         the `~sunpy.map.MapCube` have been shifted according the input shifts.
+        If all the maps have the same shape, the shifted layers are views of a
+        single (nt, ny, nx) array, so that `~sunpy.map.MapCube.as_array` on the
+        output does not copy any data.
     """
     # New mapcube will be constructed from this list
     new_mc = []
@@ -389,9 +565,20 @@ def apply_shifts(mc, yshift, xshift, clip=True, **kwargs):
     if clip:
         yclips, xclips = calculate_clipping(-yshift, -xshift)
 
+    # Shift all the layers into a single array when possible
+    if mc.all_maps_same_shape() and 'output' not in kwargs:
+        shifted_cube = np.empty((len(mc.maps),) + mc.maps[0].data.shape,
+                                dtype=np.result_type(*[m.data.dtype for m in mc.maps]))
+    else:
+        shifted_cube = None
+
     # Shift the data and construct the mapcube
     for i, m in enumerate(mc):
-        shifted_data = shift(deepcopy(m.data), [yshift[i].value, xshift[i].value], **kwargs)
+        if shifted_cube is None:
+            shifted_data = shift(m.data, [yshift[i].value, xshift[i].value], **kwargs)
+        else:
+            shifted_data = shifted_cube[i]
+            shift(m.data, [yshift[i].value, xshift[i].value], output=shifted_data, **kwargs)
         new_meta = deepcopy(m.meta)
         # Clip if required.  Use the submap function to return the appropriate
         # portion of the data.
@@ -411,7 +598,9 @@ def apply_shifts(mc, yshift, xshift, clip=True, **kwargs):
 
 
 def calculate_match_template_shift(mc, template=None, layer_index=0,
-                                   func=_default_fmap_function):
+                                   func=_default_fmap_function,
+                                   method='match_template', batch_size=None,
+                                   max_workers=None, executor=None):
     """
     Calculate the arcsecond shifts necessary to co-register the layers in a
     `~sunpy.map.MapCube` according to a template taken from that
@@ -449,7 +638,31 @@ def calculate_match_template_shift(mc, template=None, layer_index=0,
         func = F(data).  The default function ensures that the data are
         floats.
 
+    method : {'match_template' | 'fft' | 'phase'}
+        How the template is matched to each layer.  'match_template' uses
+        `match_template_to_layer` on one layer at a time.  'fft' calculates
+        the same normalized cross-correlation in Fourier space, transforming
+        the template only once and the layers in batches, which is much faster
+        for long `~sunpy.map.MapCube` objects and large templates.  'phase'
+        uses phase correlation instead, which is less sensitive to changes in
+        brightness but works best when the template covers most of the layer.
+
+    batch_size : int
+        The number of layers transformed together by the 'fft' and 'phase'
+        methods.  Default: as many layers as fit in 256 MB.
+
+    max_workers : int
+        Spread the batches of the 'fft' and 'phase' methods across a pool of
+        this many processes.  ``func`` is applied in the calling process, so it
+        need not be picklable.
+
+    executor : `concurrent.futures.Executor`
+        Spread the batches of the 'fft' and 'phase' methods across this
+        executor instead.
+
     """
+    if method != 'match_template' and method not in _FFT_METHODS:
+        raise ValueError('Invalid method {0}.'.format(method))
 
     # Size of the data
     ny = mc.maps[layer_index].data.shape[0]
@@ -480,16 +693,24 @@ def calculate_match_template_shift(mc, template=None, layer_index=0,
     yshift_arcseconds = np.zeros_like(xshift_arcseconds)
 
     # Match the template and calculate shifts
-    for i, m in enumerate(mc.maps):
-        # Get the next 2-d data array
-        this_layer = func(m.data)
+    if method in _FFT_METHODS:
+        locations = _fft_match_locations(mc.maps, tplate, func, method,
+                                         batch_size=batch_size,
+                                         max_workers=max_workers,
+                                         executor=executor)
+        yshift_keep = locations[:, 0] * u.pix
+        xshift_keep = locations[:, 1] * u.pix
+    else:
+        for i, m in enumerate(mc.maps):
+            # Get the next 2-d data array
+            this_layer = func(m.data)
 
-        # Calculate the y and x shifts in pixels
-        yshift, xshift = calculate_shift(this_layer, tplate)
+            # Calculate the y and x shifts in pixels
+            yshift, xshift = calculate_shift(this_layer, tplate)
 
-        # Keep shifts in pixels
-        yshift_keep[i] = yshift
-        xshift_keep[i] = xshift
+            # Keep shifts in pixels
+            yshift_keep[i] = yshift
+            xshift_keep[i] = xshift
 
     # Calculate shifts relative to the template layer
     yshift_keep = yshift_keep - yshift_keep[layer_index]
@@ -507,7 +728,9 @@ def calculate_match_template_shift(mc, template=None, layer_index=0,
 # Coalignment by matching a template
 def mapcube_coalign_by_match_template(mc, template=None, layer_index=0,
                                       func=_default_fmap_function, clip=True,
-                                      shift=None, **kwargs):
+                                      shift=None, method='match_template',
+                                      batch_size=None, max_workers=None,
+                                      executor=None, **kwargs):
     """
     Co-register the layers in a `~sunpy.map.MapCube` according to a template
     taken from that `~sunpy.map.MapCube`.  This method REQUIRES that
@@ -557,6 +780,18 @@ def mapcube_coalign_by_match_template(mc, template=None, layer_index=0,
         `~sunpy.map.MapCube`.  If a shift is passed in to the function, that
         shift is applied to the input `~sunpy.map.MapCube` and the template
         matching algorithm is not used.
+    method : {'match_template' | 'fft' | 'phase'}
+        How the template is matched to each layer.  See
+        `sunpy.image.coalignment.calculate_match_template_shift`.
+    batch_size : int
+        The number of layers transformed together by the 'fft' and 'phase'
+        methods.
+    max_workers : int
+        Spread the batches of the 'fft' and 'phase' methods across a pool of
+        this many processes.
+    executor : `concurrent.futures.Executor`
+        Spread the batches of the 'fft' and 'phase' methods across this
+        executor instead.
 
     The remaining keyword arguments are sent to `sunpy.image.coalignment.apply_shifts`.
 
@@ -575,6 +810,7 @@ def mapcube_coalign_by_match_template(mc, template=None, layer_index=0,
     >>> coaligned_mc = mc_coalign(mc, template=sunpy_map)   # doctest: +SKIP
     >>> coaligned_mc = mc_coalign(mc, template=two_dimensional_ndarray)   # doctest: +SKIP
     >>> coaligned_mc = mc_coalign(mc, func=np.log)   # doctest: +SKIP
+    >>> coaligned_mc = mc_coalign(mc, method='fft', max_workers=4)   # doctest: +SKIP
     """
 
     # Number of maps
@@ -587,7 +823,10 @@ def mapcube_coalign_by_match_template(mc, template=None, layer_index=0,
     if shift is None:
         shifts = calculate_match_template_shift(mc, template=template,
                                                 layer_index=layer_index,
-                                                func=func)
+                                                func=func, method=method,
+                                                batch_size=batch_size,
+                                                max_workers=max_workers,
+                                                executor=executor)
         xshift_arcseconds = shifts['x']
         yshift_arcseconds = shifts['y']
     else:
@@ -601,3 +840,170 @@ def mapcube_coalign_by_match_template(mc, template=None, layer_index=0,
 
     # Apply the shifts and return the coaligned mapcube
     return apply_shifts(mc, -yshift_keep, -xshift_keep, clip=clip, **kwargs)
+
+
+class StreamingCoaligner(object):
+    """
+    Co-register maps one at a time, as they arrive, to a template.
+
+    Unlike `mapcube_coalign_by_match_template`, which needs the whole
+    `~sunpy.map.MapCube`, each map is shifted as soon as it is added.  The
+    first map added is the reference: the shifts of all the other maps are
+    relative to it.  Only the template, its Fourier transform and the extreme
+    shifts seen so far are kept, so memory use does not grow with the number
+    of maps.
+
+    Parameters
+    ----------
+    template : {None | `~sunpy.map.Map` | `~numpy.ndarray`}
+        The template used in the matching.  Default: the central half of the
+        first map added.
+    func : function
+        A function which is applied to the data values before the template is
+        matched, as in `calculate_match_template_shift`.
+    method : {'match_template' | 'fft' | 'phase'}
+        How the template is matched to each map.  See
+        `calculate_match_template_shift`.
+    template_weight : float
+        The weight, between 0 and 1, with which each co-aligned map is blended
+        into the template, taken from the position the template matched in
+        the reference map.  A rolling template follows slow changes in the
+        scene, at the cost of shifts that may drift over long sequences.
+        Default: 0, the template does not change.
+
+    The remaining keyword arguments are sent to
+    `scipy.ndimage.interpolation.shift`.
+
+    Examples
+    --------
+    >>> from sunpy.image.coalignment import StreamingCoaligner
+    >>> coaligner = StreamingCoaligner(method='fft', template_weight=0.1)   # doctest: +SKIP
+    >>> for amap in incoming_maps:   # doctest: +SKIP
+    ...     coaligned_map, shift = coaligner.add(amap)   # doctest: +SKIP
+    >>> clipped_map = coaligner.clip(coaligned_map, shift)   # doctest: +SKIP
+    """
+    def __init__(self, template=None, func=_default_fmap_function,
+                 method='fft', template_weight=0.0, **kwargs):
+        if method != 'match_template' and method not in _FFT_METHODS:
+            raise ValueError('Invalid method {0}.'.format(method))
+        if not 0 <= template_weight <= 1:
+            raise ValueError('template_weight must be between 0 and 1.')
+        if isinstance(template, GenericMap):
+            template = template.data
+        elif template is not None and not isinstance(template, np.ndarray):
+            raise ValueError('Invalid template.')
+
+        self.func = func
+        self.method = method
+        self.template_weight = template_weight
+        self.shift_kwargs = kwargs
+        self._template = None
+        self._spectra = {}
+        if template is not None:
+            self._set_template(func(template))
+
+        # Location of the template in the reference map
+        self._reference = None
+        # Smallest and largest pixel displacements (y, x) seen so far
+        self._extremes = np.zeros((2, 2))
+
+    def _set_template(self, template):
+        self._template = repair_image_nonfinite(template)
+        self._spectra = {}
+
+    def _locate(self, layer):
+        """
+        Pixel location (y, x) of the best match of the template in a layer.
+        """
+        if self.method == 'match_template':
+            yloc, xloc = calculate_shift(layer, self._template)
+            return np.array([yloc.value, xloc.value])
+
+        layer = repair_image_nonfinite(layer)
+        if layer.shape not in self._spectra:
+            self._spectra[layer.shape] = _template_spectrum(self._template,
+                                                            layer.shape)
+        return _match_stack(np.array([layer], dtype=np.float64),
+                            self._spectra[layer.shape], self._template,
+                            self.method)[0]
+
+    @property
+    def clipping(self):
+        """
+        The number of pixels to clip off each edge of the co-aligned maps so
+        that none of them contain data affected by the shifts, in the form
+        returned by `calculate_clipping`.
+        """
+        return calculate_clipping(self._extremes[:, 0] * u.pix,
+                                  self._extremes[:, 1] * u.pix)
+
+    def add(self, amap):
+        """
+        Co-align a map to the template.
+
+        Parameters
+        ----------
+        amap : `~sunpy.map.GenericMap`
+            The next map.
+
+        Returns
+        -------
+        coaligned_map : `~sunpy.map.GenericMap`
+            The map with its data shifted onto the reference map.
+        shift : dict
+            A dictionary with two keys, 'x' and 'y', giving the displacement of
+            the map relative to the reference map in arcseconds, as
+            `calculate_match_template_shift` does.
+        """
+        layer = self.func(amap.data)
+        if self._template is None:
+            ny, nx = layer.shape
+            self._set_template(layer[int(ny/4): int(3*ny/4),
+                                     int(nx/4): int(3*nx/4)])
+
+        location = self._locate(layer)
+        if self._reference is None:
+            self._reference = location
+        displacement = location - self._reference
+        self._extremes[0] = np.minimum(self._extremes[0], displacement)
+        self._extremes[1] = np.maximum(self._extremes[1], displacement)
+
+        shifted_data = shift(amap.data, -displacement, **self.shift_kwargs)
+        coaligned_map = sunpy.map.Map(shifted_data, deepcopy(amap.meta))
+
+        if self.template_weight > 0:
+            ty, tx = self._template.shape
+            y0, x0 = np.round(self._reference).astype(int)
+            region = shift(layer, -displacement, **self.shift_kwargs)[y0: y0 + ty,
+                                                                       x0: x0 + tx]
+            self._set_template((1 - self.template_weight) * self._template +
+                               self.template_weight * region)
+
+        return coaligned_map, {'x': displacement[1] * u.pix * amap.scale.x,
+                               'y': displacement[0] * u.pix * amap.scale.y}
+
+    def clip(self, amap, shift):
+        """
+        Clip a co-aligned map by the clipping needed for all the maps added so
+        far, updating its meta data as
+        `sunpy.image.coalignment.apply_shifts` does.
+
+        Parameters
+        ----------
+        amap : `~sunpy.map.GenericMap`
+            A map returned by `add`.
+        shift : dict
+            The shift returned by `add` along with the map.
+
+        Returns
+        -------
+        clipped_map : `~sunpy.map.GenericMap`
+        """
+        yclips, xclips = self.clipping
+        clipped_data = clip_edges(amap.data, yclips, xclips)
+        new_meta = deepcopy(amap.meta)
+        new_meta['naxis1'] = clipped_data.shape[1]
+        new_meta['naxis2'] = clipped_data.shape[0]
+        new_meta['crpix1'] = amap.reference_pixel.x.value - (shift['x'] / amap.scale.x).value
+        new_meta['crpix2'] = amap.reference_pixel.y.value - (shift['y'] / amap.scale.y).value
+        return sunpy.map.Map(clipped_data, new_meta)
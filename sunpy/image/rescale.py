@@ -1,15 +1,29 @@
 """Image resampling methods"""
 from __future__ import absolute_import, division, print_function
 
+import threading
+from collections import OrderedDict
+
 import numpy as np
-import scipy.interpolate
 import scipy.ndimage
+from sunpy.extern import six
 from sunpy.extern.six.moves import range
 
-__all__ = ['resample', 'reshape_image_to_4d_superpixel']
+__all__ = ['resample', 'resample_stack', 'reshape_image_to_4d_superpixel',
+           'block_reduce']
+
+# The number of per-axis resampling plans that are kept
+_PLAN_CACHE_SIZE = 64
+_plan_cache = OrderedDict()
+_plan_lock = threading.Lock()
 
+# The number of elements block_reduce copies at a time for the kernels which
+# need a copy of the data
+_BLOCK_CHUNK = 2**22
 
-def resample(orig, dimensions, method='linear', center=False, minusone=False):
+
+def resample(orig, dimensions, method='linear', center=False, minusone=False,
+             dtype=None):
     """Returns a new `numpy.ndarray` that has been resampled up or down.
 
     Arbitrary resampling of source array to new dimension sizes.
@@ -25,12 +39,14 @@ def resample(orig, dimensions, method='linear', center=False, minusone=False):
     orig : `~numpy.ndarray`
         Original inout array.
     dimensions : tuple
-        Dimensions that new `~numpy.ndarray` should have.
+        Dimensions that new `~numpy.ndarray` should have. They must be whole
+        numbers, otherwise a `ValueError` is raised.
     method : {'neighbor' | 'nearest' | 'linear' | 'spline'}
         Method to use for resampling interpolation.
             * neighbor - Closest value from original data
-            * nearest and linear - Uses n x 1-D interpolations calculated by
-              `scipy.interpolate.interp1d`.
+            * nearest and linear - Uses n x 1-D interpolations, with the same
+              results as `scipy.interpolate.interp1d`. Points outside of the
+              original array are set to zero.
             * spline - Uses ndimage.map_coordinates
     center : bool
         If True, interpolation points are at the centers of the bins,
@@ -41,6 +57,10 @@ def resample(orig, dimensions, method='linear', center=False, minusone=False):
         is resampled by(i-1)/(x-1) * (j-1)/(y-1)
         This prevents extrapolation one element beyond bounds of input
         array.
+    dtype : `numpy.dtype`
+        The floating point type of the output, which the interpolation is done
+        in. Defaults to the type of ``orig`` if that is float32 or float64,
+        and float64 otherwise.
 
     Returns
     -------
@@ -48,6 +68,13 @@ def resample(orig, dimensions, method='linear', center=False, minusone=False):
         A new `~numpy.ndarray` which has been resampled to the desired
         dimensions.
 
+    Notes
+    -----
+    The neighbor, nearest and linear methods are separable: each axis is
+    resampled in turn from a table of source indices and weights. The tables
+    are cached, so resampling many arrays of the same shape only computes them
+    once.
+
     References
     ----------
     | http://www.scipy.org/Cookbook/Rebinning (Original source, 2011/11/19)
@@ -58,77 +85,183 @@ def resample(orig, dimensions, method='linear', center=False, minusone=False):
         raise UnequalNumDimensions("Number of dimensions must remain the same "
                                    "when calling resample.")
 
-    #@note: will this be okay for integer (e.g. JPEG 2000) data?
-    if orig.dtype not in [np.float64, np.float32]:
-        orig = orig.astype(np.float64)
+    dimensions = _whole_dimensions(dimensions)
+    return _resample_axes(orig, dimensions, method, center, minusone, dtype)
 
-    dimensions = np.asarray(dimensions, dtype=np.float64)
-    m1 = np.array(minusone, dtype=np.int64)  # array(0) or array(1)
-    offset = np.float64(center * 0.5)       # float64(0.) or float64(0.5)
 
-    # Resample data
-    if method == 'neighbor':
-        data = _resample_neighbor(orig, dimensions, offset, m1)
-    elif method in ['nearest', 'linear']:
-        data = _resample_nearest_linear(orig, dimensions, method,
-                                        offset, m1)
-    elif method == 'spline':
-        data = _resample_spline(orig, dimensions, offset, m1)
-    else:
-        raise UnrecognizedInterpolationMethod("Unrecognized interpolation "
-                                              "method requested.")
+def resample_stack(stack, dimensions, method='linear', center=False,
+                   minusone=False, dtype=None):
+    """Returns a stack of arrays which have all been resampled up or down.
 
-    return data
+    This is equivalent to calling `resample` on every array of the stack, but
+    resamples the whole stack at once.
 
+    Parameters
+    ----------
+    stack : `~numpy.ndarray`
+        An array whose first axis indexes the arrays to resample, for example
+        a cube of images of shape (nt, ny, nx).
+    dimensions : tuple
+        Dimensions that each array of the stack should have, for example
+        (ny, nx) for a cube of images.
+    method : {'neighbor' | 'nearest' | 'linear' | 'spline'}
+        Method to use for resampling interpolation, see `resample`.
+    center : bool
+        See `resample`.
+    minusone : bool
+        See `resample`.
+    dtype : `numpy.dtype`
+        See `resample`.
 
-def _resample_nearest_linear(orig, dimensions, method, offset, m1):
-    """Resample Map using either linear or nearest interpolation."""
+    Returns
+    -------
+    out : `~numpy.ndarray`
+        The stack of resampled arrays, of shape (len(stack),) + dimensions.
+    """
+    if len(dimensions) != stack.ndim - 1:
+        raise UnequalNumDimensions("Number of dimensions must remain the same "
+                                   "when calling resample_stack.")
 
-    dimlist = []
+    dimensions = _whole_dimensions(dimensions)
+    if method == 'spline':
+        out_dtype = _output_dtype(stack, dtype)
+        out = np.empty((len(stack),) + tuple(dimensions.astype(int)), dtype=out_dtype)
+        for i, array in enumerate(stack):
+            out[i] = _resample_axes(array, dimensions, method, center, minusone, dtype)
+        return out
 
-    # calculate new dims
-    for i in range(orig.ndim):
-        base = np.arange(dimensions[i])
-        dimlist.append((orig.shape[i] - m1) / (dimensions[i] - m1) *
-                       (base + offset) - offset)
+    return _resample_axes(stack, (None,) + tuple(dimensions), method, center,
+                          minusone, dtype)
 
-    # specify old coordinates
-    old_coords = [np.arange(i, dtype=np.float) for i in orig.shape]
 
-    # first interpolation - for ndims = any
-    mint = scipy.interpolate.interp1d(old_coords[-1], orig, bounds_error=False,
-                                      fill_value=min(old_coords[-1]), kind=method)
+def _whole_dimensions(dimensions):
+    """
+    Return the new dimensions as a float array, checking that they are whole
+    numbers.
+    """
+    dimensions = np.asarray(dimensions, dtype=np.float64)
+    if np.any(dimensions != np.round(dimensions)):
+        raise ValueError("The new dimensions must be whole numbers, "
+                         "not {0}.".format(tuple(dimensions)))
+    return dimensions
 
-    new_data = mint(dimlist[-1])
 
-    trorder = [orig.ndim - 1] + list(range(orig.ndim - 1))
-    for i in range(orig.ndim - 2, -1, -1):
-        new_data = new_data.transpose(trorder)
+def _output_dtype(orig, dtype):
+    """The floating point type which an array is resampled in."""
+    if dtype is not None:
+        return np.dtype(dtype)
+    #@note: will this be okay for integer (e.g. JPEG 2000) data?
+    if orig.dtype in [np.float64, np.float32]:
+        return orig.dtype
+    return np.dtype(np.float64)
 
-        mint = scipy.interpolate.interp1d(old_coords[i], new_data,
-                                          bounds_error=False, fill_value=min(old_coords[i]), kind=method)
-        new_data = mint(dimlist[i])
 
-    if orig.ndim > 1:
-        # need one more transpose to return to original dimensions
-        new_data = new_data.transpose(trorder)
+def _resample_axes(orig, dimensions, method, center, minusone, dtype):
+    """
+    Resample every axis of ``orig`` to ``dimensions``, leaving the axes whose
+    dimension is `None` as they are.
+    """
+    dtype = _output_dtype(orig, dtype)
+    m1 = int(minusone)        # 0 or 1
+    offset = center * 0.5     # 0. or 0.5
+
+    if method == 'spline':
+        if orig.dtype != dtype:
+            orig = orig.astype(dtype)
+        return _resample_spline(orig, dimensions, np.float64(offset),
+                                np.array(m1, dtype=np.int64))
+    elif method not in ['neighbor', 'nearest', 'linear']:
+        raise UnrecognizedInterpolationMethod("Unrecognized interpolation "
+                                              "method requested.")
 
-    return new_data
+    # Resample the axes which shrink the array first, to keep the
+    # intermediate arrays small.
+    axes = [axis for axis, dim in enumerate(dimensions) if dim is not None]
+    axes.sort(key=lambda axis: dimensions[axis] / orig.shape[axis])
 
+    data = orig
+    for axis in axes:
+        plan = _axis_plan(orig.shape[axis], int(dimensions[axis]), method,
+                          offset, m1, dtype)
+        data = _resample_axis(data, axis, plan)
 
-def _resample_neighbor(orig, dimensions, offset, m1):
-    """Resample Map using closest-value interpolation."""
+    if data is orig or data.dtype != dtype:
+        data = data.astype(dtype)
+    return data
 
-    dimlist = []
-    dimensions = np.asarray(dimensions, dtype=int)
 
-    for i in range(orig.ndim):
-        base = np.indices(dimensions)[i]
-        dimlist.append((orig.shape[i] - m1) / (dimensions[i] - m1) *
-                       (base + offset) - offset)
-    cd = np.array(dimlist).round().astype(int)
+def _axis_plan(size, dim, method, offset, m1, dtype):
+    """
+    Return the table of source indices and weights which resamples an axis
+    of length ``size`` to length ``dim``.
+
+    For the neighbor and nearest methods this is the index of the source
+    element for each output element; for the linear method it is the indices
+    of the elements on either side and their weights. The nearest and linear
+    methods also return a boolean array of the output elements which fall
+    outside of the input, which are set to zero as
+    `scipy.interpolate.interp1d` does.
+    """
+    key = (size, dim, method, offset, m1, np.dtype(dtype).str)
+    with _plan_lock:
+        plan = _plan_cache.pop(key, None)
+        if plan is not None:
+            _plan_cache[key] = plan
+            return plan
 
-    return orig[list(cd)]
+    coords = (size - m1) / (dim - m1) * (np.arange(dim) + offset) - offset
+
+    if method == 'neighbor':
+        plan = (coords.round().astype(np.intp),)
+    else:
+        outside = (coords < 0) | (coords > size - 1)
+        if method == 'nearest':
+            # interp1d rounds halves down
+            index = np.clip(np.ceil(coords - 0.5), 0, size - 1).astype(np.intp)
+            plan = (index, outside)
+        else:
+            lower = np.clip(np.floor(coords), 0, max(size - 2, 0)).astype(np.intp)
+            upper = np.minimum(lower + 1, size - 1)
+            weight = np.clip(coords - lower, 0, 1).astype(dtype)
+            plan = (lower, upper, 1 - weight, weight, outside)
+
+    for array in plan:
+        array.flags.writeable = False
+
+    with _plan_lock:
+        _plan_cache[key] = plan
+        while len(_plan_cache) > _PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+    return plan
+
+
+def _resample_axis(data, axis, plan):
+    """Resample one axis of an array according to a plan from `_axis_plan`."""
+    if len(plan) == 1:
+        return np.take(data, plan[0], axis=axis)
+
+    # Weights along the resampled axis, broadcast over the other axes
+    shape = [1] * data.ndim
+    shape[axis] = -1
+
+    if len(plan) == 2:
+        index, outside = plan
+        new_data = np.take(data, index, axis=axis)
+    else:
+        lower, upper, lower_weight, upper_weight, outside = plan
+        new_data = np.take(data, lower, axis=axis).astype(lower_weight.dtype,
+                                                          copy=False)
+        new_data *= lower_weight.reshape(shape)
+        upper_data = np.take(data, upper, axis=axis)
+        upper_data = upper_data * upper_weight.reshape(shape)
+        new_data += upper_data
+
+    if outside.any():
+        if not np.issubdtype(new_data.dtype, np.floating):
+            new_data = new_data.astype(np.float64)
+        new_data[(slice(None),) * axis + (outside,)] = 0
+
+    return new_data
 
 
 def _resample_spline(orig, dimensions, offset, m1):
@@ -218,17 +351,166 @@ def reshape_image_to_4d_superpixel(img, dimensions, offset):
     http://mail.scipy.org/pipermail/numpy-discussion/2010-July/051760.html
 
     """
-    # make sure the input dimensions are integers
+    # Reshape up to a higher dimensional array which is useful for higher
+    # level operations. This is a view of the input, even when the part of
+    # the image used is not contiguous in memory.
+    view = _block_view(np.ma.getdata(img), dimensions, offset)
+    if isinstance(img, np.ma.MaskedArray):
+        mask = np.ma.getmask(img)
+        if mask is not np.ma.nomask:
+            mask = _block_view(mask, dimensions, offset)
+        view = np.ma.MaskedArray(view, mask=mask, fill_value=img.fill_value)
+    return view
+
+
+def block_reduce(data, dimensions, offset=None, func=np.sum, mask=None, out=None):
+    """
+    Reduce non-overlapping blocks of an array, or of every array in a stack,
+    to single values: for example, to sum an image into superpixels.
+
+    The blocks are read through a strided view of ``data``, without copying
+    it. Sums and means are computed directly from the view, and medians and
+    masked reductions copy a bounded number of blocks at a time.
+
+    Parameters
+    ----------
+    data : `numpy.ndarray`
+        The array to reduce. If it has more dimensions than ``dimensions``
+        the leading axes are kept, so a cube of images of shape
+        (nt, ny, nx) is reduced frame by frame.
+    dimensions : array-like
+        The shape of a block along the trailing axes of ``data``.
+    offset : array-like
+        Where in the trailing axes of ``data`` the first block starts.
+        Default: 0 for every axis.
+    func : {'sum' | 'mean' | 'median'} or function
+        How a block is reduced. `numpy.sum`, `numpy.mean` and `numpy.median`
+        are the same as 'sum', 'mean' and 'median'. Any other function must
+        support the axis keyword, and is applied along one axis of the block
+        at a time.
+    mask : `numpy.ndarray`
+        A boolean array of the pixels of ``data`` to leave out. Blocks whose
+        pixels are all masked are masked in the output. The mask of a
+        `numpy.ma.MaskedArray` is used as well.
+    out : `numpy.ndarray`
+        An array to write the (unmasked) result into.
+
+    Returns
+    -------
+    out : `numpy.ndarray` or `numpy.ma.MaskedArray`
+        The reduced array, which is masked if a mask was given.
+    """
+    if isinstance(data, np.ma.MaskedArray):
+        if np.ma.getmask(data) is not np.ma.nomask:
+            mask = np.ma.getmaskarray(data) if mask is None else (mask | np.ma.getmaskarray(data))
+        data = np.ma.getdata(data)
+    if offset is None:
+        offset = [0] * len(dimensions)
+
+    func = _BLOCK_KERNELS.get(func, func)
+    view = _block_view(data, dimensions, offset)
+    mask_view = None if mask is None else _block_view(np.asanyarray(mask, dtype=bool),
+                                                      dimensions, offset)
+    lead = data.ndim - len(dimensions)
+    axes = tuple(range(lead + 1, view.ndim, 2))
+
+    if not isinstance(func, six.string_types):
+        result = view if mask_view is None else np.ma.array(view, mask=mask_view)
+        for axis in reversed(axes):
+            result = func(result, axis=axis)
+        if out is not None:
+            out[...] = np.ma.getdata(result)
+            if mask_view is not None:
+                result = np.ma.array(out, mask=np.ma.getmaskarray(result))
+            else:
+                result = out
+        return result
+
+    if func not in ('sum', 'mean', 'median'):
+        raise ValueError("func must be 'sum', 'mean', 'median' or a function")
+
+    if mask_view is None and func in ('sum', 'mean'):
+        # Reduce the view in place, without copying any data
+        if func == 'sum':
+            return view.sum(axis=axes, out=out)
+        if np.issubdtype(data.dtype, np.floating):
+            result = view.sum(axis=axes, out=out)
+        else:
+            result = view.sum(axis=axes, out=out, dtype=np.float64)
+        result /= np.prod(dimensions)
+        return result
+
+    result_shape = view.shape[:lead] + view.shape[lead::2]
+    if out is None:
+        if func == 'sum':
+            dtype = np.zeros(1, dtype=data.dtype).sum().dtype
+        elif np.issubdtype(data.dtype, np.floating):
+            dtype = data.dtype
+        else:
+            dtype = np.float64
+        out = np.empty(result_shape, dtype=dtype)
+    out_mask = None if mask_view is None else np.zeros(result_shape, dtype=bool)
+
+    # Copy a bounded number of rows of blocks at a time
+    row_size = max(int(np.prod(view.shape[lead + 1:])), 1)
+    rows = max(_BLOCK_CHUNK // row_size, 1)
+    chunk_axes = tuple(range(1, view.ndim - lead, 2))
+    for index in np.ndindex(*view.shape[:lead]):
+        for start in range(0, view.shape[lead], rows):
+            where = index + (slice(start, start + rows),)
+            chunk = view[where]
+            chunk_mask = None if mask_view is None else mask_view[where]
+            out[where] = _reduce_blocks(chunk, chunk_mask, chunk_axes, func)
+            if out_mask is not None:
+                out_mask[where] = chunk_mask.all(axis=chunk_axes)
+
+    if out_mask is not None:
+        return np.ma.array(out, mask=out_mask)
+    return out
+
+
+def _reduce_blocks(blocks, mask, axes, func):
+    """
+    Reduce the ``axes`` of a copyable chunk of a block view with one of the
+    block_reduce kernels.
+    """
+    if func == 'median':
+        # Move the axes of a block to the end and flatten them
+        outer = tuple(axis for axis in range(blocks.ndim) if axis not in axes)
+        shape = tuple(blocks.shape[axis] for axis in outer) + (-1,)
+        blocks = blocks.transpose(outer + axes).reshape(shape)
+        if mask is None:
+            return np.median(blocks, axis=-1)
+        mask = mask.transpose(outer + axes).reshape(shape)
+        return np.ma.getdata(np.ma.median(np.ma.array(blocks, mask=mask), axis=-1))
+
+    total = np.where(mask, 0, blocks).sum(axis=axes)
+    if func == 'sum':
+        return total
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return total / (~mask).sum(axis=axes)
+
+
+def _block_view(array, dimensions, offset):
+    """
+    Return a view of ``array`` in which each trailing axis of size n is split
+    into two axes of sizes (n - offset) // dimension and dimension.
+    """
     dimensions = [int(dim) for dim in dimensions]
+    offset = [int(off) for off in offset]
+    lead = array.ndim - len(dimensions)
 
-    # New dimensions of the final image
-    na = int(np.floor((img.shape[0] - offset[0]) / dimensions[0]))
-    nb = int(np.floor((img.shape[1] - offset[1]) / dimensions[1]))
+    corner = array[(Ellipsis,) + tuple(slice(off, None) for off in offset)]
+    shape = list(array.shape[:lead])
+    strides = list(array.strides[:lead])
+    for size, stride, dim in zip(corner.shape[lead:], corner.strides[lead:], dimensions):
+        shape += [max(size // dim, 0), dim]
+        strides += [stride * dim, stride]
 
-    # Reshape up to a higher dimensional array which is useful for higher
-    # level operations
-    return (img[int(offset[0]):int(offset[0] + na * dimensions[0]),
-                int(offset[1]):int(offset[1] + nb * dimensions[1])]).reshape(na, dimensions[0], nb, dimensions[1])
+    return np.lib.stride_tricks.as_strided(corner, shape=shape, strides=strides)
+
+
+_BLOCK_KERNELS = {np.sum: 'sum', np.mean: 'mean', np.median: 'median'}
 
 
 class UnrecognizedInterpolationMethod(ValueError):
@@ -18,7 +18,7 @@ from sunpy.image.coalignment import parabolic_turning_point, \
     calculate_clipping, get_correlation_shifts, find_best_match_location, \
     match_template_to_layer, clip_edges, \
     calculate_match_template_shift, mapcube_coalign_by_match_template,\
-    apply_shifts
+    apply_shifts, _template_spectrum, _correlate_stack, StreamingCoaligner
 from sunpy.extern.six.moves import range
 
 @pytest.fixture
@@ -217,6 +217,52 @@ def test_calculate_match_template_shift(aia171_test_mc,
         dummy_return_value = calculate_match_template_shift(aia171_test_mc, template='broken')
 
 
+def test_correlate_stack(aia171_test_map_layer, aia171_test_template):
+    layer = np.float64(aia171_test_map_layer)
+    template = np.float64(aia171_test_template)
+    spectrum = _template_spectrum(template, layer.shape)
+    stack = np.array([layer, sp_shift(layer, [2, -3])])
+    correlation = _correlate_stack(stack, spectrum, template, 'fft')
+    for i in range(2):
+        assert_allclose(correlation[i], match_template_to_layer(stack[i], template),
+                        rtol=0, atol=1e-8)
+
+    correlation = _correlate_stack(stack, spectrum, template, 'phase')
+    assert correlation.shape == (2,) + match_template_to_layer(layer, template).shape
+    peaks = [np.unravel_index(np.argmax(c), c.shape) for c in correlation]
+    assert peaks[1][0] - peaks[0][0] == 2
+    assert peaks[1][1] - peaks[0][1] == -3
+
+
+@pytest.mark.parametrize('method', ['fft', 'phase'])
+def test_calculate_match_template_shift_fft(aia171_test_mc,
+                                            aia171_mc_arcsec_displacements,
+                                            method):
+    # Phase correlation peaks are sharper, so their sub-pixel locations are
+    # less accurate
+    rtol = 5e-2 if method == 'fft' else 1e-1
+    test_displacements = calculate_match_template_shift(aia171_test_mc, method=method)
+    assert_allclose(test_displacements['x'], aia171_mc_arcsec_displacements['x'], rtol=rtol, atol=0)
+    assert_allclose(test_displacements['y'], aia171_mc_arcsec_displacements['y'], rtol=rtol, atol=0)
+
+    # Batching and a process pool do not change the shifts
+    batched = calculate_match_template_shift(aia171_test_mc, method=method,
+                                             batch_size=1, max_workers=2)
+    assert_allclose(batched['x'], test_displacements['x'])
+    assert_allclose(batched['y'], test_displacements['y'])
+
+    if method == 'fft':
+        reference = calculate_match_template_shift(aia171_test_mc)
+        assert_allclose(test_displacements['x'], reference['x'], rtol=0, atol=1e-6 * u.arcsec)
+        assert_allclose(test_displacements['y'], reference['y'], rtol=0, atol=1e-6 * u.arcsec)
+
+    test_mc = mapcube_coalign_by_match_template(aia171_test_mc, method=method)
+    assert(isinstance(test_mc, map.MapCube))
+
+    with pytest.raises(ValueError):
+        calculate_match_template_shift(aia171_test_mc, method='broken')
+
+
 def test_mapcube_coalign_by_match_template(aia171_test_mc,
                                            aia171_test_map_layer_shape):
     # Define these local variables to make the code more readable
@@ -270,6 +316,49 @@ def test_mapcube_coalign_by_match_template(aia171_test_mc,
                             test_displacements[s][im] / m.scale[i_s],
                             rtol=5e-2, atol=0)
 
+@pytest.mark.parametrize('method', ['match_template', 'fft'])
+def test_streaming_coaligner(aia171_test_mc, method):
+    expected_shifts = calculate_match_template_shift(aia171_test_mc)
+    expected_mc = mapcube_coalign_by_match_template(aia171_test_mc, shift=expected_shifts)
+
+    coaligner = StreamingCoaligner(method=method)
+    results = [coaligner.add(m) for m in aia171_test_mc]
+    for i, (coaligned_map, shift) in enumerate(results):
+        assert coaligned_map.data.shape == aia171_test_mc[i].data.shape
+        for s in ['x', 'y']:
+            assert_allclose(shift[s], expected_shifts[s][i], rtol=0, atol=1e-6 * u.arcsec)
+
+    # The cumulative clipping is that of the whole mapcube
+    x_displacement_pixels = expected_shifts['x'] / aia171_test_mc[0].scale.x
+    y_displacement_pixels = expected_shifts['y'] / aia171_test_mc[0].scale.y
+    expected_clipping = calculate_clipping(y_displacement_pixels, x_displacement_pixels)
+    for clip, expected_clip in zip(coaligner.clipping, expected_clipping):
+        assert_allclose(clip, expected_clip)
+
+    for (coaligned_map, shift), expected_map in zip(results, expected_mc):
+        clipped_map = coaligner.clip(coaligned_map, shift)
+        assert_allclose(clipped_map.data, expected_map.data)
+        assert_allclose(clipped_map.reference_pixel.x, expected_map.reference_pixel.x)
+        assert_allclose(clipped_map.reference_pixel.y, expected_map.reference_pixel.y)
+
+
+def test_streaming_coaligner_template(aia171_test_map, aia171_test_template):
+    coaligner = StreamingCoaligner(template=aia171_test_template, template_weight=0.5)
+    for i in range(3):
+        coaligned_map, shift = coaligner.add(aia171_test_map)
+        assert_allclose(shift['x'], 0 * u.arcsec, atol=1e-6 * u.arcsec)
+        assert_allclose(shift['y'], 0 * u.arcsec, atol=1e-6 * u.arcsec)
+    # The rolling template is cut from the same place in the co-aligned maps
+    assert_allclose(coaligner._template, aia171_test_template, rtol=1e-6)
+
+    with pytest.raises(ValueError):
+        StreamingCoaligner(template='broken')
+    with pytest.raises(ValueError):
+        StreamingCoaligner(method='broken')
+    with pytest.raises(ValueError):
+        StreamingCoaligner(template_weight=2)
+
+
 def test_apply_shifts(aia171_test_map):
     # take two copies of the AIA image and create a test mapcube.
     mc = map.Map([aia171_test_map, aia171_test_map], cube=True)
@@ -327,3 +416,18 @@ def test_apply_shifts(aia171_test_map):
                             order=2, mode='reflect')
     test_mc2 = apply_shifts(mc, astropy_displacements["y"], astropy_displacements["x"], clip=False)
     assert(np.all(test_mc1[1].data[:, -1] != test_mc2[1].data[:, -1]))
+
+
+def test_apply_shifts_single_array(aia171_test_map):
+    # When all the layers have the same shape the shifted layers are views of
+    # a single array, so the output mapcube can be used as an array without
+    # copying the data.
+    mc = map.Map([aia171_test_map, aia171_test_map], cube=True)
+    displacements = {"x": np.asarray([0.0, -2.7]) * u.pix,
+                     "y": np.asarray([0.0, -10.4]) * u.pix}
+    for clip in (False, True):
+        test_mc = apply_shifts(mc, displacements["y"], displacements["x"], clip=clip)
+        cube = test_mc.as_array()
+        for i, m in enumerate(test_mc):
+            assert np.may_share_memory(cube, m.data)
+            assert_array_almost_equal(cube[:, :, i], m.data)
@@ -2,7 +2,8 @@ from __future__ import absolute_import, division, print_function
 # Author: Tomas Meszaros <exo@tty.sk>
 
 import astropy.units as u
-from sunpy.image.rescale import reshape_image_to_4d_superpixel
+from sunpy.image.rescale import (reshape_image_to_4d_superpixel, resample, resample_stack,
+                                  block_reduce)
 import pytest
 import os
 import numpy as np
@@ -81,3 +82,110 @@ def test_reshape(aia171_test_map, shape):
     im = reshape_image_to_4d_superpixel(aia171_test_map.data, d, o)
     assert im.shape == (_n(shape[0], o[0], d[0]), d[0],
                         _n(shape[1], o[1], d[1]), d[1])
+
+
+def interp1d_resample(orig, dimensions, method, offset):
+    # Reference implementation with one scipy interp1d per axis
+    from scipy.interpolate import interp1d
+    new_data = orig
+    for axis in range(orig.ndim):
+        coords = (orig.shape[axis] / dimensions[axis] *
+                  (np.arange(dimensions[axis]) + offset) - offset)
+        new_data = interp1d(np.arange(orig.shape[axis]), new_data, kind=method, axis=axis,
+                            bounds_error=False, fill_value=0.)(coords)
+    return new_data
+
+
+@pytest.mark.parametrize("method, dimensions", [('nearest', (12, 40)), ('linear', (12, 40)),
+                                                ('nearest', (70, 101)), ('linear', (70, 101))])
+def test_resample_interp1d(method, dimensions):
+    orig = np.random.RandomState(0).normal(size=(37, 53))
+    for center in (False, True):
+        expected = interp1d_resample(orig, dimensions, method, center * 0.5)
+        np.testing.assert_allclose(resample(orig, dimensions, method, center=center),
+                                   expected, atol=1e-12)
+
+
+def test_resample_dtype():
+    orig = np.arange(100, dtype=np.int16).reshape(10, 10)
+    assert resample(orig, (5, 5)).dtype == np.float64
+    assert resample(orig, (5, 5), dtype=np.float32).dtype == np.float32
+    assert resample(orig.astype(np.float32), (5, 5)).dtype == np.float32
+
+
+@pytest.mark.parametrize("method", ['neighbor', 'nearest', 'linear'])
+def test_resample_stack(method):
+    stack = np.random.RandomState(0).normal(size=(4, 20, 30)).astype(np.float32)
+    new_stack = resample_stack(stack, (15, 45), method, center=True)
+    assert new_stack.shape == (4, 15, 45)
+    assert new_stack.dtype == np.float32
+    for image, new_image in zip(stack, new_stack):
+        np.testing.assert_allclose(new_image, resample(image, (15, 45), method, center=True))
+
+
+def test_reshape_view(aia171_test_map):
+    # The reshaped array is a view of the image, even with an offset
+    im = reshape_image_to_4d_superpixel(aia171_test_map.data, (9, 7), (1, 4))
+    assert np.may_share_memory(im, aia171_test_map.data)
+    np.testing.assert_array_equal(im[0, :, 0, :], aia171_test_map.data[1:10, 4:11])
+
+
+@pytest.mark.parametrize('method', ['neighbor', 'nearest', 'linear', 'spline'])
+def test_resample_fractional_dimensions(method):
+    data = np.arange(60.).reshape(6, 10)
+    with pytest.raises(ValueError):
+        resample(data, (3, 4.5), method)
+    with pytest.raises(ValueError):
+        resample_stack(data[np.newaxis], (3, 4.5), method)
+    # Whole numbers given as floats are fine
+    assert resample(data, (3., 4.), method).shape == (3, 4)
+
+
+def test_reshape_masked():
+    # A masked image gives a masked view, with the mask reshaped alike
+    data = np.arange(120.).reshape(10, 12)
+    image = np.ma.masked_greater(data, 100)
+    im = reshape_image_to_4d_superpixel(image, (3, 5), (1, 2))
+    assert isinstance(im, np.ma.MaskedArray)
+    assert im.shape == (3, 3, 2, 5)
+    expected = image[1:10, 2:12].reshape(3, 3, 2, 5)
+    np.testing.assert_array_equal(im.data, expected.data)
+    np.testing.assert_array_equal(im.mask, expected.mask)
+    assert np.ma.getmask(im[2, 2, 1, 4])
+    assert not np.ma.getmask(im[0, 0, 0, 0])
+
+
+@pytest.mark.parametrize("func", ['sum', 'mean', 'median', np.max])
+def test_block_reduce(func):
+    data = np.random.RandomState(0).normal(size=(3, 30, 40))
+    reduced = block_reduce(data, (4, 3), (1, 2), func=func)
+    assert reduced.shape == (3, 7, 12)
+
+    reference = {'sum': np.sum, 'mean': np.mean, 'median': np.median}.get(func, func)
+    for frame, reduced_frame in zip(data, reduced):
+        for i in range(7):
+            for j in range(12):
+                block = frame[1 + 4*i:5 + 4*i, 2 + 3*j:5 + 3*j]
+                np.testing.assert_allclose(reduced_frame[i, j], reference(block))
+
+
+@pytest.mark.parametrize("func", ['sum', 'mean', 'median'])
+def test_block_reduce_masked(func):
+    data = np.random.RandomState(0).normal(size=(8, 8))
+    mask = np.zeros(data.shape, dtype=bool)
+    mask[:2, :2] = True
+    mask[4, 4:] = True
+    reduced = block_reduce(np.ma.array(data, mask=mask), (2, 2), func=func)
+
+    assert reduced.mask[0, 0]
+    assert not reduced.mask[2, 2]
+    reference = {'sum': np.ma.sum, 'mean': np.ma.mean, 'median': np.ma.median}[func]
+    np.testing.assert_allclose(reduced[2, 2],
+                               reference(np.ma.array(data, mask=mask)[4:6, 4:6].ravel()))
+
+
+def test_block_reduce_out():
+    data = np.arange(64, dtype=np.float32).reshape(8, 8)
+    out = np.zeros((4, 4), dtype=np.float32)
+    assert block_reduce(data, (2, 2), func='mean', out=out) is out
+    assert out[0, 0] == (0 + 1 + 8 + 9) / 4.
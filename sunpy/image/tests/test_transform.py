@@ -221,3 +221,28 @@ def test_int(identity):
     in_arr = np.array([[100]], dtype=int)
     out_arr = affine_transform(in_arr, rmatrix=identity)
     assert np.issubdtype(out_arr.dtype, np.float)
+
+
+@pytest.mark.parametrize("use_scipy, order", [(False, 1), (False, 3), (False, 4),
+                                              (True, 3), (True, 5)])
+def test_tiled(use_scipy, order):
+    # Test that the tiled transform agrees with the whole image transform
+    angle = np.radians(23)
+    c = np.cos(angle); s = np.sin(angle)
+    rmatrix = np.array([[c, -s], [s, c]])
+    kwargs = dict(order=order, scale=1.3, image_center=(200, 300),
+                  missing=-1.0, use_scipy=use_scipy)
+
+    expected = affine_transform(original, rmatrix, **kwargs)
+    tiled = affine_transform(original, rmatrix, tile_shape=(100, 70), **kwargs)
+    assert np.allclose(expected, tiled, rtol=0, atol=1e-10*original.max())
+
+    out = np.zeros_like(original)
+    result = affine_transform(original, rmatrix, out=out, max_workers=4, **kwargs)
+    assert result is out
+    assert np.allclose(expected, out, rtol=0, atol=1e-10*original.max())
+
+
+def test_tiled_out_shape(identity):
+    with pytest.raises(ValueError):
+        affine_transform(original, identity, out=np.zeros((10, 10)))
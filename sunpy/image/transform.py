@@ -18,9 +18,15 @@ except ImportError:  # pragma: no cover
 
 __all__ = ['affine_transform']
 
+# Magnitude of the largest pole of the B-spline prefilter of each order. The
+# influence of a pixel on the spline coefficients falls by this factor for
+# every pixel of distance, which sets how much tiles have to overlap.
+_SPLINE_POLES = {2: 0.171572875, 3: 0.267949192, 4: 0.361341226, 5: 0.430575348}
+
 
 def affine_transform(image, rmatrix, order=3, scale=1.0, image_center=None,
-                     recenter=False, missing=0.0, use_scipy=False):
+                     recenter=False, missing=0.0, use_scipy=False,
+                     tile_shape=None, out=None, max_workers=None):
     """
     Rotates, shifts and scales an image using :func:`skimage.transform.warp`,
     or :func:`scipy.ndimage.interpolation.affine_transform` if specified. Falls
@@ -54,6 +60,18 @@ def affine_transform(image, rmatrix, order=3, scale=1.0, image_center=None,
         Force use of :func:`scipy.ndimage.interpolation.affine_transform`.
         Will set all NaNs in image to zero before doing the transform.
         Default: False, unless scikit-image can't be imported
+    tile_shape : int or tuple
+        If given, the output is computed in tiles of this shape, each of which
+        only needs the part of the image it maps onto. This bounds the memory
+        used independently of the size of the image.
+        Default: None, unless ``out`` is given, in which case tiles of
+        512x512 pixels are used.
+    out : `numpy.ndarray`
+        An array (or `numpy.memmap`) of the same shape as the image to write
+        the output into. Implies tiling.
+    max_workers : int
+        The number of threads the tiles are spread across.
+        Default: the tiles are computed in turn.
 
     Returns
     -------
@@ -75,6 +93,11 @@ def affine_transform(image, rmatrix, order=3, scale=1.0, image_center=None,
     Input arrays with integer data are cast to float64 and can be re-cast using
     :func:`numpy.ndarray.astype` if desired.
 
+    Each tile is extended by enough pixels that the tiled output agrees with
+    the untiled output to within 1e-10 of the data range. The exception is
+    NaNs that scikit-image spreads through its spline prefilter (at
+    ``order=2``), which are confined to the tiles they fall in.
+
     Although this function is analogous to the IDL's rot() function, it does not
     use the same algorithm as the IDL rot() function.
     IDL's rot() calls the `POLY_2D <http://www.exelisvis.com/docs/poly_2d.html>`_
@@ -84,23 +107,15 @@ def affine_transform(image, rmatrix, order=3, scale=1.0, image_center=None,
     algorithm to map the original to target pixel values.
     """
 
-    rmatrix = rmatrix / scale
-    array_center = (np.array(image.shape)[::-1]-1)/2.0
+    rmatrix, shift = _affine_offset(image.shape[::-1], rmatrix, scale,
+                                    image_center, recenter)
 
-    # Make sure the image center is an array and is where it's supposed to be
-    if image_center is not None:
-        image_center = np.asanyarray(image_center)
-    else:
-        image_center = array_center
-
-    # Determine center of rotation based on use (or not) of the recenter keyword
-    if recenter:
-        rot_center = array_center
-    else:
-        rot_center = image_center
-
-    displacement = np.dot(rmatrix, rot_center)
-    shift = image_center - displacement
+    if tile_shape is not None or out is not None:
+        rotated_image = _tiled_affine_transform(
+                image.T, rmatrix, shift, order=order, missing=missing,
+                use_scipy=use_scipy, tile_shape=tile_shape,
+                out=None if out is None else out.T, max_workers=max_workers)
+        return rotated_image.T if out is None else out
 
     if use_scipy or scikit_image_not_found:
         if np.any(np.isnan(image)):
@@ -147,3 +162,177 @@ def affine_transform(image, rmatrix, order=3, scale=1.0, image_center=None,
         rotated_image += im_min
 
     return rotated_image
+
+
+def _affine_offset(shape, rmatrix, scale=1.0, image_center=None, recenter=False):
+    """
+    Return the matrix and offset which map output pixels onto input pixels for
+    an array of ``shape``, in the convention of
+    :func:`scipy.ndimage.interpolation.affine_transform`.
+    """
+    rmatrix = rmatrix / scale
+    array_center = (np.array(shape)-1)/2.0
+
+    # Make sure the image center is an array and is where it's supposed to be
+    if image_center is not None:
+        image_center = np.asanyarray(image_center)
+    else:
+        image_center = array_center
+
+    # Determine center of rotation based on use (or not) of the recenter keyword
+    if recenter:
+        rot_center = array_center
+    else:
+        rot_center = image_center
+
+    displacement = np.dot(rmatrix, rot_center)
+    shift = image_center - displacement
+
+    return rmatrix, shift
+
+
+def _tile_halo(order, tolerance=1e-10):
+    """
+    The number of pixels each tile has to be extended by for interpolation of
+    the given order to be within ``tolerance`` of the untiled result.
+    """
+    if order < 2:
+        return 2
+    return int(np.ceil(np.log(tolerance) / np.log(_SPLINE_POLES[order]))) + order
+
+
+def _row_strips(image, rows=256):
+    """Iterate over an array in strips of rows, to bound temporary memory."""
+    for start in range(0, image.shape[0], rows):
+        yield image[start:start + rows]
+
+
+def _tiled_affine_transform(image, matrix, offset, output_shape=None, order=3,
+                            missing=0.0, pad=0, use_scipy=False,
+                            tile_shape=None, out=None, max_workers=None):
+    """
+    Apply an affine transform to an image one output tile at a time.
+
+    The output pixel ``o`` is taken from the input at ``matrix . o + offset``,
+    as in :func:`scipy.ndimage.interpolation.affine_transform`. The input is
+    treated as if it were padded with ``pad`` pixels of ``missing`` on every
+    side, so that padding does not have to be allocated.
+
+    Each tile is interpolated from the part of the input it maps onto,
+    extended by a halo wide enough for the spline of the given order, so only
+    tile sized temporaries are needed. The tiles are written into ``out``,
+    which can be a `numpy.memmap`, and are computed by ``max_workers``
+    threads if given.
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    offset = np.zeros(2) + offset
+    pad = np.zeros(2, dtype=int) + pad
+    padded_shape = np.array(image.shape) + 2 * pad
+    if output_shape is None:
+        output_shape = tuple(padded_shape)
+    if out is None:
+        out = np.empty(output_shape)
+    elif out.shape != tuple(output_shape):
+        raise ValueError("out has shape {0}, the output is {1}".format(out.shape,
+                                                                     tuple(output_shape)))
+    tile_shape = np.zeros(2, dtype=int) + (512 if tile_shape is None else tile_shape)
+    halo = _tile_halo(order)
+    use_scipy = use_scipy or scikit_image_not_found
+
+    if not use_scipy:
+        if np.issubdtype(image.dtype, np.integer):
+            warnings.warn("Input integer data has been cast to float64", RuntimeWarning)
+
+        # warp() needs values between -1 and 1, so every tile is normalised by
+        # the range of the whole (padded) image, as in the untiled transform.
+        im_min, im_max, has_nan = np.inf, -np.inf, False
+        for strip in _row_strips(image):
+            im_min = np.fmin(im_min, np.fmin.reduce(strip, axis=None))
+            im_max = np.fmax(im_max, np.fmax.reduce(strip, axis=None))
+            has_nan = has_nan or bool(np.isnan(strip).any())
+        if np.any(pad > 0):
+            im_min, im_max = min(im_min, missing), max(im_max, missing)
+        if has_nan and order >= 4:
+            im_min, im_max = min(im_min, 0), max(im_max, 0)
+        im_max = im_max - im_min
+        if im_max > 0:
+            adjusted_missing = (missing - im_min) / im_max
+        else:
+            adjusted_missing = missing - im_min
+        clip = (min(0, adjusted_missing), max(1 if im_max > 0 else 0, adjusted_missing))
+
+    def transform_tile(rows, cols):
+        shape = (rows.stop - rows.start, cols.stop - cols.start)
+
+        # The region of the padded input that the tile maps onto
+        corners = np.array([[rows.start, rows.start, rows.stop - 1, rows.stop - 1],
+                            [cols.start, cols.stop - 1, cols.start, cols.stop - 1]])
+        source = np.dot(matrix, corners) + offset[:, np.newaxis]
+        lower = np.maximum(np.floor(source.min(axis=1)).astype(int) - halo, 0)
+        upper = np.minimum(np.ceil(source.max(axis=1)).astype(int) + halo + 1,
+                           padded_shape)
+        if np.any(upper <= lower):
+            out[rows, cols] = missing
+            return False
+
+        block = np.empty(upper - lower)
+        block.fill(missing)
+        start = np.maximum(lower - pad, 0)
+        stop = np.minimum(upper - pad, image.shape)
+        if np.all(stop > start):
+            into = start + pad - lower
+            block[into[0]:into[0] + stop[0] - start[0],
+                  into[1]:into[1] + stop[1] - start[1]] = image[start[0]:stop[0],
+                                                                start[1]:stop[1]]
+        has_nan = bool(np.isnan(block).any())
+        tile_offset = offset + np.dot(matrix, [rows.start, cols.start]) - lower
+
+        if use_scipy:
+            result = scipy.ndimage.interpolation.affine_transform(
+                    np.nan_to_num(block), matrix, offset=tile_offset,
+                    output_shape=shape, order=order, mode='constant', cval=missing)
+        else:
+            if has_nan and order >= 4:
+                block = np.nan_to_num(block)
+            block -= im_min
+            if im_max > 0:
+                block /= im_max
+
+            # warp() works in (column, row) order
+            skmatrix = np.zeros((3, 3))
+            skmatrix[:2, :2] = matrix[::-1, ::-1]
+            skmatrix[:2, 2] = tile_offset[::-1]
+            skmatrix[2, 2] = 1.0
+            tform = skimage.transform.AffineTransform(skmatrix)
+            result = skimage.transform.warp(block, tform, output_shape=shape,
+                                            order=order, mode='constant',
+                                            cval=adjusted_missing, clip=False)
+            np.clip(result, clip[0], clip[1], out=result)
+
+            if im_max > 0:
+                result *= im_max
+            result += im_min
+
+        out[rows, cols] = result
+        return has_nan
+
+    tiles = [(slice(row, min(row + tile_shape[0], output_shape[0])),
+              slice(col, min(col + tile_shape[1], output_shape[1])))
+             for row in range(0, output_shape[0], tile_shape[0])
+             for col in range(0, output_shape[1], tile_shape[1])]
+
+    if max_workers is None or max_workers <= 1:
+        nans = [transform_tile(*tile) for tile in tiles]
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            nans = list(pool.map(lambda tile: transform_tile(*tile), tiles))
+
+    if any(nans):
+        if use_scipy:
+            warnings.warn("Setting NaNs to 0 for SciPy rotation", RuntimeWarning)
+        elif order >= 4:
+            warnings.warn("Setting NaNs to 0 for higher-order scikit-image rotation",
+                          RuntimeWarning)
+
+    return out
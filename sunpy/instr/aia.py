@@ -42,6 +42,61 @@ def aiaprep(aiamap):
     if not isinstance(aiamap, AIAMap):
         raise ValueError("Input must be an AIAMap")
 
+    tempmap = aiamap.rotate(recenter=True, scale=_scale_factor(aiamap),
+                            missing=aiamap.min())
+
+    return _level_one_five(aiamap, tempmap)
+
+
+def aiaprep_cube(mapcube, max_workers=None):
+    """
+    Processes every level 1 `~sunpy.map.sources.sdo.AIAMap` in a
+    `~sunpy.map.MapCube` into a level 1.5 map, as `aiaprep` does.
+
+    The maps are rotated with :meth:`~sunpy.map.MapCube.rotate`, so frames
+    which share their geometry share the transformation matrix and the meta
+    data updates, and the frames can be processed in parallel.
+
+    Parameters
+    ----------
+    mapcube : `~sunpy.map.MapCube`
+        A MapCube of AIA maps
+    max_workers : int
+        The number of threads the maps are spread across.
+        Default: the maps are processed in turn.
+
+    Returns
+    -------
+    newcube : A `~sunpy.map.MapCube` of level 1.5 maps, in the same order.
+    """
+    from sunpy.map import MapCube
+
+    for aiamap in mapcube.maps:
+        if not isinstance(aiamap, AIAMap):
+            raise ValueError("Input must be a MapCube of AIAMaps")
+
+    # Frames are rotated together for each scale factor, which is normally
+    # the same for the whole cube.
+    groups = {}
+    for index, aiamap in enumerate(mapcube.maps):
+        groups.setdefault(_scale_factor(aiamap), []).append(index)
+
+    newmaps = [None] * len(mapcube.maps)
+    for scale_factor, indices in groups.items():
+        maps = [mapcube.maps[index] for index in indices]
+        tempcube = MapCube(maps, sortby=None).rotate(recenter=True, scale=scale_factor,
+                                                     missing=[m.min() for m in maps],
+                                                     max_workers=max_workers)
+        for index, aiamap, tempmap in zip(indices, maps, tempcube.maps):
+            newmaps[index] = _level_one_five(aiamap, tempmap)
+
+    return MapCube(newmaps, sortby=None)
+
+
+def _scale_factor(aiamap):
+    """
+    The factor an AIA map has to be scaled by for a level 1.5 map.
+    """
     # Target scale is 0.6 arcsec/pixel, but this needs to be adjusted if the map
     # has already been rescaled.
     if (aiamap.scale.x/0.6).round() != 1.0*u.arcsec and aiamap.data.shape != (4096, 4096):
@@ -50,8 +105,14 @@ def aiaprep(aiamap):
         scale = 0.6*u.arcsec # pragma: no cover # can't test this because it needs a full res image
     scale_factor = aiamap.scale.x / scale
 
-    tempmap = aiamap.rotate(recenter=True, scale=scale_factor.value, missing=aiamap.min())
+    return scale_factor.value
+
 
+def _level_one_five(aiamap, tempmap):
+    """
+    Crop a rotated AIA map to the size of the original map and update its
+    meta data for level 1.5.
+    """
     # extract center from padded aiamap.rotate output
     # crpix1 and crpix2 will be equal (recenter=True), as aiaprep does not work with submaps
     center = np.floor(tempmap.meta['crpix1'])
@@ -7,7 +7,7 @@ import numpy as np
 
 import sunpy.map
 import sunpy.data.test as test
-from sunpy.instr.aia import aiaprep
+from sunpy.instr.aia import aiaprep, aiaprep_cube
 
 # Define the original and prepped images first so they're available to all functions
 
@@ -54,3 +54,20 @@ def test_filesave(prep_map):
     np.testing.assert_allclose(prep_map.rotation_matrix, np.identity(2), rtol=1e-5, atol=1e-8)
     # Check level number
     assert load_map.meta['lvl_num'] == 1.5
+
+
+def test_aiaprep_cube(original, prep_map):
+    prep_cube = aiaprep_cube(sunpy.map.Map([original, original], cube=True),
+                             max_workers=2)
+    assert len(prep_cube) == 2
+    for amap in prep_cube:
+        np.testing.assert_allclose(amap.data, prep_map.data)
+        assert amap.meta == prep_map.meta
+
+
+def test_aiaprep_cube_not_aia(original):
+    meta = original.meta.copy()
+    meta['instrume'] = 'FOO'
+    generic = sunpy.map.Map(original.data, meta)
+    with pytest.raises(ValueError):
+        aiaprep_cube(sunpy.map.Map([original, generic], cube=True))
@@ -42,7 +42,8 @@ import collections
 from astropy.io import fits
 
 from sunpy.io.header import FileHeader
-from sunpy.extern.six.moves import zip
+from sunpy.extern import six
+from sunpy.extern.six.moves import zip, range
 
 __all__ = ['read', 'get_header', 'write', 'extract_waveunit']
 
@@ -101,7 +102,7 @@ def read(filepath, hdus=None, memmap=None, **kwargs):
     return pairs
 
 
-def get_header(afile):
+def get_header(afile, fast=False):
     """
     Read a fits file and return just the headers for all HDU's. In each header,
     the key WAVEUNIT denotes the wavelength unit which is used to describe the
@@ -111,12 +112,22 @@ def get_header(afile):
     ----------
     afile : `str` or fits.HDUList
         The file to be read, or HDUList to process.
+    fast : `bool`
+        If True and ``afile`` is the path of an uncompressed FITS file, only
+        the header blocks are read and parsed with a minimal card parser: the
+        data units are skipped and the headers are not verified. Files which
+        the minimal parser does not support are read as normal.
 
     Returns
     -------
     headers : `list`
         A list of FileHeader headers.
     """
+    if fast and isinstance(afile, six.string_types):
+        headers = _fast_get_header(afile)
+        if headers is not None:
+            return headers
+
     if isinstance(afile, fits.HDUList):
         hdulist = afile
         close = False
@@ -156,6 +167,180 @@ def get_header(afile):
     return headers
 
 
+def _fast_get_header(filepath):
+    """
+    Read the headers of all the HDUs in a FITS file without using
+    `astropy.io.fits`, skipping over the data units.
+
+    Returns `None` if the file is not supported by this reader, e.g. it is
+    compressed or contains tile compressed images.
+    """
+    headers = []
+    with open(filepath, 'rb') as fp:
+        while True:
+            cards = _read_header_cards(fp)
+            if not headers and (not cards or not cards[0].startswith('SIMPLE')):
+                return None
+            if cards is None:
+                break
+
+            header = FileHeader()
+            keydict = {}
+            commentary = {'COMMENT': [], 'HISTORY': [], '': []}
+            for keyword, value, comment in _parse_cards(cards):
+                if keyword in commentary:
+                    commentary[keyword].append(comment)
+                    header.setdefault(keyword, None)
+                    continue
+                # Keywords with an undefined value are kept as None
+                if keyword not in header:
+                    header[keyword] = value
+                if comment:
+                    keydict[keyword] = comment
+
+            if header.get('ZIMAGE') is True:
+                return None
+
+            header['COMMENT'] = "".join(commentary['COMMENT']).strip()
+            header['HISTORY'] = "".join(commentary['HISTORY']).strip()
+            if '' in header:
+                header[''] = "\n".join(commentary[''])
+            header['KEYCOMMENTS'] = keydict
+            header['WAVEUNIT'] = extract_waveunit(header)
+            headers.append(header)
+
+            fp.seek(_data_size(header), os.SEEK_CUR)
+
+    return headers
+
+
+_BLOCK_SIZE = 2880
+_CARD_SIZE = 80
+_STRING_VALUE = re.compile(r"'(?P<value>(?:[^']|'')*)'")
+_NUMBER_VALUE = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([EeDd][+-]?\d+)?$")
+
+
+def _read_header_cards(fp):
+    """
+    Read the header blocks of the next HDU and return the list of cards, up to
+    but not including the END card. Returns `None` at the end of the file.
+    """
+    cards = []
+    while True:
+        block = fp.read(_BLOCK_SIZE)
+        if len(block) < _BLOCK_SIZE:
+            return None
+        block = block.decode('ascii', 'replace')
+        for i in range(0, _BLOCK_SIZE, _CARD_SIZE):
+            card = block[i:i + _CARD_SIZE]
+            if card.startswith('END') and not card[3:].strip():
+                return cards
+            cards.append(card)
+
+
+def _parse_cards(cards):
+    """
+    Parse a list of header cards into (keyword, value, comment) tuples,
+    joining long string values which are continued on CONTINUE cards.
+    """
+    parsed = []
+    continued = False
+    for card in cards:
+        keyword, value, comment = _parse_card(card)
+        if (keyword == 'CONTINUE' and parsed and
+                isinstance(parsed[-1][1], six.string_types) and
+                parsed[-1][1].endswith('&')):
+            previous_keyword, previous_value, previous_comment = parsed[-1]
+            parsed[-1] = (previous_keyword,
+                          previous_value[:-1] + (value or ''),
+                          ' '.join(c for c in (previous_comment, comment) if c))
+            continued = True
+            continue
+        if continued:
+            parsed[-1] = (parsed[-1][0], parsed[-1][1].rstrip('&'), parsed[-1][2])
+            continued = False
+        parsed.append((keyword, value, comment))
+    if continued:
+        parsed[-1] = (parsed[-1][0], parsed[-1][1].rstrip('&'), parsed[-1][2])
+    return parsed
+
+
+def _parse_card(card):
+    """
+    Split a header card into its keyword, value and comment. The value of
+    commentary cards (COMMENT, HISTORY, etc.) is `None` and their text is
+    returned as the comment. Other cards without a value indicator have their
+    text as the value, and an empty value is `None`, as in `astropy.io.fits`.
+    """
+    keyword = card[:8].rstrip().upper()
+    if keyword in ('COMMENT', 'HISTORY', ''):
+        return keyword, None, card[8:].rstrip()
+    elif keyword == 'HIERARCH' and '=' in card:
+        keyword, valuestring = card[9:].split('=', 1)
+        keyword = keyword.strip().upper()
+    elif keyword == 'CONTINUE':
+        valuestring = card[8:]
+    elif card[8:10] == '= ':
+        valuestring = card[10:]
+    else:
+        return keyword, card[8:].rstrip(), ''
+
+    valuestring = valuestring.strip()
+    if valuestring.startswith("'"):
+        match = _STRING_VALUE.match(valuestring)
+        if match is not None:
+            value = match.group('value').replace("''", "'").rstrip()
+            comment = valuestring[match.end():].partition('/')[2].strip()
+            return keyword, value, comment
+
+    valuestring, _, comment = valuestring.partition('/')
+    return keyword, _convert_value(valuestring.strip()), comment.strip()
+
+
+def _convert_value(valuestring):
+    """
+    Convert the text of a non-string card value to a Python object.
+    """
+    if valuestring == 'T':
+        return True
+    if valuestring == 'F':
+        return False
+    if valuestring == '':
+        return None
+    if _NUMBER_VALUE.match(valuestring):
+        try:
+            return int(valuestring)
+        except ValueError:
+            return float(re.sub('[Dd]', 'E', valuestring))
+    if valuestring.startswith('(') and valuestring.endswith(')'):
+        try:
+            real, imag = valuestring[1:-1].split(',')
+            return complex(_convert_value(real.strip()), _convert_value(imag.strip()))
+        except (ValueError, TypeError):
+            pass
+    return valuestring
+
+
+def _data_size(header):
+    """
+    Return the size in bytes, including the padding, of the data unit that
+    follows a header.
+    """
+    naxis = header.get('NAXIS', 0)
+    if naxis == 0:
+        return 0
+    axes = [header.get('NAXIS{0}'.format(i), 0) for i in range(1, naxis + 1)]
+    # Random groups have NAXIS1 = 0
+    if header.get('GROUPS') is True and axes[0] == 0:
+        axes = axes[1:]
+    npix = 1
+    for axis in axes:
+        npix *= axis
+    size = (abs(header.get('BITPIX', 8)) // 8 * header.get('GCOUNT', 1) *
+            (header.get('PCOUNT', 0) + npix))
+    return -(-size // _BLOCK_SIZE) * _BLOCK_SIZE
+
+
 def write(fname, data, header, **kwargs):
     """
     Take a data header pair and write a FITS file.
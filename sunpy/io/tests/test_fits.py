@@ -1,3 +1,7 @@
+import pytest
+import numpy as np
+from astropy.io import fits
+
 import sunpy.io.fits
 from sunpy.io.fits import get_header, extract_waveunit
 
@@ -13,6 +17,8 @@ RHESSI_IMAGE = os.path.join(testpath, 'hsi_image_20101016_191218.fits')
 EIT_195_IMAGE = os.path.join(testpath, 'EIT/efz20040301.000010_s.fits')
 AIA_171_IMAGE = os.path.join(testpath, 'aia_171_level1.fits')
 SWAP_LEVEL1_IMAGE = os.path.join(testpath, 'SWAP/resampled1_swap.fits')
+HMI_IMAGE = os.path.join(testpath, 'resampled_hmi.fits')
+GZIP_IMAGE = os.path.join(testpath, 'gzip_test.fits.gz')
 
 
 def read_hdus():
@@ -81,3 +87,47 @@ def test_extract_waveunit_wavelnthcomment_parentheses():
     # WAVELNTH comment is: "Observed wavelength (nm)"
     waveunit = extract_waveunit(get_header(SVSM_IMAGE)[0])
     assert waveunit == 'nm'
+
+
+@pytest.mark.parametrize('fname', [RHESSI_IMAGE, EIT_195_IMAGE, AIA_171_IMAGE,
+                                   SWAP_LEVEL1_IMAGE, HMI_IMAGE, MEDN_IMAGE])
+def test_get_header_fast(fname):
+    # The minimal header parser gives the same headers as astropy
+    assert_fast_header_equal(fname)
+
+
+def test_get_header_fast_undefined_value(tmpdir):
+    # Keywords without a value are kept, with their comments
+    header = fits.Header()
+    header.append(fits.Card.fromstring('EMPTY   =                      / no value'))
+    header.append(fits.Card.fromstring('BLANK   ='))
+    fname = str(tmpdir.join('undefined.fits'))
+    fits.PrimaryHDU(np.zeros((2, 2)), header=header).writeto(fname)
+    assert get_header(fname, fast=True)[0]['EMPTY'] is None
+    assert_fast_header_equal(fname)
+
+
+def assert_fast_header_equal(fname):
+    headers = get_header(fname)
+    fast_headers = get_header(fname, fast=True)
+    assert len(fast_headers) == len(headers)
+    for header, fast_header in zip(headers, fast_headers):
+        assert list(fast_header.keys()) == list(header.keys())
+        for key in header:
+            if key == '':
+                assert fast_header[key] == str(header[key])
+            else:
+                assert fast_header[key] == header[key]
+
+
+@pytest.mark.parametrize('valuestring, value', [
+    ('T', True), ('F', False), ('', None), ('42', 42), ('-1.5', -1.5),
+    ('1.0E3', 1000.0), ('1.0e3', 1000.0), ('1.0D3', 1000.0), ('1.0d3', 1000.0),
+    ('(1, -2.5D1)', complex(1, -25)), ('INDEF', 'INDEF')])
+def test_convert_value(valuestring, value):
+    assert sunpy.io.fits._convert_value(valuestring) == value
+
+
+def test_get_header_fast_gzip():
+    # Compressed files are read with astropy
+    assert len(get_header(GZIP_IMAGE, fast=True)) == len(get_header(GZIP_IMAGE))
@@ -38,7 +38,7 @@ except ImportError:
     class DatabaseEntry(object):
         pass
 
-__all__ = ['Map', 'MapFactory']
+__all__ = ['Map', 'MapFactory', 'MapFileReadError']
 
 class MapFactory(BasicRegistrationFactory):
     """
@@ -104,6 +104,11 @@ class MapFactory(BasicRegistrationFactory):
         #call a fits file or a jpeg2k file, etc
         pairs = read_file(fname, **kwargs)
 
+        return self._convert_file_pairs(pairs)
+
+    def _convert_file_pairs(self, pairs):
+        """ Convert the (data, header) pairs read from a file to the list of
+            (data, meta) pairs used to build maps. """
         new_pairs = []
         for pair in pairs:
             filedata, filemeta = pair
@@ -115,6 +120,37 @@ class MapFactory(BasicRegistrationFactory):
                 new_pairs.append((data, meta))
         return new_pairs
 
+    def _read_files(self, files, parallel=None, executor=None, **kwargs):
+        """
+        Read a list of files and return one list of (data, meta) pairs per
+        file, in the same order as the input files.
+
+        If an ``executor`` is given, or ``parallel`` is more than one, the
+        files are read (and their headers parsed and verified) concurrently.
+        In that case every file is attempted and the failures are reported
+        together in a single `MapFileReadError`.
+        """
+        if executor is None and (parallel is None or parallel <= 1):
+            return [self._read_file(afile, **kwargs) for afile in files]
+
+        if executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=parallel) as pool:
+                return self._read_files(files, executor=pool, **kwargs)
+
+        futures = [executor.submit(read_file, afile, **kwargs) for afile in files]
+
+        pairs, errors = [], []
+        for afile, future in zip(files, futures):
+            try:
+                pairs.append(self._convert_file_pairs(future.result()))
+            except Exception as e:
+                errors.append((afile, e))
+        if errors:
+            raise MapFileReadError(errors)
+
+        return pairs
+
     def _validate_meta(self, meta):
         """
         Validate a meta argument.
@@ -138,6 +174,10 @@ class MapFactory(BasicRegistrationFactory):
         * url, which will be downloaded and read
         * lists containing any of the above.
 
+        The files are read once all the arguments have been parsed, see
+        `MapFactory._read_files` for the ``parallel`` and ``executor``
+        keywords.
+
         Example
         -------
         self._parse_args(data, header,
@@ -149,6 +189,11 @@ class MapFactory(BasicRegistrationFactory):
 
         """
 
+        parallel = kwargs.pop('parallel', None)
+        executor = kwargs.pop('executor', None)
+
+        # Each entry is either a list of data-header pairs or the name of a
+        # file which still has to be read.
         data_header_pairs = list()
         already_maps = list()
 
@@ -168,36 +213,33 @@ class MapFactory(BasicRegistrationFactory):
                 self._validate_meta(arg[1])):
 
                 arg[1] = OrderedDict(arg[1])
-                data_header_pairs.append(arg)
+                data_header_pairs.append([arg])
 
             # Data-header pair not in a tuple
             elif (isinstance(arg, np.ndarray) and
                   self._validate_meta(args[i+1])):
 
                 pair = (args[i], OrderedDict(args[i+1]))
-                data_header_pairs.append(pair)
+                data_header_pairs.append([pair])
                 i += 1 # an extra increment to account for the data-header pairing
 
             # File name
             elif (isinstance(arg,six.string_types) and
                   os.path.isfile(os.path.expanduser(arg))):
                 path = os.path.expanduser(arg)
-                pairs = self._read_file(path, **kwargs)
-                data_header_pairs += pairs
+                data_header_pairs.append(path)
 
             # Directory
             elif (isinstance(arg,six.string_types) and
                   os.path.isdir(os.path.expanduser(arg))):
                 path = os.path.expanduser(arg)
                 files = [os.path.join(path, elem) for elem in os.listdir(path)]
-                for afile in files:
-                    data_header_pairs += self._read_file(afile, **kwargs)
+                data_header_pairs += files
 
             # Glob
             elif (isinstance(arg,six.string_types) and '*' in arg):
                 files = glob.glob( os.path.expanduser(arg) )
-                for afile in files:
-                    data_header_pairs += self._read_file(afile, **kwargs)
+                data_header_pairs += files
 
             # Already a Map
             elif isinstance(arg, GenericMap):
@@ -209,17 +251,27 @@ class MapFactory(BasicRegistrationFactory):
                 default_dir = sunpy.config.get("downloads", "download_dir")
                 url = arg
                 path = download_file(url, default_dir)
-                pairs = self._read_file(path, **kwargs)
-                data_header_pairs += pairs
+                data_header_pairs.append(path)
 
             # A database Entry
             elif isinstance(arg, DatabaseEntry):
-                data_header_pairs += self._read_file(arg.path, **kwargs)
+                data_header_pairs.append(arg.path)
 
             else:
                 raise ValueError("File not found or invalid input")
 
             i += 1
+
+        files = [entry for entry in data_header_pairs
+                 if isinstance(entry, six.string_types)]
+        file_pairs = iter(self._read_files(files, parallel=parallel,
+                                           executor=executor, **kwargs))
+        data_header_pairs = [pair
+                             for entry in data_header_pairs
+                             for pair in (next(file_pairs)
+                                          if isinstance(entry, six.string_types)
+                                          else entry)]
+
         #TODO:
         # In the end, if there are already maps it should be put in the same
         # order as the input, currently they are not.
@@ -247,10 +299,21 @@ class MapFactory(BasicRegistrationFactory):
         silence_errors : boolean, optional
             If set, ignore data-header pairs which cause an exception.
 
+        parallel : int, optional
+            Read the files using a pool of this many threads.
+
+        executor : `concurrent.futures.Executor`, optional
+            Read the files using this executor, for example a
+            `~concurrent.futures.ProcessPoolExecutor`. If one or more of the
+            files can not be read, a single `MapFileReadError` listing all the
+            failures is raised once every file has been tried.
+
         Notes
         -----
         Extra keyword arguments are passed through to `sunpy.io.read_file` such
-        as `memmap` for FITS files.
+        as `memmap` for FITS files. With ``memmap=True`` the map data stay on
+        disk and pixels are only read when they are accessed; combined with
+        ``cube=True`` this gives a lazily loaded `~sunpy.map.MapCube`.
         """
 
         # Hack to get around Python 2.x not backporting PEP 3102.
@@ -258,7 +321,13 @@ class MapFactory(BasicRegistrationFactory):
         cube = kwargs.pop('cube', False)
         silence_errors = kwargs.pop('silence_errors', False)
 
-        data_header_pairs, already_maps = self._parse_args(*args, **kwargs)
+        # memmap, parallel and executor are only understood by the file
+        # readers, they must not be passed on to the map constructors.
+        read_kwargs = dict(kwargs)
+        for key in ('memmap', 'parallel', 'executor'):
+            kwargs.pop(key, None)
+
+        data_header_pairs, already_maps = self._parse_args(*args, **read_kwargs)
 
         new_maps = list()
 
@@ -295,13 +364,12 @@ class MapFactory(BasicRegistrationFactory):
 
     def _check_registered_widgets(self, data, meta, **kwargs):
 
-        candidate_widget_types = list()
-
-        for key in self.registry:
-
-            # Call the registered validation function for each registered class
-            if self.registry[key](data, meta, **kwargs):
-                candidate_widget_types.append(key)
+        # Call the registered validation function for each registered class.
+        # The validation functions only look at the header, so the matching
+        # classes are cached by the values of the header keys they look up.
+        candidate_widget_types = self._get_candidate_widget_types(
+            meta, lambda validate, header: validate(data, header, **kwargs),
+            cache_key=tuple(sorted(six.iteritems(kwargs), key=lambda item: item[0])))
 
         n_matches = len(candidate_widget_types)
 
@@ -341,6 +409,17 @@ class NoMapsFound(ValueError):
     """
     pass
 
+class MapFileReadError(IOError):
+    """Exception to raise when one or more files could not be read. The
+    ``errors`` attribute is a list of (filename, exception) pairs.
+    """
+    def __init__(self, errors):
+        self.errors = errors
+        message = "{0} file(s) could not be read:\n".format(len(errors))
+        message += "\n".join("{0}: {1!r}".format(fname, error)
+                              for fname, error in errors)
+        super(MapFileReadError, self).__init__(message)
+
 Map = MapFactory(default_widget_type=GenericMap,
                  additional_validation_functions=['is_datasource_for'])
 Map.registry = MAP_CLASSES
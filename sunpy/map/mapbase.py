@@ -6,6 +6,7 @@ from sunpy.extern.six.moves import range
 
 import warnings
 import inspect
+import functools
 from abc import ABCMeta
 from copy import deepcopy
 from collections import OrderedDict, namedtuple
@@ -20,7 +21,7 @@ from astropy.visualization.wcsaxes import WCSAxes
 from astropy.coordinates import Longitude, Latitude
 
 import sunpy.io as io
-import sunpy.wcs as wcs
+from sunpy.wcs.wcs import _hpc_to_hcc, _hcc_to_hpc, _hcc_to_hg, _hg_to_hcc
 import sunpy.coordinates # Import to register with Astropy
 from sunpy import config
 from sunpy.extern import six
@@ -29,13 +30,16 @@ from sunpy.sun import constants
 from sunpy.sun import sun
 from sunpy.time import parse_time, is_time
 from sunpy.image.transform import affine_transform
-from sunpy.image.rescale import reshape_image_to_4d_superpixel
+from sunpy.image.transform import _affine_offset, _tiled_affine_transform
+from sunpy.image.rescale import block_reduce
 from sunpy.image.rescale import resample as sunpy_image_resample
+from sunpy.util.metadata import MetaDict
 
 from astropy.nddata import NDData
 
 TIME_FORMAT = config.get("general", "time_format")
 Pair = namedtuple('Pair', 'x y')
+_RotationPlan = namedtuple('_RotationPlan', 'shape rmatrix scale recenter pad unpad meta')
 
 __all__ = ['GenericMap']
 
@@ -52,6 +56,46 @@ or something else?)
 MAP_CLASSES = OrderedDict()
 
 
+def _freeze(value):
+    """Make any arrays in a cached property value read-only."""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, tuple):
+        for item in value:
+            _freeze(item)
+    return value
+
+
+def _meta_property(func):
+    """
+    A read-only property which is computed from the meta data of a map.
+
+    The value is stored on the map and returned by later accesses until the
+    `~sunpy.util.metadata.MetaDict` holding the meta data is modified or
+    replaced. Any arrays in the value are made read-only, as they are shared
+    between accesses. Maps whose meta data is not a
+    `~sunpy.util.metadata.MetaDict` recompute the value every time.
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    def getter(self):
+        meta = self.meta
+        if not isinstance(meta, MetaDict):
+            return func(self)
+
+        cache = self.__dict__.setdefault('_meta_cache', {})
+        cached = cache.get(name)
+        if cached is not None and cached[0] is meta and cached[1] == meta.version:
+            return cached[2]
+
+        value = _freeze(func(self))
+        cache[name] = (meta, meta.version, value)
+        return value
+
+    return property(getter)
+
+
 class GenericMapMetaclass(ABCMeta):
     """
     Registration metaclass for `~sunpy.map.GenericMap`.
@@ -227,6 +271,9 @@ scale:\t\t {scale}
     def wcs(self):
         """
         The `~astropy.wcs.WCS` property of the map.
+
+        Every access builds a new WCS, which can be modified without
+        affecting the map.
         """
         w2 = astropy.wcs.WCS(naxis=2)
         w2.wcs.crpix = u.Quantity(self.reference_pixel)
@@ -254,13 +301,21 @@ scale:\t\t {scale}
 
         return w2
 
-    @property
+    @_meta_property
+    def _shared_wcs(self):
+        """
+        The `~astropy.wcs.WCS` used for the coordinate transformations of the
+        map, which is shared between accesses and must not be modified.
+        """
+        return self.wcs
+
+    @_meta_property
     def coordinate_frame(self):
         """
         An `astropy.coordinates.BaseFrame` instance created from the coordinate
         information for this Map.
         """
-        return astropy.wcs.utils.wcs_to_celestial_frame(self.wcs)
+        return astropy.wcs.utils.wcs_to_celestial_frame(self._shared_wcs)
 
     def _as_mpl_axes(self):
         """
@@ -516,7 +571,7 @@ scale:\t\t {scale}
 
         return u.Quantity(rsun_arcseconds, 'arcsec')
 
-    @property
+    @_meta_property
     def coordinate_system(self):
         """Coordinate system used for x and y axes (ctype1/2)"""
         return Pair(self.meta.get('ctype1', 'HPLN-TAN'),
@@ -557,14 +612,14 @@ scale:\t\t {scale}
         """Heliographic longitude"""
         return u.Quantity(self.meta.get('hgln_obs', 0.), 'deg')
 
-    @property
+    @_meta_property
     def reference_coordinate(self):
         """Reference point WCS axes in data units (i.e. crval1, crval2). This value
         includes a shift if one is set."""
         return Pair(self.meta.get('crval1', 0.) * self.spatial_units.x,
                     self.meta.get('crval2', 0.) * self.spatial_units.y)
 
-    @property
+    @_meta_property
     def reference_pixel(self):
         """Reference point axes in pixels (i.e. crpix1, crpix2)"""
         return Pair(self.meta.get('crpix1',
@@ -572,7 +627,7 @@ scale:\t\t {scale}
                     self.meta.get('crpix2',
                                   (self.meta.get('naxis2') + 1) / 2.) * u.pixel)
 
-    @property
+    @_meta_property
     def scale(self):
         """
         Image scale along the x and y axes in units/pixel (i.e. cdelt1, cdelt2)
@@ -581,7 +636,7 @@ scale:\t\t {scale}
         return Pair(self.meta.get('cdelt1', 1.) * self.spatial_units.x / u.pixel,
                     self.meta.get('cdelt2', 1.) * self.spatial_units.y / u.pixel)
 
-    @property
+    @_meta_property
     def spatial_units(self):
         """
         Image coordinate units along the x and y axes (i.e. cunit1, cunit2).
@@ -589,7 +644,7 @@ scale:\t\t {scale}
         return Pair(u.Unit(self.meta.get('cunit1', 'arcsec')),
                     u.Unit(self.meta.get('cunit2', 'arcsec')))
 
-    @property
+    @_meta_property
     def rotation_matrix(self):
         """
         Matrix describing the rotation required to align solar North with
@@ -714,8 +769,8 @@ scale:\t\t {scale}
         y : `~astropy.units.Quantity`
             Pixel coordinate on the CTYPE2 axis.
         """
-        x, y = self.wcs.wcs_world2pix(x.to(u.deg).value,
-                                      y.to(u.deg).value, origin)
+        x, y = self._shared_wcs.wcs_world2pix(x.to(u.deg).value,
+                                             y.to(u.deg).value, origin)
 
         return x * u.pixel, y * u.pixel
 
@@ -749,10 +804,10 @@ scale:\t\t {scale}
         y : `~astropy.units.Quantity`
             Coordinate of the CTYPE2 axis. (Normally solar-y).
         """
-        x, y = self.wcs.wcs_pix2world(x, y, origin)
+        x, y = self._shared_wcs.wcs_pix2world(x, y, origin)
 
         # If the wcs is celestial it is output in degress
-        if self.wcs.is_celestial:
+        if self._shared_wcs.is_celestial:
             x = u.Quantity(x, u.deg)
             y = u.Quantity(y, u.deg)
         else:
@@ -764,6 +819,79 @@ scale:\t\t {scale}
 
         return x.to(self.spatial_units.x), y.to(self.spatial_units.y)
 
+    def _pixel_array(self, pixels):
+        """Split an (N, 2) array of pixel coordinates into its x and y
+        columns. If ``pixels`` is `None`, return the coordinates of the
+        centre of every pixel of the map, in arrays of the shape of the data.
+        """
+        if pixels is None:
+            y, x = np.indices(self.data.shape, dtype=float)
+            return x, y
+        pixels = u.Quantity(pixels, u.pixel).value
+        if pixels.shape[-1] != 2:
+            raise ValueError("pixels must be an array of shape (N, 2)")
+        return pixels[..., 0], pixels[..., 1]
+
+    def pixel_array_to_data(self, pixels=None, origin=0):
+        """
+        Convert many pixel coordinates to data (world) coordinates at once.
+
+        Parameters
+        ----------
+        pixels : `~astropy.units.Quantity` or `~numpy.ndarray`, optional
+            An (N, 2) array of (x, y) pixel coordinates. Defaults to all the
+            pixels of the map.
+
+        origin : int
+            Origin of the top-left corner, see
+            `~sunpy.map.GenericMap.pixel_to_data`.
+
+        Returns
+        -------
+        x, y : `~astropy.units.Quantity`
+            The coordinates of the CTYPE1 and CTYPE2 axes, of shape (N,), or
+            of the shape of the data if ``pixels`` is not given.
+        """
+        x, y = self._pixel_array(pixels)
+        return Pair(*self.pixel_to_data(x * u.pixel, y * u.pixel, origin))
+
+    def pixel_to_heliographic(self, pixels=None, origin=0):
+        """
+        Convert many pixel coordinates to Stonyhurst heliographic coordinates
+        on the solar surface at once.
+
+        The position of the observer (``dsun``, ``heliographic_latitude`` and
+        ``heliographic_longitude``) is read once, and the conversion is done
+        with whole-array NumPy operations (Eqs. 15 and 12 of Thompson (2006),
+        A&A, 449, 791), so it is practical for the full pixel grid of a large
+        image.
+
+        Parameters
+        ----------
+        pixels : `~astropy.units.Quantity` or `~numpy.ndarray`, optional
+            An (N, 2) array of (x, y) pixel coordinates. Defaults to all the
+            pixels of the map.
+
+        origin : int
+            Origin of the top-left corner, see
+            `~sunpy.map.GenericMap.pixel_to_data`.
+
+        Returns
+        -------
+        longitude, latitude : `~astropy.coordinates.Longitude`, `~astropy.coordinates.Latitude`
+            Heliographic longitude and latitude, NaN for pixels which are off
+            the solar disk.
+        """
+        x, y = self.pixel_array_to_data(pixels, origin)
+        hccx, hccy, hccz = _hpc_to_hcc(x.to(u.rad).value, y.to(u.rad).value,
+                                       self.dsun.to(u.m).value,
+                                       self.rsun_meters.to(u.m).value)
+        lon, lat, _ = _hcc_to_hg(hccx, hccy, hccz,
+                                 self.heliographic_latitude.to(u.rad).value,
+                                 self.heliographic_longitude.to(u.rad).value)
+        return Pair(Longitude(lon * u.rad, wrap_angle=180*u.deg).to(u.deg),
+                    Latitude(lat * u.rad).to(u.deg))
+
 
 # #### I/O routines #### #
 
@@ -805,8 +933,8 @@ scale:\t\t {scale}
         method : {'neighbor' | 'nearest' | 'linear' | 'spline'}
             Method to use for resampling interpolation.
                 * neighbor - Closest value from original data
-                * nearest and linear - Uses n x 1-D interpolations using
-                  scipy.interpolate.interp1d
+                * nearest and linear - Uses n x 1-D interpolations, as
+                  scipy.interpolate.interp1d does
                 * spline - Uses ndimage.map_coordinates
 
         Returns
@@ -826,11 +954,20 @@ scale:\t\t {scale}
         # Note: "center" defaults to True in this function because data
         #   coordinates in a Map are at pixel centers
 
-        # Make a copy of the original data and perform resample
-        new_data = sunpy_image_resample(self.data.copy().T, dimensions,
+        # Perform the resample, which does not modify the original data
+        new_data = sunpy_image_resample(self.data.T, dimensions,
                                         method, center=True)
         new_data = new_data.T
 
+        # Create new map instance
+        new_map = self._new_instance(new_data, self._resample_meta(dimensions),
+                                     self.plot_settings)
+        return new_map
+
+    def _resample_meta(self, dimensions):
+        """
+        Return the meta data of this map resampled to ``dimensions``.
+        """
         scale_factor_x = float(self.dimensions[0] / dimensions[0])
         scale_factor_y = float(self.dimensions[1] / dimensions[1])
 
@@ -850,12 +987,11 @@ scale:\t\t {scale}
         new_meta['crval1'] = self.center.x.value
         new_meta['crval2'] = self.center.y.value
 
-        # Create new map instance
-        new_map = self._new_instance(new_data, new_meta, self.plot_settings)
-        return new_map
+        return new_meta
 
     def rotate(self, angle=None, rmatrix=None, order=4, scale=1.0,
-               recenter=False, missing=0.0, use_scipy=False):
+               recenter=False, missing=0.0, use_scipy=False, tile_shape=None,
+               out=None, max_workers=None):
         """
         Returns a new rotated and rescaled map.  Specify either a rotation
         angle or a rotation matrix, but not both.  If neither an angle or a
@@ -896,6 +1032,19 @@ scale:\t\t {scale}
             :func:`scipy.ndimage.interpolation.affine_transform`, otherwise it
             uses the :func:`skimage.transform.warp`.
             Default: False, unless scikit-image can't be imported
+        tile_shape : int or tuple
+            If given, the rotated data is computed in tiles of this shape
+            without padding the data first, so the memory used does not grow
+            with the size of the map.
+            Default: None, unless ``out`` is given, in which case tiles of
+            512x512 pixels are used.
+        out : `numpy.ndarray`
+            An array, or `numpy.memmap`, to write the rotated data into. It
+            becomes the data of the new map and must have the shape of the
+            rotated data. Implies tiling.
+        max_workers : int
+            The number of threads the tiles are spread across.
+            Default: the tiles are computed in turn.
 
         Returns
         -------
@@ -917,6 +1066,27 @@ scale:\t\t {scale}
         transformations, situations when the underlying data is modified prior
         to rotation, and differences from IDL's rot().
         """
+        # Interpolation parameter sanity
+        if order not in range(6):
+            raise ValueError("Order must be between 0 and 5")
+
+        plan = self._rotation_plan(angle=angle, rmatrix=rmatrix, scale=scale,
+                                   recenter=recenter)
+        return self._apply_rotation_plan(plan, order=order, missing=missing,
+                                         use_scipy=use_scipy,
+                                         tile_shape=tile_shape, out=out,
+                                         max_workers=max_workers)
+
+    def _rotation_plan(self, angle=None, rmatrix=None, scale=1.0, recenter=False):
+        """
+        Work out the parts of a rotation of this map by `rotate` which do not
+        depend on its reference pixel and coordinate: the padding, the
+        transformation matrix and the new PCi_j and CDELTi values.
+
+        The plan only depends on the shape of the data, the rotation matrix
+        and the scale of the map, so it can be applied to every map that
+        shares them with `_apply_rotation_plan`.
+        """
         if angle is not None and rmatrix is not None:
             raise ValueError("You cannot specify both an angle and a matrix")
         elif angle is None and rmatrix is None:
@@ -944,97 +1114,125 @@ scale:\t\t {scale}
                                 "You may want to pass in an astropy Quantity instead."
                                  .format('angle', 'rotate', error_msg))
 
-        # Interpolation parameter sanity
-        if order not in range(6):
-            raise ValueError("Order must be between 0 and 5")
-
-        # The FITS-WCS transform is by definition defined around the
-        # reference coordinate in the header.
-        rotation_center = u.Quantity([self.reference_coordinate.x,
-                                      self.reference_coordinate.y])
-
-        # Copy meta data
-        new_meta = self.meta.copy()
         if angle is not None:
             # Calculate the parameters for the affine_transform
             c = np.cos(np.deg2rad(angle))
             s = np.sin(np.deg2rad(angle))
             rmatrix = np.matrix([[c, -s], [s, c]])
+        rmatrix = np.matrix(rmatrix)
 
         # Calculate the shape in pixels to contain all of the image data
         extent = np.max(np.abs(np.vstack((self.data.shape * rmatrix,
                                           self.data.shape * rmatrix.T))), axis=0)
         # Calculate the needed padding or unpadding
         diff = np.asarray(np.ceil((extent - self.data.shape) / 2), dtype=int).ravel()
-        # Pad the image array
         pad_x = int(np.max((diff[1], 0)))
         pad_y = int(np.max((diff[0], 0)))
+        unpad_x = int(-np.min((diff[1], 0)))
+        unpad_y = int(-np.min((diff[0], 0)))
+
+        meta = OrderedDict()
+        # Calculate the new rotation matrix to store in the header by
+        # "subtracting" the rotation matrix used in the rotate from the old one
+        # That being calculate the dot product of the old header data with the
+        # inverse of the rotation matrix.
+        pc_C = np.dot(self.rotation_matrix, rmatrix.I)
+        meta['PC1_1'] = pc_C[0,0]
+        meta['PC1_2'] = pc_C[0,1]
+        meta['PC2_1'] = pc_C[1,0]
+        meta['PC2_2'] = pc_C[1,1]
+
+        # Update pixel size if image has been scaled.
+        if scale != 1.0:
+            meta['cdelt1'] = (self.scale.x / scale).value
+            meta['cdelt2'] = (self.scale.y / scale).value
+
+        return _RotationPlan(shape=self.data.shape, rmatrix=rmatrix, scale=scale,
+                             recenter=recenter, pad=(pad_y, pad_x),
+                             unpad=(unpad_y, unpad_x), meta=meta)
+
+    def _apply_rotation_plan(self, plan, order=4, missing=0.0, use_scipy=False,
+                             tile_shape=None, out=None, max_workers=None):
+        """
+        Rotate this map according to a plan from `_rotation_plan`, which can
+        have been made by another map with the same geometry.
+
+        The plan only holds the padding, the transformation matrix and the new
+        PCi_j and CDELTi values. The axis of rotation and the new reference
+        pixel are worked out from the meta data of this map, and the data is
+        interpolated afresh for every map.
+        """
+        if self.data.shape != plan.shape:
+            raise ValueError("The rotation plan is for data of shape {0}, not {1}".format(
+                plan.shape, self.data.shape))
+        pad_y, pad_x = plan.pad
+        unpad_y, unpad_x = plan.unpad
+        padded_shape = (plan.shape[0] + 2 * pad_y, plan.shape[1] + 2 * pad_x)
 
-        new_data = np.pad(self.data,
-                              ((pad_y, pad_y), (pad_x, pad_x)),
-                              mode='constant',
-                              constant_values=(missing, missing))
-        new_meta['crpix1'] += pad_x
-        new_meta['crpix2'] += pad_y
+        # The FITS-WCS transform is by definition defined around the
+        # reference coordinate in the header.
+        rotation_center = u.Quantity([self.reference_coordinate.x,
+                                      self.reference_coordinate.y])
 
         # All of the following pixel calculations use a pixel origin of 0
 
-        pixel_array_center = (np.flipud(new_data.shape) - 1) / 2.0
+        pixel_array_center = (np.flipud(padded_shape) - 1) / 2.0
 
         # Convert the axis of rotation from data coordinates to pixel coordinates
         pixel_rotation_center = u.Quantity(self.data_to_pixel(*rotation_center,
                                                                origin=0)).value
-        if recenter:
+        if plan.recenter:
             pixel_center = pixel_rotation_center
-        else:
-            pixel_center = pixel_array_center
-
-        # Apply the rotation to the image data
-        new_data = affine_transform(new_data.T,
-                                    np.asarray(rmatrix),
-                                    order=order, scale=scale,
-                                    image_center=np.flipud(pixel_center),
-                                    recenter=recenter, missing=missing,
-                                    use_scipy=use_scipy).T
-
-        if recenter:
             new_reference_pixel = pixel_array_center
         else:
+            pixel_center = pixel_array_center
             # Calculate new pixel coordinates for the rotation center
-            new_reference_pixel = pixel_center + np.dot(rmatrix,
+            new_reference_pixel = pixel_center + np.dot(plan.rmatrix,
                                                         pixel_rotation_center - pixel_center)
             new_reference_pixel = np.array(new_reference_pixel).ravel()
 
-        # Define the new reference_pixel
+        if tile_shape is None and out is None:
+            # Pad the image array
+            new_data = np.pad(self.data,
+                                  ((pad_y, pad_y), (pad_x, pad_x)),
+                                  mode='constant',
+                                  constant_values=(missing, missing))
+
+            # Apply the rotation to the image data
+            new_data = affine_transform(new_data.T,
+                                        np.asarray(plan.rmatrix),
+                                        order=order, scale=plan.scale,
+                                        image_center=np.flipud(pixel_center),
+                                        recenter=plan.recenter, missing=missing,
+                                        use_scipy=use_scipy).T
+
+            # Unpad the array if necessary
+            if unpad_x > 0:
+                new_data = new_data[:, unpad_x:-unpad_x]
+            if unpad_y > 0:
+                new_data = new_data[unpad_y:-unpad_y, :]
+        else:
+            # Rotate tile by tile, reading the padding as missing values and
+            # only computing the pixels which survive the unpadding.
+            matrix, shift = _affine_offset(padded_shape, np.asarray(plan.rmatrix),
+                                           plan.scale, np.flipud(pixel_center),
+                                           plan.recenter)
+            new_data = _tiled_affine_transform(
+                    self.data, matrix, shift + np.dot(matrix, [unpad_y, unpad_x]),
+                    output_shape=(padded_shape[0] - 2 * unpad_y,
+                                  padded_shape[1] - 2 * unpad_x),
+                    order=order, missing=missing, pad=plan.pad,
+                    use_scipy=use_scipy, tile_shape=tile_shape, out=out,
+                    max_workers=max_workers)
+
+        new_meta = self.meta.copy()
+        # Define the new reference_pixel, accounting for the unpadding of the
+        # array
         new_meta['crval1'] = rotation_center[0].value
         new_meta['crval2'] = rotation_center[1].value
-        new_meta['crpix1'] = new_reference_pixel[0] + 1 # FITS pixel origin is 1
-        new_meta['crpix2'] = new_reference_pixel[1] + 1 # FITS pixel origin is 1
-
-        # Unpad the array if necessary
-        unpad_x = -np.min((diff[1], 0))
-        if unpad_x > 0:
-            new_data = new_data[:, unpad_x:-unpad_x]
-            new_meta['crpix1'] -= unpad_x
-        unpad_y = -np.min((diff[0], 0))
-        if unpad_y > 0:
-            new_data = new_data[unpad_y:-unpad_y, :]
-            new_meta['crpix2'] -= unpad_y
-
-        # Calculate the new rotation matrix to store in the header by
-        # "subtracting" the rotation matrix used in the rotate from the old one
-        # That being calculate the dot product of the old header data with the
-        # inverse of the rotation matrix.
-        pc_C = np.dot(self.rotation_matrix, rmatrix.I)
-        new_meta['PC1_1'] = pc_C[0,0]
-        new_meta['PC1_2'] = pc_C[0,1]
-        new_meta['PC2_1'] = pc_C[1,0]
-        new_meta['PC2_2'] = pc_C[1,1]
-
-        # Update pixel size if image has been scaled.
-        if scale != 1.0:
-            new_meta['cdelt1'] = (self.scale.x / scale).value
-            new_meta['cdelt2'] = (self.scale.y / scale).value
+        new_meta['crpix1'] = new_reference_pixel[0] + 1 - unpad_x # FITS pixel origin is 1
+        new_meta['crpix2'] = new_reference_pixel[1] + 1 - unpad_y # FITS pixel origin is 1
+        new_meta.update(plan.meta)
 
         # Remove old CROTA kwargs because we have saved a new PCi_j matrix.
         new_meta.pop('CROTA1', None)
@@ -1222,7 +1420,10 @@ scale:\t\t {scale}
             keyword (see the description of `~numpy.sum` for an example.)
             The default value of 'func' is `~numpy.sum`; using this causes
             superpixel to sum over (dimension[0], dimension[1]) pixels of the
-            original map.
+            original map. `~numpy.sum`, `~numpy.mean` and `~numpy.median` are
+            computed over each superpixel as a whole by
+            `sunpy.image.rescale.block_reduce`; other functions are applied
+            along one axis of the superpixel at a time.
 
         Returns
         -------
@@ -1234,34 +1435,38 @@ scale:\t\t {scale}
         | `Summarizing blocks of an array using a moving window <http://mail.scipy.org/pipermail/numpy-discussion/2010-July/051760.html>`_
         """
 
-        # Note: because the underlying ndarray is transposed in sense when
-        #   compared to the Map, the ndarray is transposed, resampled, then
-        #   transposed back.
-        # Note: "center" defaults to True in this function because data
-        #   coordinates in a Map are at pixel centers.
-
         if (offset.value[0] < 0) or (offset.value[1] < 0):
             raise ValueError("Offset is strictly non-negative.")
 
-        # Make a copy of the original data, perform reshaping, and apply the
-        # function.
+        # Reduce a strided view of the data, without copying it.
+        new_array = block_reduce(self.data, [dimensions.value[1], dimensions.value[0]],
+                                 [offset.value[1], offset.value[0]], func=func,
+                                 mask=self.mask)
+
         if self.mask is not None:
-            reshaped = reshape_image_to_4d_superpixel(np.ma.array(self.data.copy(), mask=self.mask),
-                                                      [dimensions.value[1], dimensions.value[0]],
-                                                      [offset.value[1], offset.value[0]])
+            new_data = np.ma.getdata(new_array)
+            new_mask = np.ma.getmaskarray(new_array)
         else:
-            reshaped = reshape_image_to_4d_superpixel(self.data.copy(),
-                                                      [dimensions.value[1], dimensions.value[0]],
-                                                      [offset.value[1], offset.value[0]])
-        new_array = func(func(reshaped, axis=3), axis=1)
+            new_data = new_array
+            new_mask = None
+
+        #Create new map with the modified data
+        new_meta = self._superpixel_meta(dimensions, offset, new_data.shape)
+        new_map = self._new_instance(new_data, new_meta, self.plot_settings, mask=new_mask)
+        return new_map
 
+    def _superpixel_meta(self, dimensions, offset, shape):
+        """
+        Return the meta data of this map made into superpixels, with the data
+        of the new map having the given shape.
+        """
         # Update image scale and number of pixels
 
         # create copy of new meta data
         new_meta = self.meta.copy()
 
-        new_nx = new_array.shape[1]
-        new_ny = new_array.shape[0]
+        new_nx = shape[1]
+        new_ny = shape[0]
 
         # Update metadata
         new_meta['cdelt1'] = (dimensions[0] * self.scale.x).value
@@ -1276,17 +1481,7 @@ scale:\t\t {scale}
         new_meta['crval1'] = self.center.x.to(self.spatial_units.x).value + 0.5*(offset[0]*self.scale.x).to(self.spatial_units.x).value
         new_meta['crval2'] = self.center.y.to(self.spatial_units.y).value + 0.5*(offset[1]*self.scale.y).to(self.spatial_units.y).value
 
-        # Create new map instance
-        if self.mask is not None:
-            new_data = np.ma.getdata(new_array)
-            new_mask = np.ma.getmask(new_array)
-        else:
-            new_data = new_array
-            new_mask = None
-
-        #Create new map with the modified data
-        new_map = self._new_instance(new_data, new_meta, self.plot_settings, mask=new_mask)
-        return new_map
+        return new_meta
 
 # #### Visualization #### #
 
@@ -1322,15 +1517,21 @@ scale:\t\t {scale}
 
         transform = wcsaxes_compat.get_world_transform(axes)
 
-        XX, YY = np.meshgrid(np.arange(self.data.shape[0]),
-                             np.arange(self.data.shape[1]))
-        x, y = self.pixel_to_data(XX*u.pix, YY*u.pix)
-        dsun = self.dsun
-
-        b0 = self.heliographic_latitude.to(u.deg).value
+        dsun = self.dsun.to(u.m).value
+        b0 = self.heliographic_latitude.to(u.rad).value
         l0 = self.heliographic_longitude.to(u.deg).value
         units = self.spatial_units
 
+        def hg_to_hpc(lon, lat):
+            x, y, z = _hg_to_hcc(np.deg2rad(lon), np.deg2rad(lat), b0,
+                                 np.deg2rad(l0))
+            # Only the visible side of the Sun is drawn
+            visible = z >= 0
+            x, y = _hcc_to_hpc(x[visible], y[visible], dsun)
+            if wcsaxes_compat.is_wcsaxes(axes):
+                return np.rad2deg(x), np.rad2deg(y)
+            return (x * u.rad).to(units.x).value, (y * u.rad).to(units.y).value
+
         # Prep the plot kwargs
         plot_kw = {'color': 'white',
                    'linestyle': 'dotted',
@@ -1343,15 +1544,7 @@ scale:\t\t {scale}
 
         # draw the latitude lines
         for lat in hg_latitude_deg:
-            x, y = wcs.convert_hg_hpc(hg_longitude_deg, lat * np.ones(361),
-                                      b0_deg=b0, l0_deg=l0, dsun_meters=dsun,
-                                      angle_units=units.x, occultation=True)
-            valid = np.logical_and(np.isfinite(x), np.isfinite(y))
-            x = x[valid]
-            y = y[valid]
-            if wcsaxes_compat.is_wcsaxes(axes):
-                x = (x*u.arcsec).to(u.deg).value
-                y = (y*u.arcsec).to(u.deg).value
+            x, y = hg_to_hpc(hg_longitude_deg, lat * np.ones(361))
             lines += axes.plot(x, y, **plot_kw)
 
         hg_longitude_deg = np.arange(-180, 180, grid_spacing.to(u.deg).value) + l0
@@ -1359,15 +1552,7 @@ scale:\t\t {scale}
 
         # draw the longitude lines
         for lon in hg_longitude_deg:
-            x, y = wcs.convert_hg_hpc(lon * np.ones(181), hg_latitude_deg,
-                                      b0_deg=b0, l0_deg=l0, dsun_meters=dsun,
-                                      angle_units=units[0], occultation=True)
-            valid = np.logical_and(np.isfinite(x), np.isfinite(y))
-            x = x[valid]
-            y = y[valid]
-            if wcsaxes_compat.is_wcsaxes(axes):
-                x = (x*u.arcsec).to(u.deg).value
-                y = (y*u.arcsec).to(u.deg).value
+            x, y = hg_to_hpc(lon * np.ones(181), hg_latitude_deg)
             lines += axes.plot(x, y, **plot_kw)
 
         # Turn autoscaling back on.
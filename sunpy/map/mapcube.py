@@ -11,6 +11,7 @@ import numpy.ma as ma
 import astropy.units as u
 
 from sunpy.map import GenericMap
+from sunpy.image.rescale import resample_stack, block_reduce
 from sunpy.visualization.mapcubeanimator import MapCubeAnimator
 from sunpy.visualization import wcsaxes_compat
 from sunpy.util import expand_list
@@ -193,11 +194,8 @@ class MapCube(object):
             axes.set_ylabel(ylabel)
 
         if resample:
-            if self.all_maps_same_shape():
-                resample = u.Quantity(self.maps[0].dimensions) * np.array(resample)
-                ani_data = [amap.resample(resample) for amap in self.maps]
-            else:
-                raise ValueError('Maps in mapcube do not all have the same shape.')
+            resample = u.Quantity(self.maps[0].dimensions) * np.array(resample)
+            ani_data = self.resample(resample).maps
         else:
             ani_data = self.maps
 
@@ -305,13 +303,8 @@ class MapCube(object):
         """
 
         if resample:
-            if self.all_maps_same_shape():
-                plot_cube = MapCube()
-                resample = u.Quantity(self.maps[0].dimensions) * np.array(resample)
-                for amap in self.maps:
-                    plot_cube.maps.append(amap.resample(resample))
-            else:
-                raise ValueError('Maps in mapcube do not all have the same shape.')
+            resample = u.Quantity(self.maps[0].dimensions) * np.array(resample)
+            plot_cube = self.resample(resample)
         else:
             plot_cube = self
 
@@ -330,6 +323,40 @@ class MapCube(object):
         """
         return np.any([m.mask is not None for m in self.maps])
 
+    def _stacked_data(self):
+        """
+        Return the image data of all the maps as a single (nt, ny, nx) array
+        view without copying.
+
+        This is possible when the map data are equally spaced frames of one
+        underlying buffer, for example the layers of a cube returned by
+        `~sunpy.image.coalignment.apply_shifts`.  If the maps do not share
+        such a buffer `None` is returned.
+        """
+        if len(self.maps) == 0:
+            return None
+        first = self.maps[0].data
+        if len(self.maps) == 1:
+            return first[np.newaxis, ...]
+
+        base = first.base
+        if base is None:
+            return None
+        addresses = []
+        for m in self.maps:
+            if (m.data.base is not base or m.data.shape != first.shape or
+                    m.data.strides != first.strides or m.data.dtype != first.dtype):
+                return None
+            addresses.append(m.data.__array_interface__['data'][0])
+
+        steps = np.diff(addresses)
+        if steps[0] == 0 or np.any(steps != steps[0]):
+            return None
+
+        return np.lib.stride_tricks.as_strided(first,
+                                               shape=(len(self.maps),) + first.shape,
+                                               strides=(int(steps[0]),) + first.strides)
+
     def as_array(self):
         """
         If all the map shapes are the same, their image data is rendered
@@ -341,11 +368,26 @@ class MapCube(object):
         with masks copied from maps as appropriately; maps that do not have a
         mask are supplied with a mask that is full of False entries.
         If all the map shapes are not the same, a ValueError is thrown.
+
+        If the map data are frames of a single 3-D array, as is the case for
+        the output of `~sunpy.image.coalignment.apply_shifts`, the returned
+        data is a read-only view of that array and no data is copied, so that
+        writing into it can not change the maps.  Otherwise the frames are
+        copied, once, into a newly allocated array; memory-mapped frames are
+        read from disk one at a time as they are copied.
         """
         if self.all_maps_same_shape():
-            data = np.swapaxes(np.swapaxes(np.asarray([m.data for m in self.maps]), 0, 1).copy(), 1, 2).copy()
+            stack = self._stacked_data()
+            if stack is not None:
+                stack.flags.writeable = False
+            else:
+                stack = np.empty((len(self.maps),) + self.maps[0].data.shape,
+                                 dtype=np.result_type(*[m.data.dtype for m in self.maps]))
+                for im, m in enumerate(self.maps):
+                    stack[im] = m.data
+            data = stack.transpose(1, 2, 0)
             if self.at_least_one_map_has_mask():
-                mask_cube = np.zeros_like(data, dtype=bool)
+                mask_cube = np.zeros(data.shape, dtype=bool)
                 for im, m in enumerate(self.maps):
                     if m.mask is not None:
                         mask_cube[:, :, im] = m.mask
@@ -360,3 +402,182 @@ class MapCube(object):
         Return all the meta objects as a list.
         """
         return [m.meta for m in self.maps]
+
+    @u.quantity_input(dimensions=u.pixel)
+    def resample(self, dimensions, method='linear'):
+        """
+        Returns a new MapCube with every map resampled up or down, as by
+        `~sunpy.map.GenericMap.resample`.
+
+        The data of all the maps are resampled together by
+        `sunpy.image.rescale.resample_stack`.
+
+        Parameters
+        ----------
+        dimensions : `~astropy.units.Quantity`
+            Pixel dimensions that the new maps should have.
+            Note: the first argument corresponds to the 'x' axis and the second
+            argument corresponds to the 'y' axis.
+        method : {'neighbor' | 'nearest' | 'linear' | 'spline'}
+            Method to use for resampling interpolation, see
+            `~sunpy.map.GenericMap.resample`.
+
+        Returns
+        -------
+        out : `~sunpy.map.MapCube`
+            A new MapCube of the resampled maps, in the same order.
+        """
+        if not self.all_maps_same_shape():
+            raise ValueError('Maps in mapcube do not all have the same shape.')
+
+        stack = self._stacked_data()
+        if stack is None:
+            stack = np.array([m.data for m in self.maps])
+
+        # "center" is True because data coordinates in a Map are at pixel
+        # centers, as in GenericMap.resample
+        new_stack = resample_stack(stack, (dimensions[1].value, dimensions[0].value),
+                                   method, center=True)
+
+        new_maps = [amap._new_instance(new_data, amap._resample_meta(dimensions),
+                                       amap.plot_settings)
+                    for amap, new_data in zip(self.maps, new_stack)]
+        return MapCube(new_maps, sortby=None)
+
+    @u.quantity_input(dimensions=u.pixel, offset=u.pixel)
+    def superpixel(self, dimensions, offset=(0, 0)*u.pixel, func=np.sum):
+        """
+        Returns a new MapCube with every map made of superpixels, as by
+        `~sunpy.map.GenericMap.superpixel`.
+
+        The data of all the maps are reduced together by
+        `sunpy.image.rescale.block_reduce`, in one pass over the cube.
+
+        Parameters
+        ----------
+        dimensions : `~astropy.units.Quantity`
+            One superpixel in the new maps is equal to (dimension[0],
+            dimension[1]) pixels of the original maps.
+        offset : `~astropy.units.Quantity`
+            Offset from (0,0) in original map pixels used to calculate where
+            the data used to make the resulting superpixel maps starts.
+        func : function
+            The function used to combine the pixels of a superpixel, see
+            `~sunpy.map.GenericMap.superpixel`.
+
+        Returns
+        -------
+        out : `~sunpy.map.MapCube`
+            A new MapCube of the superpixel maps, in the same order.
+        """
+        if not self.all_maps_same_shape():
+            raise ValueError('Maps in mapcube do not all have the same shape.')
+        if (offset.value[0] < 0) or (offset.value[1] < 0):
+            raise ValueError("Offset is strictly non-negative.")
+
+        stack = self._stacked_data()
+        if stack is None:
+            stack = np.array([m.data for m in self.maps])
+        mask = None
+        if self.at_least_one_map_has_mask():
+            mask = np.zeros(stack.shape, dtype=bool)
+            for im, m in enumerate(self.maps):
+                if m.mask is not None:
+                    mask[im] = m.mask
+
+        new_stack = block_reduce(stack, [dimensions.value[1], dimensions.value[0]],
+                                 [offset.value[1], offset.value[0]], func=func,
+                                 mask=mask)
+
+        new_maps = []
+        for im, amap in enumerate(self.maps):
+            new_data = np.ma.getdata(new_stack[im])
+            new_mask = None if amap.mask is None else np.ma.getmaskarray(new_stack[im])
+            new_meta = amap._superpixel_meta(dimensions, offset, new_data.shape)
+            new_maps.append(amap._new_instance(new_data, new_meta, amap.plot_settings,
+                                               mask=new_mask))
+        return MapCube(new_maps, sortby=None)
+
+    def rotate(self, angle=None, rmatrix=None, order=4, scale=1.0,
+               recenter=False, missing=0.0, use_scipy=False, tile_shape=None,
+               max_workers=None):
+        """
+        Returns a new MapCube with every map rotated and rescaled as by
+        `~sunpy.map.GenericMap.rotate`.
+
+        Maps with the same geometry (data shape, scale and rotation matrix)
+        share one rotation plan: the padding, the transformation matrix and
+        the new PCi_j and CDELTi values are worked out once for all of them.
+        Only this set up is shared; the reference pixel and coordinate of
+        every map are updated from its own meta data, and its data is still
+        interpolated in full, as by `~sunpy.map.GenericMap.rotate`.
+
+        Parameters
+        ----------
+        angle : `~astropy.units.Quantity`
+            The angle (degrees) to rotate counterclockwise.
+        rmatrix : 2x2
+            Linear transformation rotation matrix.
+        order : int 0-5
+            Interpolation order to be used.
+        scale : float
+            A scale factor for the images.
+        recenter : bool
+            If True, the reference coordinate of each map is moved to the
+            center of its array.
+        missing : float or list
+            The value to replace any missing data after the transformation.
+            A list gives one value for each map.
+        use_scipy : bool
+            Force use of :func:`scipy.ndimage.interpolation.affine_transform`.
+        tile_shape : int or tuple
+            Rotate each map in tiles of this shape, see
+            `~sunpy.map.GenericMap.rotate`.
+        max_workers : int
+            The number of threads the maps are spread across.
+            Default: the maps are rotated in turn.
+
+        Returns
+        -------
+        out : `~sunpy.map.MapCube`
+            A new MapCube of the rotated maps, in the same order.
+        """
+        if order not in range(6):
+            raise ValueError("Order must be between 0 and 5")
+        if np.ndim(missing) == 0:
+            missing = [missing] * len(self.maps)
+        elif len(missing) != len(self.maps):
+            raise ValueError("missing must have one value for each map")
+
+        plans = {}
+        jobs = []
+        for amap, amissing in zip(self.maps, missing):
+            key = _geometry_key(amap)
+            if key not in plans:
+                plans[key] = amap._rotation_plan(angle=angle, rmatrix=rmatrix,
+                                                 scale=scale, recenter=recenter)
+            jobs.append((amap, plans[key], amissing))
+
+        def rotate_map(job):
+            amap, plan, amissing = job
+            return amap._apply_rotation_plan(plan, order=order, missing=amissing,
+                                             use_scipy=use_scipy,
+                                             tile_shape=tile_shape)
+
+        if max_workers is None or max_workers <= 1:
+            new_maps = [rotate_map(job) for job in jobs]
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                new_maps = list(pool.map(rotate_map, jobs))
+
+        return MapCube(new_maps, sortby=None)
+
+
+def _geometry_key(amap):
+    """
+    Return a key which is equal for maps whose data shape, scale and rotation
+    matrix are the same, and which can therefore share a rotation plan.
+    """
+    return (amap.data.shape, tuple(u.Quantity(amap.scale).value),
+            tuple(np.asarray(amap.rotation_matrix).ravel()))
@@ -34,3 +34,23 @@ def test_upcasing():
     #__contains__
     assert 'wibble' in meta
     assert 'WIBBLE' in meta
+
+
+def test_version():
+    meta = MetaDict({'wibble':1})
+    version = meta.version
+    meta['WOBBLE'] = 2
+    assert meta.version > version
+    version = meta.version
+    del meta['WOBBLE']
+    assert 'wobble' not in meta
+    assert meta.version > version
+    version = meta.version
+    meta.update({'spam':'eggs'})
+    assert meta.version > version
+    version = meta.version
+    meta.pop('spam')
+    assert meta.version > version
+    version = meta.version
+    meta.get('wibble')
+    assert meta.version == version
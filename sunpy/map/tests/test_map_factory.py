@@ -39,6 +39,12 @@ class TestMap(object):
         cube = sunpy.map.Map(a_list_of_many, cube=True)
         assert isinstance(cube, sunpy.map.MapCube)
 
+    def test_mapcube_memmap(self):
+        # Test making a MapCube with memory mapped data
+        cube = sunpy.map.Map(a_list_of_many, cube=True, memmap=True)
+        assert isinstance(cube, sunpy.map.MapCube)
+        assert cube.as_array().shape[2] == len(a_list_of_many)
+
     def test_composite(self):
         #Test making a CompositeMap
         comp = sunpy.map.Map(AIA_171_IMAGE, RHESSI_IMAGE,
@@ -85,6 +91,47 @@ class TestMap(object):
         pair_map = sunpy.map.Map(data, header)
         assert isinstance(pair_map, sunpy.map.GenericMap)
 
+    def test_parallel(self):
+        # Test reading files with a thread pool keeps the input order
+        maps = sunpy.map.Map(a_list_of_many)
+        parallel_maps = sunpy.map.Map(a_list_of_many, parallel=2)
+        assert [amap.date for amap in maps] == [amap.date for amap in parallel_maps]
+        # Mixed with a map which is not read from a file
+        pair_maps = sunpy.map.Map((maps[0].data, maps[0].meta), a_list_of_many, parallel=2)
+        assert len(pair_maps) == len(a_list_of_many) + 1
+        assert pair_maps[1].date == maps[0].date
+
+    def test_dispatch_cache(self):
+        # Maps from the same instrument resolve their class from the cache
+        aia = sunpy.map.Map(AIA_171_IMAGE)
+        meta = aia.meta.copy()
+        meta['wavelnth'] = 193
+        maps = sunpy.map.Map((aia.data, aia.meta), (aia.data, meta))
+        assert all(isinstance(amap, sunpy.map.sources.AIAMap) for amap in maps)
+        assert len(sunpy.map.Map._dispatch_cache) > 0
+        meta['instrume'] = 'EIT'
+        candidates = sunpy.map.Map._get_candidate_widget_types(
+            meta, lambda validate, header: validate(aia.data, header))
+        assert candidates == [sunpy.map.sources.EITMap]
+
+    def test_executor(self):
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            maps = sunpy.map.Map(a_list_of_many, executor=executor)
+        assert len(maps) == len(a_list_of_many)
+
+    def test_parallel_aggregated_error(self):
+        # All the files are read and the failures are reported together
+        bad_files = [tempfile.NamedTemporaryFile(suffix='.fits') for i in range(2)]
+        for afile in bad_files:
+            afile.write(b'not a fits file')
+            afile.flush()
+        files = [bad_files[0].name] + a_list_of_many + [bad_files[1].name]
+        with pytest.raises(sunpy.map.map_factory.MapFileReadError) as excinfo:
+            sunpy.map.Map(files, parallel=2)
+        failed = [fname for fname, error in excinfo.value.errors]
+        assert failed == [afile.name for afile in bad_files]
+
     # requires sqlalchemy to run properly
     @pytest.mark.skipif('not HAS_SQLALCHEMY')
     def test_databaseentry(self):
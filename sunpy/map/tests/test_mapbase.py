@@ -94,6 +94,36 @@ def test_wcs(aia171_test_map):
     assert set(wcs.wcs.cunit) == set([u.Unit(a) for a in aia171_test_map.spatial_units])
 
 
+def test_wcs_cached(generic_map):
+    wcs = generic_map._shared_wcs
+    scale = generic_map.scale
+    assert generic_map._shared_wcs is wcs
+    assert generic_map.scale is scale
+    assert generic_map.coordinate_frame is generic_map.coordinate_frame
+    # Shared values can not be changed in place
+    with pytest.raises(ValueError):
+        scale.x[...] = 1 * u.arcsec / u.pix
+
+    # The public WCS is a copy, so changing it does not change the map
+    crpix = generic_map.wcs.wcs.crpix[0]
+    generic_map.wcs.wcs.crpix[0] = crpix + 10
+    assert generic_map.wcs is not generic_map.wcs
+    assert generic_map.wcs.wcs.crpix[0] == crpix
+    assert generic_map._shared_wcs.wcs.crpix[0] == crpix
+
+    generic_map.meta['cdelt1'] = 20
+    assert generic_map._shared_wcs is not wcs
+    assert generic_map.scale.x == 20 * u.arcsec / u.pix
+    new_wcs = generic_map.wcs.wcs
+    cdelt = u.Quantity(new_wcs.cdelt[0], new_wcs.cunit[0])
+    np.testing.assert_allclose(cdelt.to(u.arcsec).value, 20)
+
+    generic_map.meta = generic_map.meta.copy()
+    generic_map.meta['crpix1'] = 3
+    assert generic_map.reference_pixel.x == 3 * u.pix
+    assert generic_map.wcs.wcs.crpix[0] == 3
+
+
 def test_dtype(generic_map):
     assert generic_map.dtype == np.float64
 
@@ -256,6 +286,35 @@ def test_data_to_pixel(generic_map):
     test_pixel = generic_map.data_to_pixel(*generic_map.reference_coordinate, origin=1)
     assert_quantity_allclose(test_pixel, generic_map.reference_pixel)
 
+def test_pixel_array_to_data(generic_map):
+    """The batched conversion agrees with pixel_to_data"""
+    pixels = np.array([[0, 0], [1, 2], [5, 3]]) * u.pix
+    x, y = generic_map.pixel_array_to_data(pixels)
+    expected = generic_map.pixel_to_data(pixels[:, 0], pixels[:, 1])
+    assert_quantity_allclose(x, expected[0])
+    assert_quantity_allclose(y, expected[1])
+
+    # All the pixels of the map
+    x, y = generic_map.pixel_array_to_data()
+    assert x.shape == generic_map.data.shape
+    assert_quantity_allclose(x[3, 5], expected[0][2])
+    assert_quantity_allclose(y[3, 5], expected[1][2])
+
+
+def test_pixel_to_heliographic(aia171_test_map):
+    """The reference pixel of an AIA map is close to disk centre"""
+    ref = u.Quantity(aia171_test_map.reference_pixel) - 1 * u.pix
+    lon, lat = aia171_test_map.pixel_to_heliographic(ref.reshape(1, 2))
+    assert_quantity_allclose(lon, aia171_test_map.heliographic_longitude,
+                             atol=1*u.deg)
+    assert_quantity_allclose(lat, aia171_test_map.heliographic_latitude,
+                             atol=1*u.deg)
+    lon, lat = aia171_test_map.pixel_to_heliographic()
+    assert lon.shape == aia171_test_map.data.shape
+    # The corners are off the disk
+    assert np.isnan(lon[0, 0])
+
+
 def test_default_shift():
     """Test that the default shift is zero"""
     data = np.ones([6,6], dtype=np.float64)
@@ -455,6 +514,25 @@ def test_rotate(aia171_test_map):
     assert aia171_test_map_crop_rot.data.shape[0] < aia171_test_map_crop_rot.data.shape[1]
 
 
+@pytest.mark.parametrize("recenter", [False, True])
+def test_rotate_tiled(aia171_test_map, recenter, tmpdir):
+    rotated_map = aia171_test_map.rotate(20*u.deg, recenter=recenter)
+    tiled_map = aia171_test_map.rotate(20*u.deg, recenter=recenter,
+                                       tile_shape=100, max_workers=2)
+    assert tiled_map.data.shape == rotated_map.data.shape
+    np.testing.assert_allclose(tiled_map.data, rotated_map.data,
+                               atol=1e-10*np.nanmax(aia171_test_map.data))
+    assert tiled_map.meta == rotated_map.meta
+
+    # Rotate into a memory mapped file
+    out = np.memmap(str(tmpdir.join('rotated.dat')), dtype=np.float64, mode='w+',
+                    shape=rotated_map.data.shape)
+    memmap_map = aia171_test_map.rotate(20*u.deg, recenter=recenter, out=out)
+    assert memmap_map.data is out
+    np.testing.assert_allclose(memmap_map.data, rotated_map.data,
+                               atol=1e-10*np.nanmax(aia171_test_map.data))
+
+
 def test_rotate_recenter(generic_map):
     rotated_map = generic_map.rotate(20*u.deg, recenter=True)
     pixel_array_center = (np.flipud(rotated_map.data.shape) - 1) / 2.0
@@ -140,6 +140,37 @@ def test_as_array(mapcube_all_the_same,
     assert np.all(np.logical_not(mask[0:2, 0:3, 2]))
 
 
+def test_as_array_stacked(aia_map):
+    """Make sure that the data of maps which are frames of a single array are
+    returned as a view of that array, and that the result is the same as when
+    the data has to be copied."""
+    stack = np.arange(3 * 10 * 12, dtype=float).reshape((3, 10, 12))
+    mapcube = sunpy.map.MapCube([sunpy.map.Map(layer, aia_map.meta) for layer in stack])
+    returned_array = mapcube.as_array()
+    assert returned_array.shape == (10, 12, 3)
+    assert np.may_share_memory(returned_array, stack)
+    for i in range(3):
+        assert np.all(returned_array[:, :, i] == stack[i])
+    # The view can not be used to change the maps
+    with pytest.raises(ValueError):
+        returned_array[0, 0, 0] = -1
+    assert mapcube[0].data.flags.writeable
+
+    # Every other frame is still a strided view
+    returned_array = mapcube[::2].as_array()
+    assert returned_array.shape == (10, 12, 2)
+    assert np.may_share_memory(returned_array, stack)
+    assert np.all(returned_array[:, :, 1] == stack[2])
+
+    # Frames which do not share memory are copied
+    mapcube = sunpy.map.MapCube([sunpy.map.Map(layer.copy(), aia_map.meta) for layer in stack])
+    returned_array = mapcube.as_array()
+    assert not np.may_share_memory(returned_array, stack)
+    assert np.all(returned_array == stack.transpose(1, 2, 0))
+    returned_array[0, 0, 0] = -1
+    assert mapcube[0].data[0, 0] == 0
+
+
 def test_all_meta(mapcube_all_the_same):
     """Tests that the correct number of map meta objects are returned, and
     that they are all map meta objects."""
@@ -147,3 +178,80 @@ def test_all_meta(mapcube_all_the_same):
     assert len(meta) == 2
     assert np.all(np.asarray([isinstance(h, MetaDict) for h in meta]))
     assert np.all(np.asarray([meta[i] == mapcube_all_the_same[i].meta for i in range(0, len(meta))]))
+
+
+def test_rotate(aia_map):
+    shifted_map = aia_map.shift(10*u.arcsec, 0*u.arcsec)
+    mapcube = sunpy.map.Map([aia_map, shifted_map, aia_map], cube=True)
+    rotated = mapcube.rotate(20*u.deg, missing=[0, 1, 2], max_workers=2)
+
+    assert isinstance(rotated, sunpy.map.MapCube)
+    assert len(rotated) == 3
+    for amap, rotated_map, missing in zip(mapcube, rotated, [0, 1, 2]):
+        expected = amap.rotate(20*u.deg, missing=missing)
+        np.testing.assert_allclose(rotated_map.data, expected.data)
+        assert rotated_map.meta == expected.meta
+
+
+@pytest.mark.parametrize('recenter', [False, True])
+def test_rotate_shared_plan(aia_map, monkeypatch, recenter):
+    # Frames which only differ in their reference pixel share a rotation plan
+    meta = aia_map.meta.copy()
+    meta['crpix1'] += 3.5
+    meta['crpix2'] -= 2
+    mapcube = sunpy.map.MapCube([aia_map, sunpy.map.Map(aia_map.data, meta)])
+    plans = []
+    rotation_plan = sunpy.map.GenericMap._rotation_plan
+
+    def counting_rotation_plan(self, *args, **kwargs):
+        plans.append(self)
+        return rotation_plan(self, *args, **kwargs)
+
+    monkeypatch.setattr(sunpy.map.GenericMap, '_rotation_plan', counting_rotation_plan)
+    rotated = mapcube.rotate(20*u.deg, recenter=recenter)
+    assert len(plans) == 1
+
+    for amap, rotated_map in zip(mapcube, rotated):
+        expected = amap.rotate(20*u.deg, recenter=recenter)
+        np.testing.assert_allclose(rotated_map.data, expected.data)
+        assert rotated_map.meta == expected.meta
+    if not recenter:
+        assert rotated[0].meta['crpix1'] != rotated[1].meta['crpix1']
+
+
+def test_rotate_missing_length(mapcube_all_the_same):
+    with pytest.raises(ValueError):
+        mapcube_all_the_same.rotate(20*u.deg, missing=[0])
+
+
+def test_resample(aia_map):
+    mapcube = sunpy.map.Map([aia_map, aia_map.shift(10*u.arcsec, 0*u.arcsec)], cube=True)
+    dimensions = (100, 50)*u.pix
+    resampled = mapcube.resample(dimensions)
+
+    assert len(resampled) == 2
+    for amap, resampled_map in zip(mapcube, resampled):
+        expected = amap.resample(dimensions)
+        assert resampled_map.data.shape == (50, 100)
+        np.testing.assert_allclose(resampled_map.data, expected.data)
+        assert resampled_map.meta == expected.meta
+
+
+def test_resample_different(mapcube_different):
+    with pytest.raises(ValueError):
+        mapcube_different.resample((100, 100)*u.pix)
+
+
+@pytest.mark.parametrize("func", [np.sum, np.mean, np.median])
+def test_superpixel(mapcube_all_the_same_some_have_masks, func):
+    mapcube = mapcube_all_the_same_some_have_masks
+    superpixel_cube = mapcube.superpixel((4, 2)*u.pix, offset=(1, 0)*u.pix, func=func)
+
+    assert len(superpixel_cube) == len(mapcube)
+    for amap, superpixel_map in zip(mapcube, superpixel_cube):
+        expected = amap.superpixel((4, 2)*u.pix, offset=(1, 0)*u.pix, func=func)
+        np.testing.assert_allclose(superpixel_map.data, expected.data)
+        assert (superpixel_map.mask is None) == (expected.mask is None)
+        if expected.mask is not None:
+            np.testing.assert_array_equal(superpixel_map.mask, expected.mask)
+        assert superpixel_map.meta == expected.meta
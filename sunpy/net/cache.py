@@ -0,0 +1,585 @@
+# -*- coding: utf-8 -*-
+"""
+Local caches of downloaded files and of query results.
+
+`DownloadCache` stores files once per distinct content, under the SHA-256
+digest of their bytes, and any number of keys (a provider file ID, or a URL)
+can point to the same file. A download that finds its key in the cache is not
+sent over the network; the cached file is copied, hard linked or symlinked to
+the requested location instead. Nothing checks that the file behind a key is
+still the current one, so the caches are only used when asked for and keys
+should identify a fixed file, together with its checksum or size where the
+provider gives one.
+
+`QueryCache` stores the responses of the VSO and JSOC clients under a
+normalised form of the query, see `query_key`, and hands them out until they
+expire.
+
+The total size of both caches is bounded, and the least recently used items
+are removed when they grow beyond that size.
+"""
+from __future__ import absolute_import, division, print_function
+
+import os
+import json
+import stat
+import time
+import shutil
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+from collections import namedtuple
+from contextlib import closing
+
+import sunpy
+from sunpy.extern.six.moves import cPickle as pickle
+from sunpy.net.attr import Attr, AttrAnd, AttrOr
+
+__all__ = ['CacheEntry', 'DownloadCache', 'QueryCache', 'query_key',
+           'get_default_cache', 'get_default_query_cache']
+
+CacheEntry = namedtuple('CacheEntry', 'key digest name size disposition')
+CacheEntry.__doc__ = """
+A file in the cache.
+
+key : the URL or provider file ID the file was stored under
+digest : the SHA-256 hex digest of the contents of the file
+name : the file name the file was first downloaded to
+size : the size of the file in bytes
+disposition : the Content-Disposition header of the download, or `None`
+"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_blobs_last_access ON blobs (last_access);
+CREATE TABLE IF NOT EXISTS keys (
+    key TEXT PRIMARY KEY,
+    digest TEXT NOT NULL REFERENCES blobs (digest),
+    name TEXT NOT NULL,
+    disposition TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_keys_digest ON keys (digest);
+"""
+
+
+def file_digest(filename, buf=2 ** 20):
+    """Return the SHA-256 hex digest of the contents of a file."""
+    sha = hashlib.sha256()
+    with open(filename, 'rb') as fd:
+        while True:
+            data = fd.read(buf)
+            if not data:
+                break
+            sha.update(data)
+    return sha.hexdigest()
+
+
+class DownloadCache(object):
+    """
+    A size bounded cache of downloaded files shared by all download
+    directories.
+
+    Parameters
+    ----------
+    directory : str
+        The directory the files and the index (an SQLite database) are kept
+        in. It is created if it does not exist.
+    max_size : int, optional
+        The maximum total size of the cached files in bytes. When it is
+        exceeded, the least recently used files are removed. No limit if
+        `None`.
+    link : {'copy', 'hard', 'symlink'}
+        How a cached file is made available at the requested path, and how a
+        downloaded file is stored in the cache. If a hard link or a symlink
+        cannot be created (e.g. because the path is on a different file
+        system), the file is copied.
+
+    Notes
+    -----
+    The cached files are read-only. Hard links and symlinks share their
+    contents with the cached file, so files made available that way are
+    read-only as well, and so is a downloaded file stored by a hard link. A
+    cached file whose size or modification time has changed is dropped from
+    the cache instead of being handed out.
+    """
+    _link_methods = ('hard', 'symlink', 'copy')
+
+    def __init__(self, directory, max_size=None, link='copy'):
+        if link not in self._link_methods:
+            raise ValueError("link must be one of {0}".format(
+                ', '.join(self._link_methods)))
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_size = max_size
+        self.link = link
+        self._lock = threading.Lock()
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        # SQLite connections cannot be shared between threads, so every
+        # operation opens its own.
+        conn = sqlite3.connect(os.path.join(self.directory, 'index.sqlite'),
+                               timeout=60)
+        return _Transaction(conn)
+
+    def _blob_path(self, digest):
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def __contains__(self, key):
+        with self._connect() as conn:
+            row = conn.execute('SELECT 1 FROM keys WHERE key = ?',
+                               (key,)).fetchone()
+        return row is not None
+
+    def __len__(self):
+        with self._connect() as conn:
+            return conn.execute('SELECT COUNT(*) FROM keys').fetchone()[0]
+
+    @property
+    def size(self):
+        """The total size of the cached files in bytes."""
+        with self._connect() as conn:
+            return conn.execute(
+                'SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+
+    def lookup(self, key, checksum=None, size=None):
+        """
+        Look up a key in the cache.
+
+        Parameters
+        ----------
+        key : str
+            The provider file ID or URL of the file.
+        checksum : str, optional
+            The SHA-256 hex digest the cached file has to have.
+        size : int, optional
+            The size in bytes the cached file has to have.
+
+        Returns
+        -------
+        entry : `CacheEntry` or `None`
+            The cached file, or `None` if the key is not in the cache, the
+            checksum or size does not match, or the cached file has been
+            changed since it was stored.
+        """
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                'SELECT keys.key, keys.digest, keys.name, blobs.size, '
+                'keys.disposition, blobs.mtime FROM keys JOIN blobs '
+                'USING (digest) WHERE keys.key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            entry = CacheEntry(*row[:5])
+            if checksum is not None and checksum.lower() != entry.digest:
+                return None
+            if size is not None and size != entry.size:
+                return None
+            blob = self._blob_path(entry.digest)
+            try:
+                blob_stat = os.stat(blob)
+            except OSError:
+                blob_stat = None
+            if (blob_stat is None or blob_stat.st_size != entry.size or
+                    blob_stat.st_mtime != row[5]):
+                self._remove_blob(conn, entry.digest)
+                return None
+            conn.execute('UPDATE blobs SET last_access = ? WHERE digest = ?',
+                         (time.time(), entry.digest))
+        return entry
+
+    def add(self, key, filename, disposition=None):
+        """
+        Store a downloaded file in the cache under a key.
+
+        Parameters
+        ----------
+        key : str
+            The provider file ID or URL of the file.
+        filename : str
+            The downloaded file. It is left in place, but is made read-only
+            if it is stored by a hard link.
+        disposition : str, optional
+            The Content-Disposition header of the download, used to name the
+            file when it is taken from the cache.
+
+        Returns
+        -------
+        entry : `CacheEntry`
+        """
+        digest = file_digest(filename)
+        size = os.path.getsize(filename)
+        blob = self._blob_path(digest)
+        with self._lock:
+            if not os.path.isfile(blob):
+                dir_ = os.path.dirname(blob)
+                if not os.path.isdir(dir_):
+                    os.makedirs(dir_)
+                tmp = '{0}.{1}.tmp'.format(blob, threading.current_thread().ident)
+                self._link_file(filename, tmp, symlink=False)
+                os.chmod(tmp, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+                os.rename(tmp, blob)
+            mtime = os.stat(blob).st_mtime
+            with self._connect() as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO blobs (digest, size, mtime, last_access) '
+                    'VALUES (?, ?, ?, ?)', (digest, size, mtime, time.time()))
+                conn.execute(
+                    'INSERT OR REPLACE INTO keys (key, digest, name, disposition) '
+                    'VALUES (?, ?, ?, ?)',
+                    (key, digest, os.path.basename(filename), disposition))
+                self._evict(conn, keep=digest)
+        return CacheEntry(key, digest, os.path.basename(filename), size,
+                          disposition)
+
+    def materialize(self, entry, path):
+        """
+        Make a cached file available at ``path``, replacing any file there.
+
+        Parameters
+        ----------
+        entry : `CacheEntry`
+            The cached file, as returned by `lookup`.
+        path : str
+            The path to make the file available at.
+
+        Returns
+        -------
+        path : str
+        """
+        dir_ = os.path.abspath(os.path.dirname(path))
+        if not os.path.isdir(dir_):
+            os.makedirs(dir_)
+        blob = self._blob_path(entry.digest)
+        if os.path.lexists(path):
+            if os.path.exists(path) and os.path.samefile(path, blob):
+                return path
+            os.remove(path)
+        self._link_file(blob, path, symlink=True)
+        return path
+
+    def _link_file(self, source, target, symlink):
+        """Hard link, symlink or copy ``source`` to ``target``, starting with
+        the method selected by ``self.link``. A copy is writable."""
+        methods = self._link_methods[self._link_methods.index(self.link):]
+        for method in methods:
+            try:
+                if method == 'hard' and hasattr(os, 'link'):
+                    os.link(source, target)
+                elif method == 'symlink' and symlink and hasattr(os, 'symlink'):
+                    os.symlink(source, target)
+                elif method == 'copy':
+                    shutil.copyfile(source, target)
+                else:
+                    continue
+                return
+            except OSError:
+                if method == 'copy':
+                    raise
+
+    def remove(self, key):
+        """Remove a key from the cache. The file is removed as well if no
+        other key refers to it."""
+        with self._lock, self._connect() as conn:
+            row = conn.execute('SELECT digest FROM keys WHERE key = ?',
+                               (key,)).fetchone()
+            if row is None:
+                return
+            conn.execute('DELETE FROM keys WHERE key = ?', (key,))
+            others = conn.execute('SELECT 1 FROM keys WHERE digest = ?',
+                                  row).fetchone()
+            if others is None:
+                self._remove_blob(conn, row[0])
+
+    def clear(self):
+        """Remove all files from the cache."""
+        with self._lock, self._connect() as conn:
+            digests = [row[0] for row in conn.execute('SELECT digest FROM blobs')]
+            for digest in digests:
+                self._remove_blob(conn, digest)
+
+    def _remove_blob(self, conn, digest):
+        conn.execute('DELETE FROM keys WHERE digest = ?', (digest,))
+        conn.execute('DELETE FROM blobs WHERE digest = ?', (digest,))
+        blob = self._blob_path(digest)
+        if os.path.exists(blob):
+            # Read-only files cannot be removed on Windows
+            os.chmod(blob, stat.S_IRUSR | stat.S_IWUSR)
+            os.remove(blob)
+
+    def _evict(self, conn, keep=None):
+        """Remove the least recently used files until the cache fits into
+        ``max_size``. The file with the digest ``keep`` is never removed."""
+        if self.max_size is None:
+            return
+        total = conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+        if total <= self.max_size:
+            return
+        rows = conn.execute(
+            'SELECT digest, size FROM blobs WHERE digest != ? '
+            'ORDER BY last_access', (keep,)).fetchall()
+        for digest, size in rows:
+            if total <= self.max_size:
+                break
+            self._remove_blob(conn, digest)
+            total -= size
+
+
+class _Transaction(object):
+    """Commit (or roll back) and close an SQLite connection on exit."""
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self.conn
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        with closing(self.conn):
+            if exc_type is None:
+                self.conn.commit()
+            else:
+                self.conn.rollback()
+
+
+class CachedResponse(object):
+    """
+    Stands in for the HTTP response of a download that is served from the
+    cache, so that the path functions of `sunpy.net.download.Downloader` can
+    name the file the same way as for a real download.
+    """
+    status = 200
+
+    def __init__(self, entry):
+        self.entry = entry
+        self.headers = {}
+        if entry.disposition is not None:
+            self.headers['Content-Disposition'] = entry.disposition
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
+
+
+class QueryKeyEncoder(json.JSONEncoder):
+    """
+    Encode a query as JSON in the same form as
+    `sunpy.database.serialize.dump_query`, ``{class name: values}``, for any
+    kind of attribute. The operands of ``&`` and ``|`` are sorted, so that
+    the encoding does not depend on their order.
+    """
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        elif isinstance(o, (AttrAnd, AttrOr)):
+            encoded = sorted(json.dumps(elem, cls=QueryKeyEncoder,
+                                        sort_keys=True) for elem in o.attrs)
+            values = [json.loads(elem) for elem in encoded]
+            return {o.__class__.__name__: values}
+        elif isinstance(o, Attr):
+            values = dict((key, value) for key, value in vars(o).items()
+                          if not callable(value))
+            return {o.__class__.__name__: values}
+        elif hasattr(o, 'unit') and hasattr(o, 'value'):
+            # astropy Quantity
+            return [self.default(o.value) if hasattr(o.value, 'tolist')
+                    else o.value, str(o.unit)]
+        elif hasattr(o, 'tolist'):
+            return o.tolist()
+        return repr(o)
+
+
+def query_key(query, **kwargs):
+    """
+    Return a string which identifies a query, for use as the key of a
+    `QueryCache`. Queries which only differ in the order of the operands of
+    ``&`` and ``|`` have the same key.
+
+    Parameters
+    ----------
+    query : `sunpy.net.attr.Attr`
+        The query.
+    kwargs : dict
+        Further arguments of the query, which are part of the key.
+    """
+    return json.dumps([query, kwargs], cls=QueryKeyEncoder, sort_keys=True)
+
+
+class QueryCache(object):
+    """
+    A size bounded cache of query responses, with a time to live per
+    provider.
+
+    Parameters
+    ----------
+    directory : str
+        The directory the cache (an SQLite database) is kept in. It is created
+        if it does not exist.
+    max_size : int, optional
+        The maximum total size of the pickled responses in bytes. When it is
+        exceeded, the least recently used responses are removed. No limit if
+        `None`.
+    ttl : dict, optional
+        The number of seconds the responses of a provider (e.g. ``'vso'``)
+        are valid for. The responses of providers which are not listed do
+        not expire. Defaults to `QueryCache.default_ttl`.
+    """
+    default_ttl = {'vso': 24 * 3600., 'jsoc': 3600.}
+
+    def __init__(self, directory, max_size=None, ttl=None):
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_size = max_size
+        self.ttl = dict(self.default_ttl if ttl is None else ttl)
+        self._lock = threading.Lock()
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS queries ('
+                'provider TEXT NOT NULL, key TEXT NOT NULL, '
+                'created REAL NOT NULL, last_access REAL NOT NULL, '
+                'size INTEGER NOT NULL, data BLOB NOT NULL, '
+                'PRIMARY KEY (provider, key))')
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_queries_last_access '
+                         'ON queries (last_access)')
+
+    def _connect(self):
+        conn = sqlite3.connect(os.path.join(self.directory, 'queries.sqlite'),
+                               timeout=60)
+        return _Transaction(conn)
+
+    def __len__(self):
+        with self._connect() as conn:
+            return conn.execute('SELECT COUNT(*) FROM queries').fetchone()[0]
+
+    @property
+    def size(self):
+        """The total size of the cached responses in bytes."""
+        with self._connect() as conn:
+            return conn.execute(
+                'SELECT COALESCE(SUM(size), 0) FROM queries').fetchone()[0]
+
+    def get(self, provider, key):
+        """
+        Return the cached response of a provider for a query key, or `None`
+        if there is none or it has expired.
+        """
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                'SELECT created, data FROM queries '
+                'WHERE provider = ? AND key = ?', (provider, key)).fetchone()
+            if row is None:
+                return None
+            created, data = row
+            ttl = self.ttl.get(provider)
+            if ttl is not None and now - created > ttl:
+                conn.execute('DELETE FROM queries WHERE provider = ? AND key = ?',
+                             (provider, key))
+                return None
+            try:
+                response = pickle.loads(bytes(data))
+            except Exception:
+                # Written by an incompatible version of the client.
+                conn.execute('DELETE FROM queries WHERE provider = ? AND key = ?',
+                             (provider, key))
+                return None
+            conn.execute('UPDATE queries SET last_access = ? '
+                         'WHERE provider = ? AND key = ?', (now, provider, key))
+        return response
+
+    def set(self, provider, key, response):
+        """Store the response of a provider for a query key."""
+        data = pickle.dumps(response, pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO queries '
+                '(provider, key, created, last_access, size, data) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (provider, key, now, now, len(data), sqlite3.Binary(data)))
+            self._evict(conn)
+
+    def clear(self, provider=None):
+        """Remove all the responses, or only those of one provider."""
+        with self._lock, self._connect() as conn:
+            if provider is None:
+                conn.execute('DELETE FROM queries')
+            else:
+                conn.execute('DELETE FROM queries WHERE provider = ?',
+                             (provider,))
+
+    def _evict(self, conn):
+        """Remove expired responses, then the least recently used ones until
+        the cache fits into ``max_size``."""
+        now = time.time()
+        for provider, ttl in self.ttl.items():
+            if ttl is not None:
+                conn.execute('DELETE FROM queries '
+                             'WHERE provider = ? AND created < ?',
+                             (provider, now - ttl))
+        if self.max_size is None:
+            return
+        total = conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM queries').fetchone()[0]
+        if total <= self.max_size:
+            return
+        rows = conn.execute('SELECT provider, key, size FROM queries '
+                            'ORDER BY last_access').fetchall()
+        # The newest response stays, even if it is larger than max_size.
+        for provider, key, size in rows[:-1]:
+            if total <= self.max_size:
+                break
+            conn.execute('DELETE FROM queries WHERE provider = ? AND key = ?',
+                         (provider, key))
+            total -= size
+
+
+_default_cache = {}
+
+
+def _megabytes(option):
+    return int(float(sunpy.config.get('downloads', option)) * 2 ** 20)
+
+
+def get_default_cache():
+    """
+    Return the download cache configured by the ``cache_dir`` and
+    ``cache_size`` (in megabytes) options of the ``downloads`` section of the
+    SunPy configuration.
+    """
+    key = (DownloadCache, sunpy.config.get('downloads', 'cache_dir'),
+           _megabytes('cache_size'))
+    if key not in _default_cache:
+        _default_cache[key] = DownloadCache(*key[1:])
+    return _default_cache[key]
+
+
+def get_default_query_cache():
+    """
+    Return the query cache configured by the ``cache_dir`` and
+    ``query_cache_size`` (in megabytes) options of the ``downloads`` section
+    of the SunPy configuration.
+    """
+    key = (QueryCache, sunpy.config.get('downloads', 'cache_dir'),
+           _megabytes('query_cache_size'))
+    if key not in _default_cache:
+        _default_cache[key] = QueryCache(*key[1:])
+    return _default_cache[key]
+
+
+def as_cache(cache, default=get_default_cache):
+    """Convert the ``cache`` argument of the download and query functions to
+    a cache: `True` selects the cache returned by ``default``, `False` and
+    `None` disable caching."""
+    if cache is True:
+        return default()
+    if cache is False:
+        return None
+    return cache
@@ -249,7 +249,8 @@ class GenericClient(object):
             self.map_.get('TimeRange'), **kwergs)
         return QueryResponse.create(self.map_, urls)
 
-    def get(self, qres, path=None, error_callback=None, **kwargs):
+    def get(self, qres, path=None, error_callback=None, downloader=None,
+            **kwargs):
         """
         Download a set of results.
 
@@ -258,6 +259,10 @@ class GenericClient(object):
         qres : `~sunpy.net.dataretriever.QueryResponse`
             Results to download.
 
+        downloader : `sunpy.net.download.Downloader`, optional
+            The downloader used to fetch the files. By default a new one is
+            created.
+
         Returns
         -------
         Results Object
@@ -295,13 +300,14 @@ class GenericClient(object):
 
         res = Results(lambda x: None, 0, lambda map_: self._link(map_))
 
-        dobj = Downloader(max_conn=len(urls), max_total=len(urls))
+        if downloader is None:
+            downloader = Downloader()
 
         # We cast to list here in list(zip... to force execution of 
         # res.require([x]) at the start of the loop.
         for aurl, ncall, fname in list(zip(urls, map(lambda x: res.require([x]),
                                               urls), paths)):
-            dobj.download(aurl, fname, ncall, error_callback)
+            downloader.download(aurl, fname, ncall, error_callback)
 
         return res
 
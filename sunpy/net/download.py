@@ -9,19 +9,19 @@ from __future__ import absolute_import
 
 import os
 import re
+import time
+import warnings
 import threading
 
 from functools import partial
-from contextlib import closing
 from collections import defaultdict, deque
 
 from sunpy.extern import six
-from sunpy.extern.six.moves import urllib
-from sunpy.extern.six import iteritems
+from sunpy.extern.six.moves import urllib, http_client
 
 import sunpy
 from sunpy.util.progressbar import TTYProgressBar as ProgressBar
-
+from sunpy.net.cache import CachedResponse
 
 def default_name(path, sock, url):
     name = sock.headers.get('Content-Disposition', url.rsplit('/', 1)[-1])
@@ -29,64 +29,272 @@ def default_name(path, sock, url):
 
 
 class Downloader(object):
-    def __init__(self, max_conn=5, max_total=20):
+    """
+    Download files over HTTP(S), FTP or from local URLs.
+
+    Every server gets up to ``max_conn`` worker threads, each of which keeps
+    one persistent (keep-alive) HTTP connection open and uses it for the
+    queued files of that server. At most ``max_total`` transfers run at the
+    same time. Files are written to ``<name>.part`` and renamed when they are
+    complete. Failed transfers are retried ``max_retries`` times, waiting
+    ``backoff * 2 ** attempt`` seconds before each attempt, and a partial file
+    is resumed with a HTTP Range request if the server supports it.
+
+    If a `~sunpy.net.cache.DownloadCache` is given, every download is looked
+    up in it before any network request is made, and served from it if it is
+    found. Completed downloads are added to the cache.
+
+    Parameters
+    ----------
+    max_conn : int
+        Maximum number of simultaneous connections per server.
+    max_total : int
+        Maximum number of simultaneous connections in total.
+    buf : int
+        Number of bytes read from the network at once.
+    max_retries : int
+        Number of times a failed transfer is retried. HTTP client errors
+        (status 4xx) and errors raised by the path function are not retried.
+    backoff : float
+        The time in seconds to wait before the first retry.
+    timeout : float
+        Timeout in seconds for blocking socket operations.
+    cache : `~sunpy.net.cache.DownloadCache`, optional
+        The cache of downloaded files. No caching if `None`.
+    """
+    max_redirects = 5
+    # Seconds an idle worker keeps its connection open waiting for more files
+    idle_timeout = 2.
+
+    def __init__(self, max_conn=5, max_total=20, buf=2 ** 16, max_retries=3,
+                 backoff=1., timeout=60, cache=None):
         self.max_conn = max_conn
         self.max_total = max_total
-        self.conns = 0
-
+        self.buf = buf
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = cache
+
+        # Number of worker threads, idle worker threads and queued downloads
+        # per server.
         self.connections = defaultdict(int)  # int() -> 0
+        self.idle = defaultdict(int)
         self.q = defaultdict(deque)
 
-        self.buf = 9096
-
         self.done_lock = threading.Semaphore(0)
         self.mutex = threading.Lock()
+        self.queued = threading.Condition(self.mutex)
+        self._slots = threading.BoundedSemaphore(max_total)
 
-    def _start_download(self, url, path, callback, errback):
+    def _worker(self, server):
+        """Download the queued files of one server, reusing the connection."""
+        connection = None
         try:
-            server = self._get_server(url)
-
+            while True:
+                with self.mutex:
+                    deadline = time.time() + self.idle_timeout
+                    self.idle[server] += 1
+                    while not self.q[server] and time.time() < deadline:
+                        self.queued.wait(deadline - time.time())
+                    self.idle[server] -= 1
+                    if not self.q[server]:
+                        self.connections[server] -= 1
+                        return
+                url, path, callback, errback, key, expected = self.q[server].popleft()
+                result, error = self._from_cache(url, path, key, expected)
+                if result is None and error is None:
+                    with self._slots:
+                        connection, result, error = self._start_download(
+                            connection, url, path, key)
+                if error is None:
+                    callback(result)
+                else:
+                    errback(error)
+        except Exception:
+            # A callback failed. Hand the rest of the queue to a new worker.
             with self.mutex:
-                self.connections[server] += 1
-                self.conns += 1
+                self.connections[server] -= 1
+                self._start_worker(server)
+            raise
+        finally:
+            if connection is not None:
+                connection.close()
+
+    def _start_worker(self, server):
+        """Wake up an idle worker for the server, or start a new one if there
+        is work and the connection limit allows it. Must be called holding
+        ``self.mutex``."""
+        if self.idle[server]:
+            self.queued.notify_all()
+        if (len(self.q[server]) > self.idle[server] and
+                self.connections[server] < self.max_conn):
+            self.connections[server] += 1
+            th = threading.Thread(target=partial(self._worker, server))
+            th.daemon = True
+            th.start()
 
-            with closing(urllib.request.urlopen(url)) as sock:
-                fullname = path(sock, url)
+    def _from_cache(self, url, path, key, expected):
+        """Serve a download from the cache if it is there with the expected
+        checksum and size. Returns the argument for the callback and the
+        exception for the errback, both `None` if the file is not in the
+        cache."""
+        if self.cache is None:
+            return None, None
+        try:
+            entry = self.cache.lookup(key, **expected)
+        except Exception as e:
+            warnings.warn("Could not read the download cache: {0}".format(e))
+            return None, None
+        if entry is None:
+            return None, None
+        try:
+            fullname = path(CachedResponse(entry), url)
+            self.cache.materialize(entry, fullname)
+        except Exception as e:
+            return None, e
+        return {'path': fullname}, None
+
+    def _add_to_cache(self, key, state):
+        """Add a downloaded file to the cache. A failure only costs the
+        download of the file next time, so it is reported as a warning."""
+        if self.cache is None:
+            return
+        try:
+            self.cache.add(key, state['fullname'], state['disposition'])
+        except Exception as e:
+            warnings.warn("Could not add {0} to the download cache: {1}".format(
+                state['fullname'], e))
+
+    def _start_download(self, connection, url, path, key):
+        """Download a file, retrying failed attempts, and add it to the cache
+        under ``key``. Returns the connection to reuse, the argument for the
+        callback and the exception for the errback (`None` on success)."""
+        # The connection and the file name are kept across attempts, so that
+        # a retry can resume the partial file.
+        state = {'connection': connection, 'fullname': None}
+        attempt = 0
+        while True:
+            try:
+                self._transfer(state, url, path)
+                self._add_to_cache(key, state)
+                return state['connection'], {'path': state['fullname']}, None
+            except Exception as e:
+                if state['connection'] is not None:
+                    state['connection'].close()
+                    state['connection'] = None
+                if attempt >= self.max_retries or not _retryable(e):
+                    return None, None, e
+            time.sleep(self.backoff * 2 ** attempt)
+            attempt += 1
+
+    def _transfer(self, state, url, path):
+        """Make one attempt to download the file at ``url``."""
+        fullname = state['fullname']
+        offset = 0
+        if fullname is not None and os.path.exists(fullname + '.part'):
+            offset = os.path.getsize(fullname + '.part')
+        response = self._request(state, url, offset)
+        try:
+            if fullname is None:
+                fullname = path(response, url)
                 dir_ = os.path.abspath(os.path.dirname(fullname))
                 if not os.path.exists(dir_):
                     os.makedirs(dir_)
-
-                with open(fullname, 'wb') as fd:
-                    while True:
-                        rec = sock.read(self.buf)
-                        if not rec:
-                            with self.mutex:
-                                self._close(callback, [{'path': fullname}], server)
-                            break
-                        else:
-                            fd.write(rec)
-        except Exception as e:
-            # TODO: Fix the silent failing
-            if errback is not None:
-                with self.mutex:
-                    self._close(errback, [e], server)
-
-    def _attempt_download(self, url, path, callback, errback):
-        """ Attempt download. If max. connection limit reached, queue for download later.
-        """
-
-        num_connections = self.connections[self._get_server(url)]
-
-        # If max downloads has not been exceeded, begin downloading
-        if num_connections < self.max_conn and self.conns < self.max_total:
-            th = threading.Thread(
-                target=partial(self._start_download, url,
-                               path, callback, errback)
-            )
-            th.daemon = True
-            th.start()
-            return True
-        return False
+                state['fullname'] = fullname
+                state['disposition'] = response.headers.get(
+                    'Content-Disposition')
+                # Resume a partial file left by an earlier download.
+                partname = fullname + '.part'
+                if (os.path.exists(partname) and _status(response) == 200 and
+                        response.headers.get('Accept-Ranges') == 'bytes'):
+                    # The unread body is still on the connection, so it
+                    # cannot carry the next request.
+                    response.close()
+                    if state['connection'] is not None:
+                        state['connection'].close()
+                        state['connection'] = None
+                    offset = os.path.getsize(partname)
+                    response = self._request(state, url, offset)
+
+            partname = fullname + '.part'
+            if _status(response) == 206:
+                content_range = response.headers.get('Content-Range', '')
+                match = re.match(r'bytes (\d+)-', content_range)
+                if not match or int(match.group(1)) != offset:
+                    raise IOError('Unexpected Content-Range {0!r} for {1}'.format(
+                        content_range, url))
+                mode = 'ab'
+            else:
+                mode = 'wb'
+
+            length = response.headers.get('Content-Length')
+            received = 0
+            with open(partname, mode) as fd:
+                while True:
+                    rec = response.read(self.buf)
+                    if not rec:
+                        break
+                    fd.write(rec)
+                    received += len(rec)
+            if length is not None and received < int(length):
+                raise http_client.IncompleteRead(b'', int(length) - received)
+        finally:
+            response.close()
+
+        if os.path.exists(fullname):
+            os.remove(fullname)
+        os.rename(partname, fullname)
+
+    def _request(self, state, url, offset=0):
+        """Send a GET request for ``url``, starting at byte ``offset``, and
+        return the response. The connection in ``state`` is used if it points
+        to the same server and replaced otherwise. Redirects are followed."""
+        for _ in range(self.max_redirects + 1):
+            parts = urllib.parse.urlsplit(url)
+            if parts.scheme not in ('http', 'https'):
+                return urllib.request.urlopen(url, timeout=self.timeout)
+
+            connection = state['connection']
+            key = (parts.scheme, parts.netloc)
+            if connection is not None and connection.sunpy_key != key:
+                connection.close()
+                connection = None
+            if connection is None:
+                if parts.scheme == 'https':
+                    cls = http_client.HTTPSConnection
+                else:
+                    cls = http_client.HTTPConnection
+                connection = cls(parts.netloc, timeout=self.timeout)
+                connection.sunpy_key = key
+            state['connection'] = connection
+
+            headers = {'Accept-Encoding': 'identity',
+                       'User-Agent': 'SunPy/{0}'.format(sunpy.__version__)}
+            if offset:
+                headers['Range'] = 'bytes={0}-'.format(offset)
+            target = urllib.parse.urlunsplit(
+                ('', '', parts.path or '/', parts.query, ''))
+            connection.request('GET', target, headers=headers)
+            response = connection.getresponse()
+            if not hasattr(response, 'headers'):  # py 2.x
+                response.headers = response.msg
+
+            location = response.getheader('Location')
+            if response.status in (301, 302, 303, 307, 308) and location:
+                response.read()
+                url = urllib.parse.urljoin(url, location)
+            elif response.status == 416 and offset:
+                # The partial file cannot be resumed, start from scratch.
+                response.read()
+                offset = 0
+            elif response.status >= 400:
+                response.read()
+                raise urllib.error.HTTPError(
+                    url, response.status, response.reason, response.msg, None)
+            else:
+                return response
+        raise IOError('Too many redirects for {0}'.format(url))
 
     def _get_server(self, url):
         """Returns the server name for a given URL.
@@ -112,7 +320,8 @@ class Downloader(object):
     def init(self):
         pass
 
-    def download(self, url, path=None, callback=None, errback=None):
+    def download(self, url, path=None, callback=None, errback=None, key=None,
+                 checksum=None, size=None):
         """Downloads a file at a specified URL.
 
         Parameters
@@ -127,14 +336,20 @@ class Downloader(object):
             Function to call when download is successfully completed
         errback : function
             Function to call when download fails
+        key : string
+            The key of the file in the download cache, e.g. a provider file
+            ID. Defaults to the URL.
+        checksum : string
+            The SHA-256 hex digest of the file, if known. A cached file is
+            only used if it has this checksum.
+        size : int
+            The size of the file in bytes, if known. A cached file is only
+            used if it has this size.
 
         Returns
         -------
         out : None
         """
-        # Load balancing?
-        # @todo: explain
-
         server = self._get_server(url)
 
         # Create function to compute the filepath to download to if not set
@@ -153,31 +368,30 @@ class Downloader(object):
         if errback is None:
             errback = self._default_error_callback
 
-        # Attempt to download file from URL
-        if not self._attempt_download(url, path, callback, errback):
-            # If there are too many concurrent downloads, queue for later
-            self.q[server].append((url, path, callback, errback))
+        # Queue the download and hand it to an idle worker of the server or
+        # start a new one. Otherwise a running worker picks it up.
+        with self.mutex:
+            self.q[server].append((url, path, callback, errback,
+                                   url if key is None else key,
+                                   {'checksum': checksum, 'size': size}))
+            self._start_worker(server)
+
+
+_NETWORK_ERRORS = (IOError, OSError, http_client.HTTPException)
+
+
+def _retryable(exception):
+    """Return True if a download that failed with the exception should be
+    attempted again."""
+    if isinstance(exception, urllib.error.HTTPError):
+        return exception.code >= 500
+    return isinstance(exception, _NETWORK_ERRORS)
 
-    def _close(self, callback, args, server):
-        """ Called after download is done. Activated queued downloads, call callback.
-        """
-        callback(*args)
-
-        self.connections[server] -= 1
-        self.conns -= 1
-
-        if self.q[server]:
-            self._attempt_download(*self.q[server].pop())
-        else:
-            for k, v in iteritems(self.q):  # pylint: disable=W0612
-                while v:
-                    if self._attempt_download(*v[0]):
-                        v.popleft()
-                        if self.conns == self.max_total:
-                            return
-                    else:
-                        break
 
+def _status(response):
+    """The HTTP status of a response; responses for other schemes count as
+    200 OK."""
+    return getattr(response, 'status', 200)
 
 
 class Results(object):
@@ -9,6 +9,8 @@ well as defining ``Fido`` which is an instance of
 # Author: Rishabh Sharma <rishabh.sharma.gunner@gmail.com>
 # This module was developed under funding provided by
 # Google Summer of Code 2014
+import time
+import warnings
 from collections import MutableSequence
 
 from sunpy.util.datatype_factory_base import BasicRegistrationFactory
@@ -18,6 +20,8 @@ from sunpy.util.datatype_factory_base import MultipleMatchError
 from sunpy.net.dataretriever.clients import CLIENTS
 from sunpy.net.dataretriever.client import QueryResponse
 from sunpy.net.vso import VSOClient
+from sunpy.net.download import Downloader
+from sunpy.net.cache import as_cache
 from . import attr
 from . import attrs as a
 
@@ -155,8 +159,8 @@ Construct a simple AttrWalker to split up searches into blocks of attrs being
 This pipeline only understands AttrAnd and AttrOr, Fido.search passes in an
 AttrAnd object of all the query parameters, if an AttrOr is encountered the
 query is split into the component parts of the OR, which at somepoint will end
-up being an AttrAnd object, at which point it is passed into
-_get_registered_widget.
+up being an AttrAnd object. The walker returns the attrs of each of these
+blocks, which Fido.search then sends to the matching clients concurrently.
 """
 query_walker = attr.AttrWalker()
 
@@ -170,8 +174,8 @@ def _create_and(walker, query, factory):
             error += str(at) + ', '
         raise ValueError(error)
 
-    # Return the response and the client
-    return [factory._make_query_to_client(*query.attrs)]
+    # Return the block, it is sent to a client by Fido.search
+    return [query.attrs]
 
 
 @query_walker.add_creator(attr.AttrOr)
@@ -189,7 +193,7 @@ class UnifiedDownloaderFactory(BasicRegistrationFactory):
 
     Search and Download data from a variety of supported sources.
     """
-    def search(self, *query):
+    def search(self, *query, **kwargs):
         """
         Query for data in form of multiple parameters.
 
@@ -222,6 +226,17 @@ class UnifiedDownloaderFactory(BasicRegistrationFactory):
             VSO and the JSOC.  The query can mix attributes from the VSO and
             the JSOC.
 
+        max_workers : `int`, optional
+            The number of threads used to query the clients. Defaults to one
+            thread per client query.
+
+        timeout : `float` or `dict`, optional
+            The number of seconds to wait for the results of a client, or a
+            dictionary mapping client class names (e.g. ``'VSOClient'``) to
+            the number of seconds to wait for that client. A client which
+            does not answer in time is left out of the results with a
+            warning. By default there is no time limit.
+
         Returns
         -------
         `sunpy.net.fido_factory.UnifiedResponse` object
@@ -232,12 +247,78 @@ class UnifiedDownloaderFactory(BasicRegistrationFactory):
         The conjunction 'and' transforms query into disjunctive normal form
         ie. query is now of form A & B or ((A & B) | (C & D))
         This helps in modularising query into parts and handling each of the
-        parts individually.
+        parts individually. The parts are sent to their clients at the same
+        time, so a search takes as long as the slowest client.
         """
+        max_workers = kwargs.pop('max_workers', None)
+        timeout = kwargs.pop('timeout', None)
+        if kwargs:
+            raise TypeError("search() got unexpected keyword arguments: "
+                            "{}".format(', '.join(kwargs)))
+
         query = attr.and_(*query)
-        return UnifiedResponse(query_walker.create(query, self))
+        blocks = [(self._check_registered_widgets(*attrs)[0], attrs)
+                  for attrs in query_walker.create(query, self)]
+        return UnifiedResponse(self._query_clients(blocks, max_workers, timeout))
+
+    def _query_clients(self, blocks, max_workers=None, timeout=None):
+        """
+        Send the queries to their clients using a thread pool.
+
+        Parameters
+        ----------
+        blocks : list of (client class, attrs) tuples
+
+        max_workers : `int`, optional
+            Number of threads, defaults to one per query.
 
-    def fetch(self, query_result, wait=True, progress=True, **kwargs):
+        timeout : `float` or `dict`, optional
+            See `UnifiedDownloaderFactory.search`.
+
+        Returns
+        -------
+        A list of (`~sunpy.net.dataretriever.client.QueryResponse`, client)
+        tuples in the order of the blocks, without the queries which timed
+        out.
+        """
+        if len(blocks) == 1 and timeout is None:
+            return [self._query_client(*blocks[0])]
+
+        from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+        pool = ThreadPoolExecutor(max_workers=max_workers or len(blocks))
+        start = time.time()
+        try:
+            futures = [pool.submit(self._query_client, client, attrs)
+                       for client, attrs in blocks]
+            results = []
+            for (client, attrs), future in zip(blocks, futures):
+                if isinstance(timeout, dict):
+                    limit = timeout.get(client.__name__)
+                else:
+                    limit = timeout
+                if limit is not None:
+                    limit = max(0, start + limit - time.time())
+                try:
+                    results.append(future.result(limit))
+                except TimeoutError:
+                    future.cancel()
+                    warnings.warn("{} did not answer the query within the "
+                                  "timeout, its results are left out: "
+                                  "{}".format(client.__name__, attrs))
+            return results
+        finally:
+            # Do not wait for the queries which timed out.
+            pool.shutdown(wait=False)
+
+    def _query_client(self, client, attrs):
+        """Query a new instance of a client class. Returns the response and
+        the client."""
+        tmpclient = client()
+        return tmpclient.query(*attrs), tmpclient
+
+    def fetch(self, query_result, wait=True, progress=True, cache=False,
+              **kwargs):
         """
         Downloads the files pointed at by URLs contained within UnifiedResponse
         object.
@@ -253,6 +334,22 @@ class UnifiedDownloaderFactory(BasicRegistrationFactory):
         progress : `bool`
             Show a progress bar while the download is running.
 
+        cache : `bool` or `sunpy.net.cache.DownloadCache`
+            The cache of downloaded files. Files found in it are copied into
+            the download directory instead of being downloaded again. `True`
+            selects the cache configured in the ``downloads`` section of the
+            SunPy configuration, `False` (the default) disables caching.
+            Ignored if a ``downloader`` is given. VSO files are cached under
+            their provider, file ID and size, JSOC files under their name and
+            other files under their URL, so a file whose contents change
+            while its URL stays the same would be served stale from the
+            cache.
+
+        downloader : `sunpy.net.download.Downloader`, optional
+            The downloader shared by all the clients, so that the limits on
+            the number of connections apply to the whole download. By
+            default a new one is created.
+
         Returns
         -------
         `sunpy.net.fido_factory.DownloadResponse`
@@ -264,6 +361,9 @@ class UnifiedDownloaderFactory(BasicRegistrationFactory):
         >>> downresp = Fido.get(unifresp)
         >>> file_paths = downresp.wait()
         """
+        if kwargs.get('downloader') is None:
+            kwargs['downloader'] = Downloader(cache=as_cache(cache))
+
         reslist = []
         for block in query_result.responses:
             reslist.append(block.client.get(block, **kwargs))
@@ -308,24 +408,6 @@ class UnifiedDownloaderFactory(BasicRegistrationFactory):
 
         return candidate_widget_types
 
-    def _make_query_to_client(self, *query):
-        """
-        Given a query, look up the client and perform the query.
-
-        Parameters
-        ----------
-        query : collection of `~sunpy.net.vso.attr` objects
-
-        Returns
-        -------
-        response : `~sunpy.net.dataretriever.client.QueryResponse`
-
-        client : Instance of client class
-        """
-        candidate_widget_types = self._check_registered_widgets(*query)
-        tmpclient = candidate_widget_types[0]()
-        return tmpclient.query(*query), tmpclient
-
 
 Fido = UnifiedDownloaderFactory(registry=CLIENTS,
                                 additional_validation_functions=['_can_handle_query'])
@@ -13,7 +13,9 @@ import json
 import codecs
 import sunpy
 from sunpy.time import parse_time
+from sunpy.util import replacement_filename
 from sunpy.util.net import download_fileobj
+from sunpy.net.cache import as_cache
 
 from sunpy.extern.six.moves import urllib
 
@@ -22,13 +24,19 @@ __all__ = ['HelioviewerClient']
 
 class HelioviewerClient(object):
     """Helioviewer.org Client"""
-    def __init__(self, url="https://legacy.helioviewer.org/api/"):
+    def __init__(self, url="https://legacy.helioviewer.org/api/", cache=False):
         """
         url : location of the Helioviewer API.  The default location points to
             version 1 of the API.  Version 1 of the Helioviewer API is
             currently planned to be supported until the end of April 2017.
+        cache : `bool` or `sunpy.net.cache.DownloadCache`
+            The cache of downloaded images. Images requested with the same
+            parameters again are taken from it. `True` selects the cache
+            configured in the SunPy configuration, `False` (the default)
+            disables caching.
         """
         self._api = url
+        self.cache = cache
 
     def get_data_sources(self, **kwargs):
         """
@@ -243,12 +251,24 @@ class HelioviewerClient(object):
         else:
             directory = os.path.abspath(os.path.expanduser(directory))
 
+        cache = as_cache(self.cache)
+        key = self._api + '?' + urllib.parse.urlencode(sorted(params.items()))
+        if cache is not None:
+            entry = cache.lookup(key)
+            if entry is not None:
+                filepath = os.path.join(directory, entry.name)
+                if not overwrite and os.path.exists(filepath):
+                    filepath = replacement_filename(filepath)
+                return cache.materialize(entry, filepath)
+
         response = self._request(params)
         try:
             filepath = download_fileobj(response, directory, overwrite=overwrite)
         finally:
             response.close()
 
+        if cache is not None:
+            cache.add(key, filepath)
         return filepath
 
     def _request(self, params):
@@ -15,6 +15,7 @@ from astropy.utils.misc import isiterable
 from sunpy import config
 from sunpy.time import parse_time, TimeRange
 from sunpy.net.download import Downloader, Results
+from sunpy.net.cache import as_cache, get_default_query_cache, query_key
 from sunpy.net.attr import and_
 from sunpy.net.jsoc.attrs import walker
 from sunpy.extern.six.moves import urllib
@@ -177,6 +178,14 @@ class JSOCClient(object):
     >>> res.wait(progress=True)   # doctest: +SKIP
     """
 
+    def __init__(self, cache=False):
+        """
+        cache : `bool` or `sunpy.net.cache.QueryCache`
+            The cache of query results. `True` selects the cache configured
+            in the SunPy configuration, `False` (the default) disables caching.
+        """
+        self.cache = cache
+
     def query(self, *query, **kwargs):
         """
         Build a JSOC query and submit it to JSOC for processing.
@@ -204,10 +213,24 @@ class JSOCClient(object):
         -------
         results : JSOCResults object
             A collection of records that the query returns.
+
+        Notes
+        -----
+        If the client was created with a query cache, the results of a query
+        are kept in it, and the same query is answered from it until the
+        cached results expire.
         """
 
         return_results = JSOCResponse()
         query = and_(*query)
+
+        cache = as_cache(self.cache, get_default_query_cache)
+        if cache is not None:
+            key = query_key(query, **kwargs)
+            cached = cache.get('jsoc', key)
+            if cached is not None:
+                return cached
+
         blocks = []
         for block in walker.create(query):
             iargs = kwargs.copy()
@@ -218,6 +241,8 @@ class JSOCClient(object):
 
         return_results.query_args = blocks
 
+        if cache is not None:
+            cache.set('jsoc', key, return_results)
         return return_results
 
     def request_data(self, jsoc_response, **kwargs):
@@ -313,7 +338,7 @@ class JSOCClient(object):
         return allstatus
 
     def get(self, jsoc_response, path=None, overwrite=False, progress=True,
-            max_conn=5, downloader=None, sleep=10):
+            max_conn=5, downloader=None, sleep=10, cache=False):
         """
         Make the request for the data in jsoc_response and wait for it to be
         staged and then download the data.
@@ -342,6 +367,11 @@ class JSOCClient(object):
             The number of seconds to wait between calls to JSOC to check the status
             of the request.
 
+        cache : bool or `sunpy.net.cache.DownloadCache`
+            The cache of downloaded files. `True` selects the cache configured
+            in the SunPy configuration, `False` (the default) disables
+            caching. Ignored if a ``downloader`` is given.
+
         Returns
         -------
         results : a :class:`sunpy.net.vso.Results` instance
@@ -366,7 +396,9 @@ class JSOCClient(object):
                 if u.status_code == 200 and u.json()['status'] == '0':
                     rID = requestIDs.pop(i)
                     r = self.get_request(rID, path=path, overwrite=overwrite,
-                                         progress=progress, results=r)
+                                         progress=progress, max_conn=max_conn,
+                                         downloader=downloader, results=r,
+                                         cache=cache)
 
                 else:
                     time.sleep(sleep)
@@ -374,7 +406,7 @@ class JSOCClient(object):
         return r
 
     def get_request(self, requestIDs, path=None, overwrite=False, progress=True,
-                    max_conn=5, downloader=None, results=None):
+                    max_conn=5, downloader=None, results=None, cache=False):
         """
         Query JSOC to see if request_id is ready for download.
 
@@ -403,6 +435,11 @@ class JSOCClient(object):
         results: Results instance
             A Results manager to use.
 
+        cache : bool or `sunpy.net.cache.DownloadCache`
+            The cache of downloaded files. `True` selects the cache configured
+            in the SunPy configuration, `False` (the default) disables
+            caching. Ignored if a ``downloader`` is given.
+
         Returns
         -------
         res: Results
@@ -419,7 +456,8 @@ class JSOCClient(object):
         path = os.path.expanduser(path)
 
         if downloader is None:
-            downloader = Downloader(max_conn=max_conn, max_total=max_conn)
+            downloader = Downloader(max_conn=max_conn, max_total=max_conn,
+                                    cache=as_cache(cache))
 
         # A Results object tracks the number of downloads requested and the
         # number that have been completed.
@@ -427,6 +465,7 @@ class JSOCClient(object):
             results = Results(lambda _: downloader.stop())
 
         urls = []
+        keys = []
         for request_id in requestIDs:
             u = self._request_status(request_id)
 
@@ -436,6 +475,11 @@ class JSOCClient(object):
                     if overwrite or not is_file:
                         url_dir = BASE_DL_URL + u.json()['dir'] + '/'
                         urls.append(urllib.parse.urljoin(url_dir, ar['filename']))
+                        # The export record gives no size or checksum for
+                        # the file, so the key includes the request which
+                        # produced it.
+                        keys.append('jsoc:{0}/{1}'.format(request_id,
+                                                          ar['filename']))
 
                     else:
                         print_message = "Skipping download of file {} as it " \
@@ -454,9 +498,10 @@ class JSOCClient(object):
                     self.check_request(request_id)
 
         if urls:
-            for url in urls:
+            for url, key in zip(urls, keys):
                 downloader.download(url, callback=results.require([url]),
-                                    errback=lambda x: print(x), path=path)
+                                    errback=lambda x: print(x), path=path,
+                                    key=key)
 
         else:
             # Make Results think it has finished.
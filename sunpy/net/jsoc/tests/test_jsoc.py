@@ -15,6 +15,7 @@ import pytest
 from sunpy.time import parse_time
 from sunpy.net.jsoc import JSOCClient, JSOCResponse
 from sunpy.net.download import Results
+from sunpy.net.cache import QueryCache
 import sunpy.net.jsoc.attrs as attrs
 import sunpy.net.vso.attrs as vso_attrs
 
@@ -266,6 +267,34 @@ def test_get_request():
     assert isinstance(aa, Results)
 
 
+def test_get_request_cache_keys(tmpdir, monkeypatch):
+    class Status(object):
+        status_code = 200
+
+        def __init__(self, request_id):
+            self.request_id = request_id
+
+        def json(self):
+            return {'status': '0', 'dir': '/SUM1/' + self.request_id,
+                    'size': 1, 'requestid': self.request_id,
+                    'data': [{'filename': 'hmi.M_45s.magnetogram.fits'}]}
+
+    class FakeDownloader(object):
+        def __init__(self):
+            self.keys = []
+
+        def download(self, url, key=None, **kwargs):
+            self.keys.append(key)
+
+    downloader = FakeDownloader()
+    monkeypatch.setattr(client, '_request_status', Status)
+    client.get_request(['JSOC_1', 'JSOC_2'], path=str(tmpdir),
+                       progress=False, downloader=downloader)
+    # Files with the same name from different requests are cached apart
+    assert downloader.keys == ['jsoc:JSOC_1/hmi.M_45s.magnetogram.fits',
+                               'jsoc:JSOC_2/hmi.M_45s.magnetogram.fits']
+
+
 @pytest.mark.online
 def test_results_filenames():
     responses = client.query(
@@ -284,3 +313,30 @@ def test_results_filenames():
 def test_invalid_query():
     with pytest.raises(ValueError):
         client.query(attrs.Time('2012/1/1T01:00:00', '2012/1/1T01:00:45'))
+
+
+def test_query_cache(tmpdir, monkeypatch):
+    lookups = []
+
+    def lookup_records(iargs):
+        lookups.append(iargs)
+        return astropy.table.Table({'T_OBS': ['2012.01.01_00:00:12_TAI'],
+                                    'WAVELNTH': [304]})
+
+    cached_client = JSOCClient(cache=QueryCache(str(tmpdir)))
+    monkeypatch.setattr(cached_client, '_lookup_records', lookup_records)
+    query = (attrs.Time('2012/1/1T00:00:00', '2012/1/1T00:00:45'),
+             attrs.Series('aia.lev1_euv_12s'), attrs.Wavelength(304*u.AA))
+    miss = cached_client.query(*query)
+    hit = cached_client.query(*query)
+    assert len(lookups) == 1
+    assert isinstance(hit, JSOCResponse)
+    assert all(hit.table == miss.table)
+    assert hit.table.colnames == miss.table.colnames
+    assert hit.query_args == miss.query_args
+
+    # Without a cache every query goes to the JSOC
+    monkeypatch.setattr(client, '_lookup_records', lookup_records)
+    client.query(*query)
+    client.query(*query)
+    assert len(lookups) == 3
@@ -0,0 +1,137 @@
+from __future__ import absolute_import
+
+import os
+import stat
+import time
+
+import pytest
+import astropy.units as u
+
+from sunpy.net import attr, attrs as a
+from sunpy.net.cache import DownloadCache, QueryCache, file_digest, query_key
+
+
+def make_file(tmpdir, name, data):
+    path = tmpdir.join(name)
+    path.write_binary(data)
+    return str(path)
+
+
+@pytest.fixture
+def cache(tmpdir):
+    return DownloadCache(str(tmpdir.join('cache')), max_size=250)
+
+
+def test_add_lookup(cache, tmpdir):
+    fname = make_file(tmpdir, 'a.fits', b'a' * 100)
+    entry = cache.add('http://example.com/a.fits', fname)
+    assert entry.name == 'a.fits'
+    assert entry.size == 100
+    assert entry.digest == file_digest(fname)
+    assert cache.lookup('http://example.com/a.fits') == entry
+    assert cache.lookup('http://example.com/b.fits') is None
+    assert cache.lookup('http://example.com/a.fits', checksum='0' * 64) is None
+    assert cache.lookup('http://example.com/a.fits',
+                        checksum=entry.digest) == entry
+    assert cache.lookup('http://example.com/a.fits', size=101) is None
+    assert cache.lookup('http://example.com/a.fits', size=100) == entry
+
+
+def test_content_addressed(cache, tmpdir):
+    cache.add('one', make_file(tmpdir, 'a.fits', b'a' * 100))
+    cache.add('two', make_file(tmpdir, 'b.fits', b'a' * 100))
+    assert len(cache) == 2
+    assert cache.size == 100
+    cache.remove('one')
+    assert 'one' not in cache
+    assert cache.lookup('two') is not None
+
+
+@pytest.mark.parametrize('link', ['hard', 'symlink', 'copy'])
+def test_materialize(tmpdir, link):
+    cache = DownloadCache(str(tmpdir.join('cache')), link=link)
+    fname = make_file(tmpdir, 'a.fits', b'a' * 100)
+    entry = cache.add('a', fname)
+    os.remove(fname)
+    target = str(tmpdir.join('other', 'a.fits'))
+    assert cache.materialize(entry, target) == target
+    with open(target, 'rb') as fd:
+        assert fd.read() == b'a' * 100
+    assert cache.materialize(entry, target) == target
+
+
+def test_lru_eviction(cache, tmpdir):
+    cache.add('a', make_file(tmpdir, 'a.fits', b'a' * 100))
+    cache.add('b', make_file(tmpdir, 'b.fits', b'b' * 100))
+    cache.lookup('a')
+    cache.add('c', make_file(tmpdir, 'c.fits', b'c' * 100))
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert 'c' in cache
+    assert cache.size == 200
+
+
+def test_changed_file_is_dropped(tmpdir):
+    cache = DownloadCache(str(tmpdir.join('cache')), link='hard')
+    fname = make_file(tmpdir, 'a.fits', b'a' * 100)
+    cache.add('a', fname)
+    # The cached file is a hard link to the download, which is read-only.
+    assert not os.stat(fname).st_mode & stat.S_IWUSR
+    os.chmod(fname, stat.S_IRUSR | stat.S_IWUSR)
+    with open(fname, 'r+b') as fd:
+        fd.write(b'b' * 100)
+    mtime = os.stat(fname).st_mtime + 10
+    os.utime(fname, (mtime, mtime))
+    assert cache.lookup('a') is None
+    assert 'a' not in cache
+
+
+def test_copied_download_is_independent(cache, tmpdir):
+    fname = make_file(tmpdir, 'a.fits', b'a' * 100)
+    entry = cache.add('a', fname)
+    with open(fname, 'r+b') as fd:
+        fd.write(b'b' * 100)
+    assert cache.lookup('a') == entry
+    target = cache.materialize(entry, str(tmpdir.join('other', 'a.fits')))
+    with open(target, 'rb') as fd:
+        assert fd.read() == b'a' * 100
+
+
+def test_query_key():
+    time = a.Time('2012/1/1', '2012/1/2')
+    query1 = attr.and_(time, a.Instrument('aia') | a.Instrument('eit'))
+    query2 = attr.and_(a.Instrument('eit') | a.Instrument('aia'), time)
+    assert query_key(query1) == query_key(query2)
+    assert query_key(query1) != query_key(query1, series='hmi.m_45s')
+    query3 = attr.and_(time, a.Instrument('aia'))
+    assert query_key(query1) != query_key(query3)
+    query4 = attr.and_(time, a.Wavelength(171 * u.AA))
+    assert query_key(query4) != query_key(query3)
+
+
+def test_query_cache(tmpdir):
+    cache = QueryCache(str(tmpdir), ttl={'vso': 100})
+    cache.set('vso', 'key', [1, 2, 3])
+    assert cache.get('vso', 'key') == [1, 2, 3]
+    assert cache.get('jsoc', 'key') is None
+    assert cache.get('vso', 'other') is None
+    cache.clear('vso')
+    assert len(cache) == 0
+
+
+def test_query_cache_ttl(tmpdir):
+    cache = QueryCache(str(tmpdir), ttl={'vso': 0})
+    cache.set('vso', 'key', [1, 2, 3])
+    cache.set('jsoc', 'key', [1, 2, 3])
+    time.sleep(0.01)
+    assert cache.get('vso', 'key') is None
+    assert cache.get('jsoc', 'key') == [1, 2, 3]
+
+
+def test_query_cache_eviction(tmpdir):
+    cache = QueryCache(str(tmpdir), max_size=2500)
+    for key in 'abc':
+        cache.set('vso', key, b'x' * 1000)
+    assert len(cache) == 2
+    assert cache.get('vso', 'a') is None
+    assert cache.size <= 2500
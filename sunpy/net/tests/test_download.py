@@ -15,7 +15,10 @@ from functools import partial
 
 import sunpy
 
+from sunpy.extern.six.moves import BaseHTTPServer, socketserver
+from sunpy.extern.six.moves.urllib.error import HTTPError
 from sunpy.net.download import Downloader, default_name
+from sunpy.net.cache import DownloadCache
 
 
 class CalledProxy(object):
@@ -160,3 +163,190 @@ def test_download_dir():
     assert not timeout.fired
     assert not errback.fired
     assert os.path.exists(os.path.join(tmpdir, 'jquery.min.js'))
+
+
+class RangeHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Serve the files of the server over keep-alive connections, supporting
+    Range requests. The first request for '/flaky' is cut off half-way."""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.headers.get('Range'),
+                                    self.client_address))
+            first = self.path not in server.seen
+            server.seen.add(self.path)
+        if self.path not in server.files:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        data = server.files[self.path]
+        start = 0
+        if self.headers.get('Range'):
+            start = int(self.headers['Range'][len('bytes='):-1])
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes {0}-{1}/{2}'.format(
+                start, len(data) - 1, len(data)))
+        else:
+            self.send_response(200)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(len(data) - start))
+        self.end_headers()
+        if self.path == '/flaky' and first:
+            self.wfile.write(data[:len(data) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(data[start:])
+
+    def log_message(self, *args):
+        pass
+
+
+class ThreadingServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingServer(('127.0.0.1', 0), RangeHandler)
+    httpd.files = dict(('/file{0}'.format(i), os.urandom(100000 + i))
+                       for i in range(5))
+    httpd.files['/flaky'] = os.urandom(100000)
+    httpd.requests = []
+    httpd.seen = set()
+    httpd.lock = threading.Lock()
+    httpd.url = 'http://127.0.0.1:{0}'.format(httpd.server_address[1])
+    th = threading.Thread(target=httpd.serve_forever)
+    th.daemon = True
+    th.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def download_all(dw, urls, path):
+    results = []
+    errors = []
+    done = threading.Event()
+
+    def finished(lst, item):
+        lst.append(item)
+        if len(results) + len(errors) == len(urls):
+            done.set()
+
+    for url in urls:
+        dw.download(url, path, partial(finished, results),
+                    partial(finished, errors))
+    assert done.wait(30)
+    return results, errors
+
+
+def test_download_keep_alive(server, tmpdir):
+    dw = Downloader(max_conn=2, max_total=2, backoff=0)
+    urls = [server.url + name for name in sorted(server.files) if name != '/flaky']
+    results, errors = download_all(dw, urls, str(tmpdir))
+    assert not errors
+    assert len(results) == 5
+    for name in urls:
+        name = name.rsplit('/', 1)[-1]
+        with open(str(tmpdir.join(name)), 'rb') as fd:
+            assert fd.read() == server.files['/' + name]
+    assert not tmpdir.listdir('*.part')
+    # the files are transferred over at most two persistent connections
+    assert len(set(address for _, _, address in server.requests)) <= 2
+
+
+def test_download_resume(server, tmpdir):
+    dw = Downloader(max_conn=1, max_total=1, backoff=0)
+    results, errors = download_all(dw, [server.url + '/flaky'], str(tmpdir))
+    assert not errors
+    assert results == [{'path': str(tmpdir.join('flaky'))}]
+    with open(results[0]['path'], 'rb') as fd:
+        assert fd.read() == server.files['/flaky']
+    ranges = [rng for path, rng, _ in server.requests]
+    assert ranges == [None, 'bytes=50000-']
+
+
+def test_download_resume_part_files(server, tmpdir):
+    # Partial files left by an earlier run are resumed one after the other by
+    # the same worker, without retries
+    names = ['/file0', '/file1']
+    for name in names:
+        with open(str(tmpdir.join(name[1:] + '.part')), 'wb') as fd:
+            fd.write(server.files[name][:50000])
+    dw = Downloader(max_conn=1, max_total=1, max_retries=0, backoff=0)
+    results, errors = download_all(dw, [server.url + name for name in names],
+                                   str(tmpdir))
+    assert not errors
+    for name in names:
+        with open(str(tmpdir.join(name[1:])), 'rb') as fd:
+            assert fd.read() == server.files[name]
+    ranges = [rng for path, rng, _ in server.requests]
+    assert ranges == [None, 'bytes=50000-', None, 'bytes=50000-']
+
+
+def test_download_not_found(server, tmpdir):
+    dw = Downloader(max_conn=1, max_total=1, backoff=0)
+    results, errors = download_all(dw, [server.url + '/missing'], str(tmpdir))
+    assert not results
+    assert len(errors) == 1
+    assert isinstance(errors[0], HTTPError)
+    assert errors[0].code == 404
+    # client errors are not retried
+    assert len(server.requests) == 1
+
+
+def test_download_cache(server, tmpdir):
+    cache = DownloadCache(str(tmpdir.join('cache')))
+    urls = [server.url + name for name in sorted(server.files) if name != '/flaky']
+    dw = Downloader(max_conn=2, max_total=2, backoff=0, cache=cache)
+    results, errors = download_all(dw, urls, str(tmpdir.join('first')))
+    assert not errors
+    assert len(server.requests) == 5
+    assert len(cache) == 5
+
+    # A second run into another directory is served from the cache.
+    dw = Downloader(max_conn=2, max_total=2, backoff=0, cache=cache)
+    results, errors = download_all(dw, urls, str(tmpdir.join('second')))
+    assert not errors
+    assert len(server.requests) == 5
+    for name in urls:
+        name = name.rsplit('/', 1)[-1]
+        with open(str(tmpdir.join('second', name)), 'rb') as fd:
+            assert fd.read() == server.files['/' + name]
+
+
+def test_download_cache_key(server, tmpdir):
+    cache = DownloadCache(str(tmpdir.join('cache')))
+    dw = Downloader(max_conn=1, max_total=1, backoff=0, cache=cache)
+    done = threading.Event()
+    results = []
+
+    def finished(item):
+        results.append(item)
+        if len(results) == 2:
+            done.set()
+
+    dw.download(server.url + '/file0', str(tmpdir), finished, key='id')
+    # Another URL with the same key is not downloaded.
+    dw.download(server.url + '/file1', str(tmpdir), finished, key='id')
+    assert done.wait(30)
+    assert len(server.requests) == 1
+    with open(str(tmpdir.join('file1')), 'rb') as fd:
+        assert fd.read() == server.files['/file0']
+
+
+def test_download_cache_size(server, tmpdir):
+    cache = DownloadCache(str(tmpdir.join('cache')))
+    dw = Downloader(max_conn=1, max_total=1, backoff=0, cache=cache)
+    size = len(server.files['/file0'])
+    results, errors = download_all(dw, [server.url + '/file0'], str(tmpdir))
+    assert not errors
+    done = threading.Event()
+    # A cached file of another size than the one asked for is downloaded again
+    dw.download(server.url + '/file0', str(tmpdir), lambda item: done.set(),
+                size=size + 1)
+    assert done.wait(30)
+    assert len(server.requests) == 2
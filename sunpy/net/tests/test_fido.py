@@ -1,5 +1,6 @@
 import os
 import copy
+import time
 import tempfile
 
 import pytest
@@ -10,7 +11,8 @@ import astropy.units as u
 
 from sunpy.net import attr
 from sunpy.net import Fido, attrs as a
-from sunpy.net.fido_factory import DownloadResponse, UnifiedResponse
+from sunpy.net.fido_factory import (DownloadResponse, UnifiedResponse,
+                                    UnifiedDownloaderFactory)
 from sunpy.net.dataretriever.client import CLIENTS, QueryResponse
 from sunpy.util.datatype_factory_base import NoMatchError, MultipleMatchError
 from sunpy.time import TimeRange, parse_time
@@ -194,3 +196,54 @@ def test_repr():
     rep = rep.split('\n')
     # 6 header lines, the results table and a blank line at the end
     assert len(rep) == 6 + len(list(results.responses)[0]) + 1
+
+
+class SleepClient(object):
+    """Dummy client which answers a query for its instrument after a delay."""
+    instrument = None
+    delay = 0.5
+
+    def query(self, *query):
+        time.sleep(self.delay)
+        return QueryResponse([])
+
+    @classmethod
+    def _can_handle_query(cls, *query):
+        return any(isinstance(x, a.Instrument) and x.value == cls.instrument
+                   for x in query)
+
+
+class SlowClient(SleepClient):
+    instrument = 'slow'
+
+
+class FastClient(SleepClient):
+    instrument = 'fast'
+    delay = 0
+
+
+@pytest.fixture
+def sleep_fido():
+    return UnifiedDownloaderFactory(
+        registry={SlowClient: SlowClient._can_handle_query,
+                  FastClient: FastClient._can_handle_query},
+        additional_validation_functions=['_can_handle_query'])
+
+
+def test_concurrent_search(sleep_fido):
+    start = time.time()
+    results = sleep_fido.search(a.Time("2012/1/1", "2012/1/2"),
+                                a.Instrument('slow') | a.Instrument('slow') |
+                                a.Instrument('fast'))
+    # The slow queries run at the same time
+    assert time.time() - start < 2 * SlowClient.delay
+    assert [type(block.client) for block in results.responses] == [
+        SlowClient, SlowClient, FastClient]
+
+
+def test_search_timeout(sleep_fido):
+    with pytest.warns(UserWarning):
+        results = sleep_fido.search(a.Time("2012/1/1", "2012/1/2"),
+                                    a.Instrument('slow') | a.Instrument('fast'),
+                                    timeout={'SlowClient': 0.1})
+    assert [type(block.client) for block in results.responses] == [FastClient]
@@ -8,9 +8,11 @@ from __future__ import absolute_import
 import datetime
 import pytest
 from astropy import units as u
+from suds.sudsobject import Factory
 
 from sunpy.time import TimeRange
 from sunpy.net import vso
+from sunpy.net.cache import QueryCache
 from sunpy.net.vso import attrs as va
 from sunpy.net.vso.vso import QueryResponse
 from sunpy.net import attr
@@ -207,3 +209,50 @@ def test_str():
 def test_repr():
     qr = QueryResponse([])
     assert "Start Time End Time  Source Instrument   Type" in repr(qr)
+
+
+class MockAPI(object):
+    """ Stand-in for the suds client of the VSO API, which answers every
+    query with the same response and counts the queries. """
+    def __init__(self, response):
+        self.factory = self
+        self.service = self
+        self.response = response
+        self.queries = 0
+
+    def create(self, atype):
+        return Factory.object(atype)
+
+    def Query(self, request):
+        self.queries += 1
+        return self.response
+
+
+def test_query_cache(tmpdir, monkeypatch):
+    record = Factory.object('QueryRecordItem', dict(
+        provider='SDAC', fileid='/archive/efz20100101.000008', size=2059.0,
+        time=Factory.object('Time', dict(start='20100101000008',
+                                         end='20100101000020'))))
+    provider = Factory.object('ProviderQueryResponse', dict(
+        provider='SDAC', no_of_records_found=1, no_of_records_returned=1,
+        record=Factory.object('Record', dict(recorditem=[record]))))
+    api = MockAPI(Factory.object('QueryResponse',
+                                 dict(provideritem=[provider])))
+    monkeypatch.setattr(va.walker, 'create', lambda query, api: [{}])
+    client = vso.VSOClient(api=api, cache=QueryCache(str(tmpdir)))
+
+    query = va.Time('2010/1/1', '2010/1/1 01:00'), va.Instrument('eit')
+    miss = client.query(*query)
+    hit = client.query(*query)
+    assert api.queries == 1
+    assert len(miss) == len(hit) == 1
+    assert repr(list(miss)) == repr(list(hit))
+    assert repr(miss.queryresult) == repr(hit.queryresult)
+    assert hit[0].fileid == record.fileid
+    assert hit.time_range() == miss.time_range()
+
+    # Without a cache every query goes to the VSO
+    client = vso.VSOClient(api=api)
+    client.query(*query)
+    client.query(*query)
+    assert api.queries == 3
@@ -20,7 +20,7 @@ import threading
 from datetime import datetime, timedelta
 from functools import partial
 from collections import defaultdict
-from suds import client, TypeNotFound
+from suds import client, sudsobject, TypeNotFound
 
 import astropy
 from astropy.table import Table, Column
@@ -28,6 +28,7 @@ import astropy.units as u
 
 from sunpy import config
 from sunpy.net import download
+from sunpy.net.cache import as_cache, get_default_query_cache, query_key
 from sunpy.net.proxyfix import WellBehavedHttpTransport
 from sunpy.util.progressbar import TTYProgressBar as ProgressBar
 from sunpy.util.net import get_filename, slugify
@@ -90,6 +91,37 @@ def iter_records(response):
             yield record_item
 
 
+class _Record(object):
+    """ Copy of a suds object made of plain Python objects, which can be
+    pickled. Like a suds object, iterating over it yields the (name, value)
+    pairs of its attributes. """
+    def __init__(self, items):
+        self.__keylist__ = []
+        for key, value in items:
+            self.__keylist__.append(key)
+            setattr(self, key, value)
+
+    def __iter__(self):
+        for key in self.__keylist__:
+            yield key, getattr(self, key)
+
+    def __repr__(self):
+        return '({0}){{{1}}}'.format(
+            self.__class__.__name__,
+            ', '.join('{0}={1!r}'.format(key, value) for key, value in self))
+
+
+def _plain(value):
+    """ Convert suds objects in value to `_Record` objects. """
+    if isinstance(value, sudsobject.Object):
+        return _Record((key, _plain(item)) for key, item in value)
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    if isinstance(value, text_type):
+        return text_type(value)
+    return value
+
+
 def iter_errors(response):
     for prov_item in response.provideritem:
         if not hasattr(prov_item, 'record') or not prov_item.record:
@@ -217,16 +249,33 @@ class VSOClient(object):
         'URL-TAR_GZ', 'URL-ZIP', 'URL-TAR', 'URL-FILE', 'URL-packaged'
     ]
 
-    def __init__(self, url=None, port=None, api=None):
-        if api is None:
-            if url is None:
-                url = DEFAULT_URL
-            if port is None:
-                port = DEFAULT_PORT
-
-            api = client.Client(url, transport=WellBehavedHttpTransport())
-            api.set_options(port=port)
-        self.api = api
+    def __init__(self, url=None, port=None, api=None, cache=False):
+        """
+        url : location of the VSO WSDL.
+        port : the port of the VSO API to use.
+        api : a suds client to use instead of one created from url and port.
+        cache : the `sunpy.net.cache.QueryCache` for the query results. `True`
+            selects the cache configured in the SunPy configuration, `False`
+            (the default) disables caching.
+        """
+        self._url = DEFAULT_URL if url is None else url
+        self._port = DEFAULT_PORT if port is None else port
+        self._api = api
+        self.cache = cache
+
+    @property
+    def api(self):
+        """ The suds client of the VSO API. It is created on first use, so
+        that queries answered from the cache do not fetch the WSDL. """
+        if self._api is None:
+            api = client.Client(self._url, transport=WellBehavedHttpTransport())
+            api.set_options(port=self._port)
+            self._api = api
+        return self._api
+
+    @api.setter
+    def api(self, api):
+        self._api = api
 
     def make(self, atype, **kwargs):
         """ Create new SOAP object with attributes specified in kwargs.
@@ -281,10 +330,25 @@ class VSOClient(object):
         -------
         out : :py:class:`QueryResult` (enhanced list) of matched items. Return
         value of same type as the one of :py:meth:`VSOClient.query`.
+
+        Notes
+        -----
+        If the client was created with a query cache, the records of a query
+        are kept in it, and the same query is answered from it until the
+        cached records expire. The records are then plain Python objects
+        rather than suds objects, whether they come from the cache or not.
         """
         query = and_(*query)
 
+        cache = as_cache(self.cache, get_default_query_cache)
+        if cache is not None:
+            key = query_key(query, url=self._url, port=self._port)
+            queryresult = cache.get('vso', key)
+            if queryresult is not None:
+                return QueryResponse.create(queryresult)
+
         responses = []
+        failed = False
         for block in walker.create(query, self.api):
             try:
                 responses.append(
@@ -295,10 +359,19 @@ class VSOClient(object):
             except TypeNotFound:
                 pass
             except Exception as ex:
+                failed = True
                 response = QueryResponse.create(self.merge(responses))
                 response.add_error(ex)
 
-        return QueryResponse.create(self.merge(responses))
+        queryresult = self.merge(responses)
+        if cache is not None:
+            # Answer with what the cache keeps, so that a response does not
+            # depend on whether it was taken from the cache.
+            queryresult = _plain(queryresult)
+            # Incomplete results are not cached.
+            if not failed:
+                cache.set('vso', key, queryresult)
+        return QueryResponse.create(queryresult)
 
     def merge(self, queryresponses):
         """ Merge responses into one. """
@@ -720,8 +793,14 @@ class VSOClient(object):
     def download(self, method, url, dw, callback, errback, *args):
         """ Override to costumize download action. """
         if method.startswith('URL'):
+            # The same file is available from different URLs, so it is
+            # cached under its provider, file ID, size and download method.
+            record = args[1]
+            key = 'vso:{0}:{1}:{2}:{3}'.format(record.provider, record.fileid,
+                                               getattr(record, 'size', None),
+                                               method)
             return dw.download(url, partial(self.mk_filename, *args),
-                        callback, errback
+                        callback, errback, key=key
             )
         raise NoData
 
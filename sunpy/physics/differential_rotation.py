@@ -1,15 +1,23 @@
 from __future__ import division
 
+import warnings
+from datetime import timedelta
+
 import numpy as np
+from scipy.ndimage.interpolation import map_coordinates
 from astropy import units as u
 from astropy.coordinates import Longitude, Latitude, Angle
+from astropy.time import Time
 from sunpy.time import parse_time, julian_day
 
 from sunpy.wcs import convert_hpc_hg, convert_hg_hpc
+from sunpy.wcs.wcs import _hpc_to_hcc, _hcc_to_hg, _hg_to_hcc, _hcc_to_hpc
 from sunpy.sun import constants, sun
+from sunpy.image.transform import _tile_halo
 
 __author__ = ["Jose Ivan Campos Rozo", "Stuart Mumford", "Jack Ireland"]
-__all__ = ['diff_rot', 'rot_hpc']
+__all__ = ['diff_rot', 'rot_hpc', 'differential_rotation_coordinates',
+           'differential_rotate']
 
 
 @u.quantity_input(duration=u.s, latitude=u.degree)
@@ -111,10 +119,12 @@ def rot_hpc(x, y, tstart, tend, frame_time='synodic', rot_type='howard', **kwarg
         Helio-projective y-co-ordinate in arcseconds (can be an array).
 
     tstart : `sunpy.time.time`
-        date/time to which x and y are referred.
+        date/time to which x and y are referred (can be a list or array of
+        times).
 
     tend : `sunpy.time.time`
-    date/time at which x and y will be rotated to.
+        date/time at which x and y will be rotated to (can be a list or array
+        of times).
 
     rot_type : {'howard' | 'snodgrass' | 'allen'}
         | howard: Use values for small magnetic features from Howard et al.
@@ -142,6 +152,10 @@ def rot_hpc(x, y, tstart, tend, frame_time='synodic', rot_type='howard', **kwarg
 
     Notes
     -----
+    Arrays of times are broadcast against the arrays of co-ordinates, so that
+    many points, each with its own start and end time, are rotated in a single
+    call.  The solar ephemeris is then calculated for all the times at once.
+
     SSWIDL code equivalent: http://hesperia.gsfc.nasa.gov/ssw/gen/idl/solar/rot_xy.pro .
     The function rot_xy uses arcmin2hel.pro and hel2arcmin.pro to implement the
     same functionality as this function.  These two functions seem to perform
@@ -161,12 +175,14 @@ def rot_hpc(x, y, tstart, tend, frame_time='synodic', rot_type='howard', **kwarg
     # Make sure we have enough time information to perform a solar differential
     # rotation
     # Start time
-    dstart = parse_time(tstart)
-    dend = parse_time(tend)
-    interval = (dend - dstart).total_seconds() * u.s
+    dstart = _parse_times(tstart)
+    dend = _parse_times(tend)
+    # The whole days and the fractions of days are differenced separately so
+    # that no precision is lost to the size of the Julian day.
+    interval = ((dend.jd1 - dstart.jd1) + (dend.jd2 - dstart.jd2)) * 86400.0 * u.s
 
     # Get the Sun's position from the vantage point at the start time
-    vstart = kwargs.get("vstart", _calc_P_B0_SD(dstart))
+    vstart = kwargs["vstart"] if "vstart" in kwargs else _calc_P_B0_SD(dstart)
     # Compute heliographic co-ordinates - returns (longitude, latitude). Points
     # off the limb are returned as nan
     longitude, latitude = convert_hpc_hg(x.to(u.arcsec).value,
@@ -182,7 +198,7 @@ def rot_hpc(x, y, tstart, tend, frame_time='synodic', rot_type='howard', **kwarg
                     rot_type=rot_type)
 
     # Convert back to heliocentric cartesian in units of arcseconds
-    vend = kwargs.get("vend", _calc_P_B0_SD(dend))
+    vend = kwargs["vend"] if "vend" in kwargs else _calc_P_B0_SD(dend)
 
     # It appears that there is a difference in how the SSWIDL function
     # hel2arcmin and the sunpy function below performs this co-ordinate
@@ -198,6 +214,13 @@ def rot_hpc(x, y, tstart, tend, frame_time='synodic', rot_type='howard', **kwarg
     return newx.to(u.arcsec), newy.to(u.arcsec)
 
 
+def _parse_times(t):
+    """
+    Return an `~astropy.time.Time` for a time, or for a list or array of times.
+    """
+    return t if isinstance(t, Time) else Time(parse_time(t))
+
+
 def _calc_P_B0_SD(date):
     """
     To calculate the solar P, B0 angles and the semi-diameter as seen from
@@ -209,7 +232,8 @@ def _calc_P_B0_SD(date):
     -----------
     date : `sunpy.time.time`
         the time at which to calculate the solar P, B0 angles and the
-        semi-diameter.
+        semi-diameter.  Can also be a list or array of times, in which case
+        each quantity is an array.
 
     Returns
     -------
@@ -225,10 +249,11 @@ def _calc_P_B0_SD(date):
         http://hesperia.gsfc.nasa.gov/ssw/gen/idl/solar/pb0r.pro
     """
     # number of Julian days since 2415020.0
-    de = julian_day(parse_time(date)) - 2415020.0
+    jd = julian_day(date)
+    de = jd - 2415020.0
 
     # get the longitude of the sun etc.
-    sun_position = _sun_pos(date)
+    sun_position = _sun_pos(Time(jd, format='jd'))
     longmed = sun_position["longitude"].to(u.deg).value
     #ra = sun_position["ra"]
     #dec = sun_position["dec"]
@@ -276,7 +301,7 @@ def _calc_P_B0_SD(date):
     return {"p": Angle(p, u.deg),
             "b0": Angle(b, u.deg),
             "sd": Angle(sd.value, u.arcmin),
-            "l0": Angle(0.0, u.deg)}
+            "l0": Angle(np.zeros_like(b), u.deg)}
 
 
 def _sun_pos(date):
@@ -294,7 +319,8 @@ def _sun_pos(date):
     -----------
     date : `sunpy.time.time`
         Time at which the solar ephemeris parameters are calculated.  The
-        input time can be in any acceptable time format.
+        input time can be in any acceptable time format, or be a list or
+        array of times, in which case each parameter is an array.
 
     Returns
     -------
@@ -401,3 +427,261 @@ def _sun_pos(date):
             "app_long": Longitude(l, u.deg),
             "obliq": Angle(oblt, u.deg)}
 
+
+def _target_time(smap, time, dt):
+    """
+    The time a map is to be rotated to, given either that time or the time
+    delta from the observation time of the map.
+    """
+    if (time is None) == (dt is None):
+        raise ValueError('Exactly one of time and dt must be given.')
+    if time is None:
+        return smap.date + timedelta(seconds=dt.to(u.s).value)
+    return parse_time(time)
+
+
+def _earth_view(date):
+    """
+    B0 and L0 in radians, and the Sun-Earth distance in meters, at a time, as
+    used by `rot_hpc`.
+    """
+    view = _calc_P_B0_SD(date)
+    return (view["b0"].to(u.rad).value, view["l0"].to(u.rad).value,
+            (constants.au * sun.sunearth_distance(t=date)).value)
+
+
+def _tiles(shape, tile_shape):
+    """The (rows, columns) slices of the tiles that cover an array."""
+    tile_shape = np.zeros(2, dtype=int) + (512 if tile_shape is None else tile_shape)
+    return [(slice(row, min(row + tile_shape[0], shape[0])),
+             slice(col, min(col + tile_shape[1], shape[1])))
+            for row in range(0, shape[0], tile_shape[0])
+            for col in range(0, shape[1], tile_shape[1])]
+
+
+def _source_pixels(smap, rows, cols, interval, start, end, rot_type, frame_time):
+    """
+    Array coordinates (y, x) in ``smap`` of the points on the Sun seen in the
+    pixels ``[rows, cols]`` after the Sun has rotated for ``interval``.
+
+    ``start`` and ``end`` are the views of the Sun, as returned by
+    `_earth_view`, at the observation time of the map and ``interval`` later.
+    Pixels off the disk keep their own co-ordinates.  Pixels showing points
+    that were on the far side of the Sun at the observation time are NaN.
+    """
+    y, x = np.mgrid[rows, cols].astype(np.float64)
+    hpcx, hpcy = smap.pixel_to_data(x * u.pix, y * u.pix)
+    hpcx = hpcx.to(u.rad).value
+    hpcy = hpcy.to(u.rad).value
+
+    # Rotate back from the end view to the start view
+    hccx, hccy, hccz = _hpc_to_hcc(hpcx, hpcy, end[2])
+    longitude, latitude, _ = _hcc_to_hg(hccx, hccy, hccz, end[0], end[1])
+    on_disk = np.isfinite(latitude)
+    latitude[~on_disk] = 0
+    drot = diff_rot(interval, latitude * u.rad, rot_type=rot_type,
+                    frame_time=frame_time)
+    longitude -= drot.to(u.rad).value
+    hccx, hccy, hccz = _hg_to_hcc(longitude, latitude, start[0], start[1])
+    hpcx[on_disk], hpcy[on_disk] = [c[on_disk] for c in
+                                    _hcc_to_hpc(hccx, hccy, start[2], z=hccz)]
+
+    sourcex, sourcey = smap.data_to_pixel(hpcx * u.rad, hpcy * u.rad)
+    sources = np.array([sourcey.value, sourcex.value])
+    sources[:, ~on_disk] = y[~on_disk], x[~on_disk]
+    sources[:, on_disk & (hccz < 0)] = np.nan
+    return sources
+
+
+def differential_rotation_coordinates(smap, time=None, dt=None,
+                                      rot_type='howard', frame_time='synodic',
+                                      tile_shape=None, out=None,
+                                      max_workers=None):
+    """
+    Calculate, for every pixel of a map, where the feature seen in that pixel
+    after solar differential rotation was at the observation time of the map.
+
+    The result can be passed to `differential_rotate` through its
+    ``coordinates`` argument, and reused for every map with the same shape
+    and coordinate meta data that is rotated by the same time delta.  The
+    solar ephemeris used is that of the observation time of ``smap``, so the
+    co-ordinates are accurate for maps observed close to that time.
+
+    Parameters
+    ----------
+    smap : `~sunpy.map.GenericMap`
+        The map, observed from the Earth.
+    time : `sunpy.time.time`
+        The time to rotate the map to.
+    dt : `~astropy.units.Quantity`
+        The time delta to rotate the map by, instead of ``time``.
+    rot_type : {'howard' | 'snodgrass' | 'allen'}
+        The rotation profile, see `diff_rot`.
+    frame_time : {'sidereal' | 'synodic'}
+        The type of day, see `diff_rot`.
+    tile_shape : int or tuple
+        The co-ordinates are calculated in tiles of this shape.  Default: 512.
+    out : `~numpy.ndarray`
+        An array of shape ``(2,) + smap.data.shape``, for example a
+        `numpy.memmap`, to write the co-ordinates into.
+    max_workers : int
+        The number of threads the tiles are spread across.
+
+    Returns
+    -------
+    coordinates : `~numpy.ndarray`
+        A float32 array of shape ``(2,) + smap.data.shape``.  ``coordinates[:,
+        j, i]`` are the array indices (y, x) in ``smap`` from which pixel
+        ``(j, i)`` is taken.  Pixels off the disk map onto themselves, and
+        pixels showing points that were hidden behind the limb are NaN.
+    """
+    end_time = _target_time(smap, time, dt)
+    interval = (end_time - smap.date).total_seconds() * u.s
+    start = _earth_view(smap.date)
+    end = _earth_view(end_time)
+
+    shape = (2,) + smap.data.shape
+    if out is None:
+        out = np.empty(shape, dtype=np.float32)
+    elif out.shape != shape:
+        raise ValueError("out has shape {0}, the co-ordinates are {1}".format(out.shape,
+                                                                            shape))
+
+    def coordinates_tile(tile):
+        rows, cols = tile
+        out[:, rows, cols] = _source_pixels(smap, rows, cols, interval, start,
+                                            end, rot_type, frame_time)
+
+    tiles = _tiles(smap.data.shape, tile_shape)
+    if max_workers is None or max_workers <= 1:
+        for tile in tiles:
+            coordinates_tile(tile)
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(coordinates_tile, tiles))
+    return out
+
+
+def differential_rotate(smap, time=None, dt=None, rot_type='howard',
+                        frame_time='synodic', order=3, missing=np.nan,
+                        coordinates=None, tile_shape=None, out=None,
+                        max_workers=None):
+    """
+    Warp a map to a different time by the solar differential rotation of each
+    of its pixels.
+
+    Every output pixel is interpolated from the place in the map where the
+    feature it shows was at the observation time of the map.  The output is
+    computed in tiles, each from only the part of the map it needs, so the
+    memory needed beyond the input and output arrays is proportional to the
+    tile size.
+
+    Parameters
+    ----------
+    smap : `~sunpy.map.GenericMap`
+        The map, observed from the Earth.
+    time : `sunpy.time.time`
+        The time to rotate the map to.
+    dt : `~astropy.units.Quantity`
+        The time delta to rotate the map by, instead of ``time``.
+    rot_type : {'howard' | 'snodgrass' | 'allen'}
+        The rotation profile, see `diff_rot`.
+    frame_time : {'sidereal' | 'synodic'}
+        The type of day, see `diff_rot`.
+    order : int 0-5
+        The order of the spline interpolation.  Default: 3.
+    missing : float
+        The value of pixels showing points that were behind the limb at the
+        observation time of the map, or outside of the map.  Default: NaN.
+    coordinates : `~numpy.ndarray`
+        The co-ordinates returned by `differential_rotation_coordinates` for
+        a map with the same geometry and the same time delta.  If not given,
+        they are calculated for each tile and not kept.
+    tile_shape : int or tuple
+        The shape of the output tiles.  Default: 512.
+    out : `~numpy.ndarray`
+        An array of the shape of the map data, for example a `numpy.memmap`,
+        to write the output into.
+    max_workers : int
+        The number of threads the tiles are spread across.
+
+    Returns
+    -------
+    out : `~sunpy.map.GenericMap`
+        The warped map, with its observation time changed.  Pixels off the
+        disk are unchanged.
+
+    Notes
+    -----
+    The solar P, B0 angles and distance are calculated as for an observer on
+    the Earth, as in `rot_hpc`.  For interpolation of order 2 or more, NaNs in
+    the map data are set to zero.
+
+    Examples
+    --------
+    >>> import astropy.units as u
+    >>> from sunpy.physics.differential_rotation import differential_rotate
+    >>> later = differential_rotate(aia_map, dt=6 * u.hour)   # doctest: +SKIP
+    """
+    end_time = _target_time(smap, time, dt)
+    shape = smap.data.shape
+    if coordinates is None:
+        interval = (end_time - smap.date).total_seconds() * u.s
+        start = _earth_view(smap.date)
+        end = _earth_view(end_time)
+    elif coordinates.shape != (2,) + shape:
+        raise ValueError("The coordinates have shape {0}, "
+                         "the map is {1}".format(coordinates.shape, shape))
+    if out is None:
+        out = np.empty(shape)
+    elif out.shape != shape:
+        raise ValueError("out has shape {0}, the map is {1}".format(out.shape, shape))
+    halo = _tile_halo(order)
+
+    def rotate_tile(tile):
+        rows, cols = tile
+        if coordinates is None:
+            sources = _source_pixels(smap, rows, cols, interval, start, end,
+                                     rot_type, frame_time)
+        else:
+            sources = np.array(coordinates[:, rows, cols], dtype=np.float64)
+
+        # The region of the map the tile is taken from
+        valid = np.isfinite(sources).all(axis=0)
+        if not valid.any():
+            out[rows, cols] = missing
+            return False
+        lower = np.maximum(np.floor(sources[:, valid].min(axis=1)).astype(int) - halo, 0)
+        upper = np.minimum(np.ceil(sources[:, valid].max(axis=1)).astype(int) + halo + 1,
+                           shape)
+        if np.any(upper <= lower):
+            out[rows, cols] = missing
+            return False
+
+        block = np.array(smap.data[lower[0]:upper[0], lower[1]:upper[1]],
+                         dtype=np.float64)
+        has_nan = order >= 2 and bool(np.isnan(block).any())
+        if has_nan:
+            block = np.nan_to_num(block)
+        sources -= lower[:, np.newaxis, np.newaxis]
+        sources[:, ~valid] = -1
+        result = map_coordinates(block, sources, order=order, mode='constant',
+                                 cval=missing)
+        result[~valid] = missing
+        out[rows, cols] = result
+        return has_nan
+
+    tiles = _tiles(shape, tile_shape)
+    if max_workers is None or max_workers <= 1:
+        nans = [rotate_tile(tile) for tile in tiles]
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            nans = list(pool.map(rotate_tile, tiles))
+    if any(nans):
+        warnings.warn("Setting NaNs to 0 for differential rotation", RuntimeWarning)
+
+    new_meta = smap.meta.copy()
+    new_meta['date-obs'] = end_time.isoformat()
+    return smap._new_instance(out, new_meta, plot_settings=smap.plot_settings)
@@ -3,7 +3,6 @@ This module provides routines for applying solar rotation functions to
 mapcubes.
 """
 
-import numpy as np
 import astropy.units as u
 
 # SunPy imports
@@ -51,26 +50,18 @@ def calculate_solar_rotate_shift(mc, layer_index=0, **kwargs):
         The shifts are given in helioprojective co-ordinates.
 
     """
-    # Size of the data
-    nt = len(mc.maps)
-
-    # Storage for the shifts in arcseconds
-    xshift_arcseconds = np.zeros((nt)) * u.arcsec
-    yshift_arcseconds = np.zeros_like(xshift_arcseconds)
-
-    # Calculate the rotations and the shifts
-    for i, m in enumerate(mc):
-        # Calculate the rotation of the center of the map 'm' at its
-        # observation time to the observation time of the reference layer
-        # indicated by "layer_index".
-        newx, newy = rot_hpc(m.center.x,
-                             m.center.y,
-                             m.date,
-                             mc.maps[layer_index].date, **kwargs)
-
-        # Calculate the shift in arcseconds
-        xshift_arcseconds[i] = newx - mc.maps[layer_index].center.x
-        yshift_arcseconds[i] = newy - mc.maps[layer_index].center.y
+    # Rotate the centers of all the maps from their observation times to the
+    # observation time of the reference layer indicated by "layer_index" in a
+    # single call.
+    reference = mc.maps[layer_index]
+    newx, newy = rot_hpc(u.Quantity([m.center.x for m in mc.maps]),
+                         u.Quantity([m.center.y for m in mc.maps]),
+                         [m.date for m in mc.maps],
+                         reference.date, **kwargs)
+
+    # Calculate the shift in arcseconds
+    xshift_arcseconds = u.Quantity(newx - reference.center.x, u.arcsec)
+    yshift_arcseconds = u.Quantity(newy - reference.center.y, u.arcsec)
 
     return {"x": xshift_arcseconds, "y": yshift_arcseconds}
 
@@ -121,13 +112,6 @@ def mapcube_solar_derotate(mc, layer_index=0, clip=True, shift=None, **kwargs):
     >>> derotated_mc = mapcube_solar_derotate(mc, clip=False)
     """
 
-    # Size of the data
-    nt = len(mc.maps)
-
-    # Storage for the pixel shifts and the shifts in arcseconds
-    xshift_keep = np.zeros((nt)) * u.pix
-    yshift_keep = np.zeros_like(xshift_keep)
-
     # If no shifts are passed in, calculate them.  Otherwise,
     # use the shifts passed in.
     if shift is None:
@@ -136,9 +120,8 @@ def mapcube_solar_derotate(mc, layer_index=0, clip=True, shift=None, **kwargs):
     yshift_arcseconds = shift['y']
 
     # Calculate the pixel shifts
-    for i, m in enumerate(mc):
-        xshift_keep[i] = xshift_arcseconds[i] / m.scale.x
-        yshift_keep[i] = yshift_arcseconds[i] / m.scale.y
+    xshift_keep = xshift_arcseconds / u.Quantity([m.scale.x for m in mc.maps])
+    yshift_keep = yshift_arcseconds / u.Quantity([m.scale.y for m in mc.maps])
 
     # Apply the pixel shifts and return the mapcube
     return apply_shifts(mc, yshift_keep, xshift_keep, clip=clip)
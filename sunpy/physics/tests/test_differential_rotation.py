@@ -1,9 +1,16 @@
 from __future__ import absolute_import
+import os
+from datetime import timedelta
+
 import pytest
 import numpy as np
+from numpy.testing import assert_allclose
 from astropy import units as u
 from astropy.coordinates import Longitude, Latitude, Angle
-from sunpy.physics.differential_rotation import diff_rot, _sun_pos, _calc_P_B0_SD, rot_hpc
+import sunpy.map
+import sunpy.data.test
+from sunpy.physics.differential_rotation import diff_rot, _sun_pos, _calc_P_B0_SD, rot_hpc, \
+    differential_rotation_coordinates, differential_rotate
 from sunpy.tests.helpers import assert_quantity_allclose
 #pylint: disable=C0103,R0904,W0201,W0212,W0232,E1103
 
@@ -95,3 +102,97 @@ def test_rot_hpc():
     x.unit == u.arcsec
     isinstance(y, Angle)
     y.unit == u.arcsec
+
+
+def test_sunpos_array():
+    dates = ['2013-05-14', '2013-05-15', '2014-01-01']
+    result = _sun_pos(dates)
+    for i, date in enumerate(dates):
+        expected = _sun_pos(date)
+        for k in expected:
+            assert_quantity_allclose(result[k][i], expected[k])
+
+
+def test_calc_P_B0_SD_array():
+    dates = np.array(['2012-12-14', '2013-06-01'])
+    result = _calc_P_B0_SD(dates)
+    for i, date in enumerate(dates):
+        expected = _calc_P_B0_SD(date)
+        for k in expected:
+            assert result[k].shape == (2,)
+            assert_quantity_allclose(result[k][i], expected[k], atol=1e-12 * u.deg)
+
+
+def test_rot_hpc_array():
+    # Each point is rotated between its own pair of times
+    x = [451.4, -200.0, 10.0] * u.arcsec
+    y = [-108.9, 300.0, -500.0] * u.arcsec
+    tstart = ['2012-06-15', '2012-06-15 06:00', '2012-06-16']
+    tend = '2012-06-15 16:05:23'
+    newx, newy = rot_hpc(x, y, tstart, tend)
+    assert newx.shape == (3,)
+    for i in range(3):
+        expected_x, expected_y = rot_hpc(x[i], y[i], tstart[i], tend)
+        assert_quantity_allclose(newx[i], expected_x, rtol=1e-12)
+        assert_quantity_allclose(newy[i], expected_y, rtol=1e-12)
+
+    # A single point rotated to many times
+    newx, newy = rot_hpc(x[0], y[0], tstart[0], tstart)
+    assert newx.shape == (3,)
+    assert_quantity_allclose(newx[0], x[0], atol=1e-8 * u.arcsec)
+
+
+@pytest.fixture
+def aia171_test_map():
+    testpath = sunpy.data.test.rootdir
+    return sunpy.map.Map(os.path.join(testpath, 'aia_171_level1.fits'))
+
+
+def test_differential_rotation_coordinates(aia171_test_map):
+    coordinates = differential_rotation_coordinates(aia171_test_map, dt=6 * u.hour,
+                                                    tile_shape=50)
+    assert coordinates.shape == (2,) + aia171_test_map.data.shape
+    assert coordinates.dtype == np.float32
+
+    # A pixel on the disk is taken from where rot_hpc rotates it back to
+    x, y = aia171_test_map.pixel_to_data(70 * u.pix, 60 * u.pix)
+    date = aia171_test_map.date
+    x, y = rot_hpc(x, y, date + timedelta(hours=6), date)
+    x, y = aia171_test_map.data_to_pixel(x, y)
+    assert_allclose(coordinates[:, 60, 70], [y.value, x.value], rtol=0, atol=1e-3)
+
+    # A pixel off the disk is taken from itself
+    assert_allclose(coordinates[:, 0, 0], [0, 0])
+
+    # Rotating to a time is the same as rotating by the time delta
+    later = differential_rotation_coordinates(aia171_test_map, time=date + timedelta(hours=6))
+    assert_allclose(later, coordinates)
+
+    with pytest.raises(ValueError):
+        differential_rotation_coordinates(aia171_test_map)
+    with pytest.raises(ValueError):
+        differential_rotation_coordinates(aia171_test_map, time=date, dt=6 * u.hour)
+
+
+def test_differential_rotate(aia171_test_map):
+    dt = 6 * u.hour
+    rotated = differential_rotate(aia171_test_map, dt=dt)
+    assert rotated.date == aia171_test_map.date + timedelta(hours=6)
+    assert rotated.data.shape == aia171_test_map.data.shape
+    # Off the disk nothing changes, at the east limb new features come into view
+    assert_allclose(rotated.data[0, :], aia171_test_map.data[0, :], atol=1e-10)
+    assert np.isnan(rotated.data).any()
+
+    # Tiling, threads and precomputed co-ordinates give the same result
+    tiled = differential_rotate(aia171_test_map, dt=dt, tile_shape=30, max_workers=2)
+    assert_allclose(tiled.data, rotated.data, atol=1e-10)
+    coordinates = differential_rotation_coordinates(aia171_test_map, dt=dt)
+    out = np.empty(aia171_test_map.data.shape)
+    cached = differential_rotate(aia171_test_map, dt=dt, coordinates=coordinates, out=out)
+    assert cached.data is out
+    # The co-ordinates are stored in single precision
+    assert_allclose(cached.data, rotated.data, rtol=0,
+                    atol=1e-4 * np.nanmax(np.abs(rotated.data)))
+
+    with pytest.raises(ValueError):
+        differential_rotate(aia171_test_map, dt=dt, coordinates=coordinates[:, 1:])
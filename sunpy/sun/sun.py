@@ -26,6 +26,7 @@ import numpy as np
 
 import astropy.units as u
 from astropy.coordinates import Angle, Longitude, Latitude
+from astropy.time import Time
 
 from sunpy.time import parse_time, julian_day, julian_centuries
 from sunpy.sun import constants
@@ -59,10 +60,72 @@ __all__ = ["print_params"
 __authors__ = ["Steven Christe"]
 __email__ = "steven.d.christe@nasa.gov"
 
+def _year(t):
+    """Return the calendar year of ``t``, elementwise for arrays of times."""
+    if isinstance(t, (np.ndarray, np.datetime64)) and t.dtype.kind == 'M':
+        return t.astype('datetime64[Y]').astype(int) + 1970
+    if isinstance(t, Time):
+        t = t.datetime
+    if isinstance(t, (list, np.ndarray)):
+        years = [parse_time(time).year for time in np.ravel(t)]
+        return np.array(years).reshape(np.shape(t))
+    return parse_time(t).year
+
+# The functions below work on the number of Julian centuries ``T`` since
+# J1900.0, so that the public functions only have to convert their time once
+# and the terms shared between them are computed from the same array.
+
+def _eccentricity_SunEarth_orbit(T):
+    return 0.016751040 - 0.00004180 * T - 0.0000001260 * T ** 2
+
+def _geometric_mean_longitude(T):
+    result = 279.696680 + 36000.76892 * T + 0.0003025 * T ** 2
+    return Longitude(result * u.deg)
+
+def _mean_anomaly(T):
+    result = 358.475830 + 35999.049750 * T - 0.0001500 * T ** 2 - 0.00000330 * T ** 3
+    return Longitude(result * u.deg)
+
+def _equation_of_center(T, mna=None):
+    if mna is None:
+        mna = _mean_anomaly(T)
+    result = ((1.9194600 - 0.0047890 * T - 0.0000140 * T ** 2) * np.sin(mna)
+    + (0.0200940 - 0.0001000 * T) *
+    np.sin(2 * mna) + 0.0002930 * np.sin(3 * mna))
+    return Angle(result * u.deg)
+
+def _true_longitude(T):
+    return Longitude(_equation_of_center(T) + _geometric_mean_longitude(T))
+
+def _true_anomaly(T):
+    mna = _mean_anomaly(T)
+    return Longitude(mna + _equation_of_center(T, mna))
+
+def _sunearth_distance(T):
+    ta = _true_anomaly(T)
+    e = _eccentricity_SunEarth_orbit(T)
+    result = 1.00000020 * (1.0 - e ** 2) / (1.0 + e * np.cos(ta))
+    return result * u.AU
+
+def _apparent_longitude(T, true_long=None):
+    if true_long is None:
+        true_long = _true_longitude(T)
+    omega = (259.18 - 1934.142 * T) * u.deg
+    result = true_long - (0.00569 - 0.00479 * np.sin(omega)) * u.deg
+    return Longitude(result)
+
+def _true_obliquity_of_ecliptic(T):
+    result = 23.452294 - 0.0130125 * T - 0.00000164 * T ** 2 + 0.000000503 * T ** 3
+    return Angle(result, u.deg)
+
+def _apparent_obliquity_of_ecliptic(T, app_long=None):
+    if app_long is None:
+        app_long = _apparent_longitude(T)
+    return _true_obliquity_of_ecliptic(T) + (0.00256 * np.cos(app_long)) * u.deg
+
 def solar_cycle_number(t='now'):
     """Return the solar cycle number."""
-    time = parse_time(t)
-    result = (time.year + 8) % 28 + 1
+    result = (_year(t) + 8) % 28 + 1
     return result
 
 def solar_semidiameter_angular_size(t='now'):
@@ -88,34 +151,29 @@ def position(t='now'):
     """Returns the position of the Sun (right ascension and declination)
     on the celestial sphere using the equatorial coordinate system in arcsec.
     """
-    ra = true_rightascension(t)
-    dec = true_declination(t)
+    T = julian_centuries(t)
+    ob = _true_obliquity_of_ecliptic(T)
+    true_long = _true_longitude(T)
+    ra = _true_rightascension(ob, true_long)
+    dec = _true_declination(ob, _apparent_longitude(T, true_long))
     return (ra, dec)
 
 def eccentricity_SunEarth_orbit(t='now'):
     """Returns the eccentricity of the Sun Earth Orbit."""
-    T = julian_centuries(t)
-    result = 0.016751040 - 0.00004180 * T - 0.0000001260 * T ** 2
-    return result
+    return _eccentricity_SunEarth_orbit(julian_centuries(t))
 
 def mean_ecliptic_longitude(t='now'):
     """Returns the mean ecliptic longitude."""
-    T = julian_centuries(t)
-    result = 279.696680 + 36000.76892 * T + 0.0003025 * T ** 2
-    result = result * u.deg
-    return Longitude(result)
+    return _geometric_mean_longitude(julian_centuries(t))
 
 def longitude_Sun_perigee(t='now'): # pylint: disable=W0613
-    # T = julian_centuries(t)
-    return 1
+    T = julian_centuries(t)
+    return np.ones_like(T) if np.ndim(T) else 1
 
 def mean_anomaly(t='now'):
     """Returns the mean anomaly (the angle through which the Sun has moved
     assuming a circular orbit) as a function of time."""
-    T = julian_centuries(t)
-    result = 358.475830 + 35999.049750 * T - 0.0001500 * T ** 2 - 0.00000330 * T ** 3
-    result = result * u.deg
-    return Longitude(result)
+    return _mean_anomaly(julian_centuries(t))
 
 def carrington_rotation_number(t='now'):
     """Return the Carrington Rotation number"""
@@ -125,104 +183,95 @@ def carrington_rotation_number(t='now'):
 
 def geometric_mean_longitude(t='now'):
     """Returns the geometric mean longitude (in degrees)"""
-    T = julian_centuries(t)
-    result = 279.696680 + 36000.76892 * T + 0.0003025 * T ** 2
-    result = result * u.deg
-    return Longitude(result)
+    return _geometric_mean_longitude(julian_centuries(t))
 
 def equation_of_center(t='now'):
     """Returns the Sun's equation of center (in degrees)"""
-    T = julian_centuries(t)
-    mna = mean_anomaly(t)
-    result = ((1.9194600 - 0.0047890 * T - 0.0000140 * T ** 2) * np.sin(mna)
-    + (0.0200940 - 0.0001000 * T) *
-    np.sin(2 * mna) + 0.0002930 * np.sin(3 * mna))
-    result = result * u.deg
-    return Angle(result)
+    return _equation_of_center(julian_centuries(t))
 
 def true_longitude(t='now'):
     """Returns the Sun's true geometric longitude (in degrees)
     (Referred to the mean equinox of date.  Question: Should the higher
     accuracy terms from which app_long is derived be added to true_long?)"""
-    result = equation_of_center(t) + geometric_mean_longitude(t)
-    return Longitude(result)
+    return _true_longitude(julian_centuries(t))
 
 def true_anomaly(t='now'):
     """Returns the Sun's true anomaly (in degrees)."""
-    result = mean_anomaly(t) + equation_of_center(t)
-    return Longitude(result)
+    return _true_anomaly(julian_centuries(t))
 
 def sunearth_distance(t='now'):
     """Returns the Sun Earth distance (AU). There are a set of higher
     accuracy terms not included here."""
-    ta = true_anomaly(t)
-    e = eccentricity_SunEarth_orbit(t)
-    result = 1.00000020 * (1.0 - e ** 2) / (1.0 + e * np.cos(ta))
-    return result * u.AU
+    return _sunearth_distance(julian_centuries(t))
 
 def apparent_longitude(t='now'):
     """Returns the apparent longitude of the Sun."""
-    T = julian_centuries(t)
-    omega = (259.18 - 1934.142 * T) * u.deg
-    true_long = true_longitude(t)
-    result = true_long - (0.00569 - 0.00479 * np.sin(omega)) * u.deg
-    return Longitude(result)
+    return _apparent_longitude(julian_centuries(t))
 
 def true_latitude(t='now'): # pylint: disable=W0613
     """Returns the true latitude. Never more than 1.2 arcsec from 0,
     set to 0 here."""
-    return 0.0
+    T = julian_centuries(t)
+    return np.zeros_like(T) if np.ndim(T) else 0.0
 
 def apparent_latitude(t='now'): # pylint: disable=W0613
     """Returns the true latitude. Set to 0 here."""
-    return 0
+    T = julian_centuries(t)
+    return np.zeros_like(T) if np.ndim(T) else 0
 
 def true_obliquity_of_ecliptic(t='now'):
     """Returns the true obliquity of the ecliptic."""
-    T = julian_centuries(t)
-    result = 23.452294 - 0.0130125 * T - 0.00000164 * T ** 2 + 0.000000503 * T ** 3
-    return Angle(result, u.deg)
+    return _true_obliquity_of_ecliptic(julian_centuries(t))
 
-def true_rightascension(t='now'):
-    """Return the true right ascension."""
-    y = np.cos(true_obliquity_of_ecliptic(t)) * np.sin(true_longitude(t))
-    x = np.cos(true_longitude(t))
+def _true_rightascension(ob, true_long):
+    y = np.cos(ob) * np.sin(true_long)
+    x = np.cos(true_long)
     true_ra = np.arctan2(y, x)
     return Longitude(true_ra.to(u.hourangle))
 
+def true_rightascension(t='now'):
+    """Return the true right ascension."""
+    T = julian_centuries(t)
+    return _true_rightascension(_true_obliquity_of_ecliptic(T), _true_longitude(T))
+
+def _true_declination(ob, app_long):
+    result = np.arcsin(np.sin(ob) * np.sin(app_long))
+    return Latitude(result.to(u.deg))
+
 def true_declination(t='now'):
     """Return the true declination."""
-    result = np.arcsin(np.sin(true_obliquity_of_ecliptic(t)) * np.sin(apparent_longitude(t)))
-    return Latitude(result.to(u.deg))
+    T = julian_centuries(t)
+    return _true_declination(_true_obliquity_of_ecliptic(T), _apparent_longitude(T))
 
 def apparent_obliquity_of_ecliptic(t='now'):
     """Return the apparent obliquity of the ecliptic."""
-    omega = apparent_longitude(t)
-    result = true_obliquity_of_ecliptic(t) + (0.00256 * np.cos(omega)) * u.deg
-    return result
+    return _apparent_obliquity_of_ecliptic(julian_centuries(t))
 
 def apparent_rightascension(t='now'):
     """Returns the apparent right ascension of the Sun."""
-    y = np.cos(apparent_obliquity_of_ecliptic(t)) * np.sin(apparent_longitude(t))
-    x = np.cos(apparent_longitude(t))
+    T = julian_centuries(t)
+    app_long = _apparent_longitude(T)
+    y = np.cos(_apparent_obliquity_of_ecliptic(T, app_long)) * np.sin(app_long)
+    x = np.cos(app_long)
     app_ra = np.arctan2(y, x)
     return Longitude(app_ra.to(u.hourangle))
 
 def apparent_declination(t='now'):
     """Returns the apparent declination of the Sun."""
-    ob = apparent_obliquity_of_ecliptic(t)
-    app_long = apparent_longitude(t)
+    T = julian_centuries(t)
+    app_long = _apparent_longitude(T)
+    ob = _apparent_obliquity_of_ecliptic(T, app_long)
     result = np.arcsin(np.sin(ob)) * np.sin(app_long)
     return Latitude(result.to(u.deg))
 
 def solar_north(t='now'):
     """Returns the position of the Solar north pole in degrees."""
     T = julian_centuries(t)
-    ob1 = true_obliquity_of_ecliptic(t)
+    ob1 = _true_obliquity_of_ecliptic(T)
     # in degrees
     i = 7.25 * u.deg
     k = (74.3646 + 1.395833 * T) * u.deg
-    lamda = true_longitude(t) - (0.00569 * u.deg)
+    lamda = _true_longitude(T) - (0.00569 * u.deg)
     omega = (259.18 - 1934.142 * T) * u.deg
     lamda2 = lamda - (0.00479 * np.sin(omega)) * u.deg
     diff = lamda - k
@@ -234,12 +283,14 @@ def solar_north(t='now'):
 def heliographic_solar_center(t='now'):
     """Returns the position of the solar center in heliographic coordinates."""
     jd = julian_day(t)
-    T = julian_centuries(t)
+    # Julian centuries since J1900.0, as julian_centuries(t) but without
+    # converting t a second time
+    T = (jd - 2415020.0) / 36525.0
     # Heliographic coordinates in degrees
     theta = ((jd - 2398220)*360/25.38) * u.deg
     i = 7.25 * u.deg
     k = (74.3646 + 1.395833 * T) * u.deg
-    lamda = true_longitude(t) - 0.00569 * u.deg
+    lamda = _true_longitude(T) - 0.00569 * u.deg
     diff = lamda - k
     # Latitude at center of disk (deg):
     he_lat = np.arcsin(np.sin(diff)*np.sin(i))
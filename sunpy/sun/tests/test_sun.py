@@ -1,6 +1,10 @@
 from __future__ import absolute_import
 
+import numpy as np
+import pytest
+
 import astropy.units as u
+from astropy.time import Time
 
 from sunpy.sun import sun
 from sunpy.tests.helpers import assert_quantity_allclose
@@ -123,3 +127,23 @@ def test_solar_north():
     assert_quantity_allclose(sun.solar_north("2019/10/10"), 26.260 * u.deg, atol=1e-3 * u.deg)
     assert_quantity_allclose(sun.solar_north("2542/02/20"), -17.981 * u.deg, atol=1e-3 * u.deg)
 
+
+
+@pytest.mark.parametrize("func", [getattr(sun, name) for name in sun.__all__
+                                  if name != 'print_params'])
+def test_array_of_times(func):
+    dates = ['2012/11/11', '2013/12/13 12:34:56', '2512/04/09']
+    isodates = [date.replace('/', '-') for date in dates]
+    times = [np.array(isodates, dtype='datetime64[s]'), Time(isodates)]
+    expected = [func(date) for date in dates]
+    for time in times:
+        result = func(time)
+        if isinstance(result, tuple):
+            for i, component in enumerate(result):
+                assert component.shape == (3,)
+                for j in range(3):
+                    assert_quantity_allclose(component[j], expected[j][i])
+        else:
+            assert np.shape(result) == (3,)
+            for j in range(3):
+                assert_quantity_allclose(result[j], expected[j])
@@ -1,5 +1,6 @@
 from __future__ import absolute_import
 
+import numpy as np
 from astropy.time import Time
 from sunpy.time import parse_time
 
@@ -9,7 +10,16 @@ __all__ = ['julian_day', 'julian_centuries']
 def julian_day(t='now'):
     """
     Wrap a UTC -> JD conversion from astropy.
+
+    ``t`` can also be an `~astropy.time.Time` or a list or array of times
+    (including `numpy.datetime64` arrays), in which case the Julian days are
+    calculated in one go and an array of the same shape is returned.
     """
+    if isinstance(t, Time):
+        return t.jd
+    if isinstance(t, (np.ndarray, np.datetime64)) and t.dtype.kind == 'M':
+        # J2000.0 is 2451545.0, at noon on 2000 January 1
+        return (t - np.datetime64('2000-01-01T12:00:00')) / np.timedelta64(1, 'D') + 2451545.0
     return Time(parse_time(t)).jd
 
 
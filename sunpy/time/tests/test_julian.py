@@ -2,6 +2,7 @@ from __future__ import absolute_import, division, print_function
 
 from datetime import datetime
 
+import numpy as np
 from numpy.testing import assert_almost_equal
 import pytest
 
@@ -107,3 +108,22 @@ def test_julian_centuries6():
     """should raise value error when passed non-date string"""
 
     pytest.raises(ValueError, julian.julian_centuries, 'Are you suggesting coconuts migrate?')
+
+def test_julian_day_array():
+    """should return an array of julian days for a list or array of dates"""
+    dates = [DATETIME_DATE_1, STRING_DATE_2, DATETIME_DATE_3]
+    expected = [julian.julian_day(date) for date in dates]
+    assert_almost_equal(julian.julian_day(dates), expected)
+    result = julian.julian_day(np.array([[STRING_DATE_1, STRING_DATE_2]]))
+    assert result.shape == (1, 2)
+    assert_almost_equal(result[0], expected[:2])
+    assert_almost_equal(julian.julian_centuries(dates),
+                        [julian.julian_centuries(date) for date in dates])
+
+def test_julian_day_datetime64():
+    """should return julian days for datetime64 scalars and arrays"""
+    dates = np.array(['1900-01-01T12:00:00', '2013-08-14T23:59:59.5'],
+                     dtype='datetime64[ms]')
+    expected = [julian.julian_day(date.astype(datetime)) for date in dates]
+    assert_almost_equal(julian.julian_day(dates), expected)
+    assert_almost_equal(julian.julian_day(dates[0]), expected[0])
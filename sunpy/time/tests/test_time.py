@@ -77,6 +77,38 @@ def test_parse_time_numpy_datetime():
     assert all([isinstance(dt, datetime) for dt in dts])
 
 
+def test_parse_time_numpy_datetime_ns():
+    inputs = np.array(['2005-02-01T12:30:45.123456789'], dtype='datetime64[ns]')
+
+    dts = parse_time(inputs)
+
+    assert isinstance(dts, np.ndarray)
+    assert list(dts) == [datetime(2005, 2, 1, 12, 30, 45)]
+
+
+@pytest.mark.parametrize('inputs', [
+    ['2007-05-04T21:08:12.000000', '2007-05-04T21:08:12.999999'],
+    ['2007-May-04 21:08:12', '2512-Jun-04 21:08:12'],
+    ['2010-10-10T23:59:59', '2010-10-10T24:00:00'],
+    ['2007-05-04', '2007/05/04 21:08', '20070504_210812'],
+])
+def test_parse_time_list(inputs):
+    dts = parse_time(inputs)
+
+    assert isinstance(dts, np.ndarray)
+    assert all([isinstance(dt, datetime) for dt in dts])
+    assert list(dts) == [parse_time(time_string) for time_string in inputs]
+
+
+def test_parse_time_array_shape():
+    inputs = np.array([['2007-05-04', '2007-05-05'], ['2007-05-06', '2007-05-07']])
+
+    dts = parse_time(inputs)
+
+    assert dts.shape == (2, 2)
+    assert dts[1, 0] == datetime(2007, 5, 6)
+
+
 def test_parse_time_astropy():
     astropy_time = parse_time(astropy.time.Time(['2016-01-02T23:00:01']))
 
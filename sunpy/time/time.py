@@ -1,5 +1,7 @@
 from __future__ import absolute_import, division, print_function
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from datetime import timedelta
 
@@ -53,6 +55,26 @@ TIME_FORMAT_LIST = [
     "%Y.%m.%d_%H:%M:%S_TAI",   # Example 2016.05.04_21:08:12_TAI
 ]
 
+# Compiled regular expressions of the time formats, by format
+_regex_cache = {}
+
+# The number of time string layouts whose format in TIME_FORMAT_LIST is kept.
+# The layout of a string is the string with every digit replaced by a zero.
+_FORMAT_CACHE_SIZE = 1024
+_format_cache = OrderedDict()
+_format_lock = threading.Lock()
+_DIGIT = re.compile(r'\d')
+
+
+def _format_regex(format):
+    regex = _regex_cache.get(format)
+    if regex is None:
+        re_format = format
+        for key, value in six.iteritems(REGEX):
+            re_format = re_format.replace(key, value)
+        regex = _regex_cache[format] = re.compile(re_format)
+    return regex
+
 
 def _group_or_none(match, group, fun):
     try:
@@ -71,9 +93,7 @@ def _regex_parse_time(inp, format):
     # Parser for finding out the minute value so we can adjust the string
     # from 24:00:00 to 00:00:00 the next day because strptime does not
     # understand the former.
-    for key, value in six.iteritems(REGEX):
-        format = format.replace(key, value)
-    match = re.match(format, inp)
+    match = _format_regex(format).match(inp)
     if match is None:
         return None, None
     try:
@@ -91,13 +111,88 @@ def _regex_parse_time(inp, format):
     return inp, timedelta(days=0)
 
 
+def _strptime(time_string, time_format):
+    """Parse a string with one time format, returning None if it does not fit."""
+    try:
+        ts, time_delta = _regex_parse_time(time_string, time_format)
+        if ts is None:
+            return None
+        return datetime.strptime(ts, time_format) + time_delta
+    except ValueError:
+        return None
+
+
+def _parse_time_string(time_string):
+    """
+    Parse a string with the first format in `TIME_FORMAT_LIST` that fits it.
+
+    The format found is remembered for the layout of the string, so that
+    strings laid out in the same way are parsed without trying every format.
+
+    Returns
+    -------
+    time_format, dt : `str`, `~datetime.datetime`
+        The format and the parsed time, or (None, None) if no format fits.
+    """
+    try:
+        layout = _DIGIT.sub('0', time_string)
+    except TypeError:
+        return None, None
+    with _format_lock:
+        time_format = _format_cache.pop(layout, None)
+        if time_format is not None:
+            _format_cache[layout] = time_format
+    if time_format is not None:
+        dt = _strptime(time_string, time_format)
+        if dt is not None:
+            return time_format, dt
+
+    for time_format in TIME_FORMAT_LIST:
+        dt = _strptime(time_string, time_format)
+        if dt is not None:
+            with _format_lock:
+                _format_cache[layout] = time_format
+                while len(_format_cache) > _FORMAT_CACHE_SIZE:
+                    _format_cache.popitem(last=False)
+            return time_format, dt
+    return None, None
+
+
+def _parse_time_array(time_strings, time_format='', **kwargs):
+    """
+    Parse an array of times into an array of datetimes of the same shape.
+
+    The format of an array of strings is found from its first element, and
+    the whole array is then parsed in one go by pandas. Arrays which do not
+    all share that format, or which pandas cannot hold, are parsed element
+    by element.
+    """
+    flat = time_strings.ravel()
+    if time_strings.dtype.kind in 'US' and flat.size:
+        # Trailing zeros are only stripped from the sample if need be, as the
+        # format of the stripped string might not fit the other elements
+        sample = flat[0]
+        sample_format = _parse_time_string(sample)[0]
+        if sample_format is None and '.' in sample:
+            sample_format = _parse_time_string(sample.rstrip("0").rstrip("."))[0]
+        if sample_format is not None:
+            try:
+                times = pandas.to_datetime(flat, format=sample_format)
+            except (ValueError, OverflowError):
+                pass
+            else:
+                return times.to_pydatetime().reshape(time_strings.shape)
+
+    dts = np.empty(flat.shape, dtype=object)
+    for i, time in enumerate(flat):
+        dts[i] = parse_time(time, time_format, **kwargs)
+    return dts.reshape(time_strings.shape)
+
+
 def find_time(string, format):
     """ Return iterator of occurrences of date formatted with format
     in string. Currently supported format codes: """
-    re_format = format
-    for key, value in six.iteritems(REGEX):
-        re_format = re_format.replace(key, value)
-    matches = re.finditer(re_format, string)
+    matches = _format_regex(format).finditer(string)
     for match in matches:
         try:
             matchstr = string[slice(*match.span())]
@@ -128,18 +223,23 @@ def parse_time(time_string, time_format='', **kwargs):
 
     Parameters
     ----------
-    time_string : [ int, float, time_string, datetime ]
-        Date to parse which can be either time_string, int, datetime object.
+    time_string : [ int, float, time_string, datetime, list, array ]
+        Date to parse which can be either time_string, int, datetime object,
+        or a list or array of them.
     time_format : [ basestring, utime, datetime ]
         Specifies the format user has provided the time_string in.
 
     Returns
     -------
     out : datetime
-        DateTime corresponding to input date string
+        DateTime corresponding to input date string, or an array of datetimes
+        for a list or array input.
 
     Note:
     If time_string is an instance of float, then it is assumed to be in utime format.
+    The strings of a list or array are expected to share one format, which is
+    found from the first of them; they are parsed together, which is much
+    faster than parsing them one at a time.
 
     Examples
     --------
@@ -160,9 +260,11 @@ def parse_time(time_string, time_format='', **kwargs):
     elif isinstance(time_string, pandas.tseries.index.DatetimeIndex):
         return time_string._mpl_repr()
     elif isinstance(time_string, np.ndarray) and 'datetime64' in str(time_string.dtype):
-        ii = [ss.astype(datetime) for ss in time_string]
-        # Validate (in an agnostic way) that we are getting a datetime rather than a date
-        return np.array([datetime(*(dt.timetuple()[:6])) for dt in ii])
+        # Converting whole seconds gives datetimes, rather than dates for a
+        # unit of days or integers for units below a microsecond
+        return time_string.astype('datetime64[s]').astype(datetime)
+    elif isinstance(time_string, (list, np.ndarray)):
+        return _parse_time_array(np.asarray(time_string), time_format, **kwargs)
     elif time_string is 'now':
         return datetime.utcnow()
     elif isinstance(time_string, astropy.time.Time):
@@ -172,18 +274,9 @@ def parse_time(time_string, time_format='', **kwargs):
         # number of zeros. This solves issue #289
         if '.' in time_string:
             time_string = time_string.rstrip("0").rstrip(".")
-        for time_format in TIME_FORMAT_LIST:
-            try:
-                try:
-                    ts, time_delta = _regex_parse_time(time_string,
-                                                       time_format)
-                except TypeError:
-                    break
-                if ts is None:
-                    continue
-                return datetime.strptime(ts, time_format) + time_delta
-            except ValueError:
-                pass
+        dt = _parse_time_string(time_string)[1]
+        if dt is not None:
+            return dt
 
         time_string_parse_format = kwargs.pop('_time_string_parse_format', None)
         if time_string_parse_format is not None:
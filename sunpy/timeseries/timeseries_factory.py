@@ -491,12 +491,25 @@ class TimeSeriesFactory(BasicRegistrationFactory):
         return new_timeseries
 
     def _get_matching_widget(self, **kwargs):
-        candidate_widget_types = list()
+        meta = kwargs.get('meta')
+        if isinstance(meta, dict):
+            # The validation functions look at the header and at the other
+            # keywords, such as source, but not at the data, so the matching
+            # classes are cached by those and by the header keys looked up.
+            options = [(key, value) for key, value in six.iteritems(kwargs)
+                       if key not in ('data', 'meta', 'units', 'filepath')]
+            cache_key = (tuple(sorted(kwargs)),
+                         tuple(sorted(options, key=lambda item: item[0])))
+            candidate_widget_types = self._get_candidate_widget_types(
+                meta, lambda validate, header: validate(**dict(kwargs, meta=header)),
+                cache_key=cache_key)
+        else:
+            candidate_widget_types = list()
 
-        for key in self.registry:
-            # Call the registered validation function for each registered class
-            if self.registry[key](**kwargs):
-                candidate_widget_types.append(key)
+            for key in self.registry:
+                # Call the registered validation function for each registered class
+                if self.registry[key](**kwargs):
+                    candidate_widget_types.append(key)
 
         n_matches = len(candidate_widget_types)
 
@@ -78,6 +78,7 @@ import inspect
 
 from itertools import chain, repeat
 
+from sunpy.extern import six
 from sunpy.extern.six.moves import zip
 
 __all__ = ['run_cls', 'matches_types', 'arginize', 'correct_argspec',
@@ -152,6 +153,9 @@ class ConditionalDispatch(object):
     def __init__(self):
         self.funcs = []
         self.nones = []
+        # The functions whose signature and types match a call, by the types
+        # of the arguments and the names of the keyword arguments
+        self.cache = {}
 
     @classmethod
     def from_existing(cls, cond_dispatch):
@@ -185,21 +189,42 @@ class ConditionalDispatch(object):
             )
         else:
             self.funcs.append((fun, condition, types))
-
-    def __call__(self, *args, **kwargs):
-        matched = False
-        for fun, condition, types in self.funcs:
+        self.cache = {}
+
+    def _resolve(self, args, kwargs):
+        """ Return the functions with conditions and the functions without
+        conditions whose signature and types match args and kwargs. Whether
+        they match only depends on the types of args and on the keyword
+        argument names and types, so the result is cached by those. """
+        key = (tuple(type(arg) for arg in args),
+               tuple(sorted((name, type(value))
+                            for name, value in six.iteritems(kwargs))))
+        try:
+            return self.cache[key]
+        except KeyError:
+            pass
+        funcs = [
+            (fun, condition) for fun, condition, types in self.funcs
             if (matches_signature(condition, args, kwargs) and
-                (types is None or matches_types(condition, types, args, kwargs))):
-                matched = True
-                if condition(*args, **kwargs):
-                    return fun(*args, **kwargs)
-        for fun, types in self.nones:
+                (types is None or matches_types(condition, types, args, kwargs)))
+        ]
+        nones = [
+            fun for fun, types in self.nones
             if (matches_signature(fun, args, kwargs) and
-                (types is None or matches_types(fun, types, args, kwargs))):
+                (types is None or matches_types(fun, types, args, kwargs)))
+        ]
+        self.cache[key] = funcs, nones
+        return funcs, nones
+
+    def __call__(self, *args, **kwargs):
+        funcs, nones = self._resolve(args, kwargs)
+        for fun, condition in funcs:
+            if condition(*args, **kwargs):
                 return fun(*args, **kwargs)
+        if nones:
+            return nones[0](*args, **kwargs)
 
-        if matched:
+        if funcs:
             raise TypeError(
                 "Your input did not fulfill the condition for any function."
             )
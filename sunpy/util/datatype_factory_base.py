@@ -1,6 +1,55 @@
 from __future__ import absolute_import, division, print_function
 
 import inspect
+import threading
+from collections import OrderedDict
+
+# The number of header key values whose matching widget types are kept, and
+# the number of different sets of header keys they are looked up by
+_DISPATCH_CACHE_SIZE = 1024
+_DISPATCH_KEYSETS = 16
+
+_MISSING = object()
+
+
+class _HeaderKeyRecorder(object):
+    """
+    A read-only view of a header which records the keys looked up in it.
+
+    Iterating over the view or using any other method of the header marks the
+    record as incomplete, as the outcome may then depend on any key.
+    """
+    def __init__(self, header):
+        self._header = header
+        self.keys = []
+        self.complete = True
+
+    def get(self, key, default=None):
+        self.keys.append(key)
+        return self._header.get(key, default)
+
+    def __getitem__(self, key):
+        self.keys.append(key)
+        return self._header[key]
+
+    def __contains__(self, key):
+        self.keys.append(key)
+        return key in self._header
+
+    def has_key(self, key):
+        return key in self
+
+    def __iter__(self):
+        self.complete = False
+        return iter(self._header)
+
+    def __len__(self):
+        self.complete = False
+        return len(self._header)
+
+    def __getattr__(self, name):
+        self.complete = False
+        return getattr(self._header, name)
 
 
 class BasicRegistrationFactory(object):
@@ -54,6 +103,11 @@ class BasicRegistrationFactory(object):
         self.validation_functions = (['_factory_validation_function'] +
                                      additional_validation_functions)
 
+        self._dispatch_registry = None
+        self._dispatch_cache = OrderedDict()
+        self._dispatch_keysets = OrderedDict()
+        self._dispatch_lock = threading.Lock()
+
     def __call__(self, *args, **kwargs):
         """ Method for running the factory.
 
@@ -93,6 +147,65 @@ class BasicRegistrationFactory(object):
 
         return WidgetType(*args, **kwargs)
 
+    def _get_candidate_widget_types(self, header, validate, cache_key=()):
+        """
+        Return the registered widget types whose validation function accepts
+        a header.
+
+        ``validate(validation_function, header)`` runs one validation function
+        on the header. The candidates are cached by the values of the header
+        keys the validation functions looked up, and by ``cache_key``, so for
+        a batch of headers from one source the validation functions only run
+        for the first of them. Validation functions must therefore depend on
+        nothing but the header and what ``cache_key`` identifies.
+        """
+        # Classes registered by adding to the registry directly, rather than
+        # with register, are noticed by the change in its length
+        state = (id(self.registry), len(self.registry))
+        with self._dispatch_lock:
+            if state != self._dispatch_registry:
+                self._clear_dispatch_cache()
+                self._dispatch_registry = state
+            keysets = list(self._dispatch_keysets)
+
+        try:
+            for keys in keysets:
+                key = (keys, tuple(header.get(k, _MISSING) for k in keys), cache_key)
+                with self._dispatch_lock:
+                    candidates = self._dispatch_cache.pop(key, None)
+                    if candidates is not None:
+                        self._dispatch_cache[key] = candidates
+                        return list(candidates)
+            hash(cache_key)
+        except TypeError:
+            # Unhashable header values or cache key
+            return [WidgetType for WidgetType in self.registry
+                    if validate(self.registry[WidgetType], header)]
+
+        recorder = _HeaderKeyRecorder(header)
+        candidates = [WidgetType for WidgetType in self.registry
+                      if validate(self.registry[WidgetType], recorder)]
+        if recorder.complete:
+            keys = tuple(OrderedDict.fromkeys(recorder.keys))
+            key = (keys, tuple(header.get(k, _MISSING) for k in keys), cache_key)
+            try:
+                hash(key)
+            except TypeError:
+                return candidates
+            with self._dispatch_lock:
+                self._dispatch_cache[key] = tuple(candidates)
+                while len(self._dispatch_cache) > _DISPATCH_CACHE_SIZE:
+                    self._dispatch_cache.popitem(last=False)
+                self._dispatch_keysets.pop(keys, None)
+                self._dispatch_keysets[keys] = None
+                while len(self._dispatch_keysets) > _DISPATCH_KEYSETS:
+                    self._dispatch_keysets.popitem(last=False)
+        return candidates
+
+    def _clear_dispatch_cache(self):
+        self._dispatch_cache.clear()
+        self._dispatch_keysets.clear()
+
     def register(self, WidgetType, validation_function=None, is_default=False):
         """ Register a widget with the factory.
 
@@ -114,6 +227,9 @@ class BasicRegistrationFactory(object):
             Sets WidgetType to be the default widget.
 
         """
+        with self._dispatch_lock:
+            self._clear_dispatch_cache()
+
         if is_default:
             self.default_widget_type = WidgetType
 
@@ -147,6 +263,8 @@ class BasicRegistrationFactory(object):
     def unregister(self, WidgetType):
         """ Remove a widget from the factory's registry."""
         self.registry.pop(WidgetType)
+        with self._dispatch_lock:
+            self._clear_dispatch_cache()
 
 
 class NoMatchError(Exception):
@@ -15,9 +15,13 @@ class MetaDict(OrderedDict):
 
     This class handles everything in lower case. This allows case insensitive
     indexing.
+
+    Every change to the contents increments `version`, which allows objects
+    derived from the meta data to be cached until it is modified.
     """
     def __init__(self, *args):
         """Creates a new MapHeader instance"""
+        self._version = 0
         # Store all keys as upper-case to allow for case-insensitive indexing
         # OrderedDict can be instantiated from a list of lists or a tuple of tuples
         tags = dict()
@@ -34,6 +38,14 @@ class MetaDict(OrderedDict):
 
         super(MetaDict, self).__init__(*args)
 
+    @property
+    def version(self):
+        """A counter which is incremented every time the contents change."""
+        return self._version
+
+    def _modified(self):
+        self._version = getattr(self, '_version', 0) + 1
+
     def __contains__(self, key):
         """Override __contains__"""
         return OrderedDict.__contains__(self, key.lower())
@@ -44,8 +56,14 @@ class MetaDict(OrderedDict):
 
     def __setitem__(self, key, value):
         """Override [] indexing"""
+        self._modified()
         return OrderedDict.__setitem__(self, key.lower(), value)
 
+    def __delitem__(self, key):
+        """Override del to perform case-insensitively"""
+        self._modified()
+        return OrderedDict.__delitem__(self, key.lower())
+
     def get(self, key, default=None):
         """Override .get() indexing"""
         return OrderedDict.get(self, key.lower(), default)
@@ -56,12 +74,25 @@ class MetaDict(OrderedDict):
 
     def pop(self, key, default=None):
         """Override .pop() to perform case-insensitively"""
+        self._modified()
         return OrderedDict.pop(self, key.lower(), default)
 
     def update(self, d2):
         """Override .update() to perform case-insensitively"""
+        self._modified()
         return OrderedDict.update(self, OrderedDict((k.lower(), v) for k, v in d2.items()))
 
     def setdefault(self, key, default=None):
         """Override .setdefault() to perform case-insensitively"""
+        self._modified()
         return OrderedDict.setdefault(self, key.lower(), default)
+
+    def popitem(self, *args, **kwargs):
+        """Override .popitem() to record the change"""
+        self._modified()
+        return OrderedDict.popitem(self, *args, **kwargs)
+
+    def clear(self):
+        """Override .clear() to record the change"""
+        self._modified()
+        return OrderedDict.clear(self)
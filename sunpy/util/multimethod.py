@@ -95,6 +95,7 @@ class MultiMethod(object):
                  TypeWarning, stacklevel=3)
 
         self.methods.append((types, fun))
+        self.cache = {}
 
     def add_dec(self, *types, **kwargs):
         """ Return a decorator that adds the function it receives to the
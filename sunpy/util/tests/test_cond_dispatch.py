@@ -67,3 +67,18 @@ def test_types():
     f.add(lambda x: 2 * x, lambda x: x % 2 == 0, [int])
     with pytest.raises(TypeError):
         f(2.0)
+
+
+def test_cache():
+    f = ConditionalDispatch()
+    f.add(lambda x: 2 * x, lambda x: x % 2 == 0, [int])
+    f.add(lambda x: 3 * x, None, [float])
+    assert f(2) == 4
+    assert f(2.0) == 6.0
+    assert len(f.cache) == 2
+    with pytest.raises(TypeError):
+        f(3)
+    # Adding a function resets the resolved signatures
+    f.add(lambda x: 5 * x, lambda x: x % 2 == 1, [int])
+    assert f.cache == {}
+    assert f(3) == 15
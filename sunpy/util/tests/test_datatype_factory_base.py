@@ -151,3 +151,50 @@ class TestBasicRegistrationFactory(object):
 
         with pytest.raises(ValidationFunctionError):
             ExtraValidationFactory.register(MissingClassMethodDifferentValidationWidget)
+
+
+class InstrumentWidget(BaseWidget):
+    calls = 0
+
+    @classmethod
+    def is_datasource_for(cls, header, **kwargs):
+        cls.calls += 1
+        return header.get('instrume') == 'AIA'
+
+
+class CameraWidget(BaseWidget):
+    @classmethod
+    def is_datasource_for(cls, header, **kwargs):
+        return header.get('instrume') == 'MDI' or header.get('camera') == 'MDI'
+
+
+def test_candidate_widget_types_cache():
+    factory = BasicRegistrationFactory(additional_validation_functions=['is_datasource_for'])
+    factory.register(InstrumentWidget)
+    factory.register(CameraWidget)
+
+    def validate(validation_function, header):
+        return validation_function(header)
+
+    InstrumentWidget.calls = 0
+    for i in range(10):
+        header = {'instrume': 'AIA', 'wavelnth': i}
+        assert factory._get_candidate_widget_types(header, validate) == [InstrumentWidget]
+    assert InstrumentWidget.calls == 1
+
+    # CameraWidget looks at camera only when instrume is not MDI
+    assert factory._get_candidate_widget_types({'instrume': 'X', 'camera': 'MDI'},
+                                               validate) == [CameraWidget]
+    assert factory._get_candidate_widget_types({'instrume': 'X', 'camera': 'Y'},
+                                               validate) == []
+    assert factory._get_candidate_widget_types({'instrume': 'AIA', 'camera': 'MDI'},
+                                               validate) == [InstrumentWidget, CameraWidget]
+
+    # Different cache keys and a changed registry are resolved again
+    calls = InstrumentWidget.calls
+    factory._get_candidate_widget_types({'instrume': 'AIA'}, validate, cache_key=1)
+    assert InstrumentWidget.calls == calls + 1
+    factory.unregister(CameraWidget)
+    assert factory._get_candidate_widget_types({'instrume': 'AIA', 'camera': 'MDI'},
+                                               validate) == [InstrumentWidget]
+    assert InstrumentWidget.calls == calls + 2
@@ -88,3 +88,16 @@ def test_no_registered_methods():
 
     with pytest.raises(TypeError):
         mm(2)
+
+
+def test_add_resets_cache():
+    mm = MultiMethod(lambda *a: a)
+    mm.add(lambda x: 'number', (float, ))
+    assert mm(1.0) == 'number'
+
+    class Float(float):
+        pass
+
+    assert mm(Float(1.0)) == 'number'
+    mm.add(lambda x: 'float subclass', (Float, ))
+    assert mm(Float(1.0)) == 'float subclass'
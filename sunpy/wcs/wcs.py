@@ -29,6 +29,72 @@ def _convert_angle_units(unit='arcsec'):
     else:
         raise ValueError("The units specified are either invalid or is not supported at this time.")
 
+# The conversions between the coordinate systems. They take and return angles
+# in radians and distances in meters, and work on arrays of any shape. The
+# trigonometric terms of the observer position are computed once per call,
+# not once per point.
+
+def _hpc_to_hcc(x, y, dsun, rsun=rsun_meters):
+    """Helioprojective-Cartesian to Heliocentric-Cartesian coordinates, for
+    points on the solar surface. Returns x, y and z; NaN off the disk."""
+    cosx = np.cos(x)
+    cosy = np.cos(y)
+    q = dsun * cosy * cosx
+    with np.errstate(invalid='ignore'):
+        distance = q - np.sqrt(q ** 2 - dsun ** 2 + rsun ** 2)
+
+    rx = distance * cosy * np.sin(x)
+    ry = distance * np.sin(y)
+    rz = dsun - distance * cosy * cosx
+    return rx, ry, rz
+
+
+def _hcc_to_hpc(x, y, dsun, z=None, rsun=rsun_meters):
+    """Heliocentric-Cartesian to Helioprojective-Cartesian coordinates. If z
+    is not given, the points are assumed to be on the solar surface."""
+    if z is None:
+        with np.errstate(invalid='ignore'):
+            z = np.sqrt(rsun ** 2 - x ** 2 - y ** 2)
+
+    zeta = dsun - z
+    distance = np.sqrt(x ** 2 + y ** 2 + zeta ** 2)
+    return np.arctan2(x, zeta), np.arcsin(y / distance)
+
+
+def _hcc_to_hg(x, y, z=None, b0=0, l0=0, rsun=rsun_meters):
+    """Heliocentric-Cartesian to Stonyhurst Heliographic coordinates.
+    Returns longitude, latitude and radius. If z is not given, the points
+    are assumed to be on the solar surface."""
+    if z is None:
+        with np.errstate(invalid='ignore'):
+            z = np.sqrt(rsun ** 2 - x ** 2 - y ** 2)
+
+    cosb = np.cos(b0)
+    sinb = np.sin(b0)
+
+    hecr = np.sqrt(x ** 2 + y ** 2 + z ** 2)
+    hgln = np.arctan2(x, z * cosb - y * sinb) + l0
+    hglt = np.arcsin((y * cosb + z * sinb) / hecr)
+    return hgln, hglt, hecr
+
+
+def _hg_to_hcc(lon, lat, b0=0, l0=0, r=rsun_meters):
+    """Stonyhurst Heliographic to Heliocentric-Cartesian coordinates.
+    Returns x, y and z."""
+    cosb = np.cos(b0)
+    sinb = np.sin(b0)
+
+    lon = lon - l0
+    cosx = np.cos(lon)
+    cosy = np.cos(lat)
+    siny = np.sin(lat)
+
+    x = r * cosy * np.sin(lon)
+    y = r * (siny * cosb - cosy * cosx * sinb)
+    z = r * (siny * sinb + cosy * cosx * cosb)
+    return x, y, z
+
+
 @deprecated("0.8.0", alternative="sunpy.map.GenericMap.pixel_to_data")
 def convert_pixel_to_data(size, scale, reference_pixel,
                           reference_coordinate, x=None, y=None):
@@ -175,28 +241,14 @@ def convert_hpc_hcc(x, y, dsun_meters=None, angle_units='arcsec', z=False):
     (28876152.176423457, 23100922.071266972, 694524220.8157959)
 
     """
-    c = np.array([_convert_angle_units(unit=angle_units),
-                  _convert_angle_units(unit=angle_units)])
-
-    cosx = np.cos(x * c[0])
-    sinx = np.sin(x * c[0])
-    cosy = np.cos(y * c[1])
-    siny = np.sin(y * c[1])
+    c = _convert_angle_units(unit=angle_units)
 
     if dsun_meters is None:
         dsun_meters = sun.constants.au.si.value
     elif isinstance(dsun_meters, u.Quantity):
         dsun_meters = dsun_meters.si.value
 
-    q = dsun_meters * cosy * cosx
-    distance = q ** 2 - dsun_meters ** 2 + rsun_meters ** 2
-    # distance[np.where(distance < 0)] = np.sqrt(-1)
-    distance = q - np.sqrt(distance)
-
-    rx = distance * cosy * sinx
-    ry = distance * siny
-    rz = dsun_meters - distance * cosy * cosx
-
+    rx, ry, rz = _hpc_to_hcc(x * c, y * c, dsun_meters)
 
     if np.all(z == True):
         return rx, ry, rz
@@ -236,18 +288,14 @@ def convert_hcc_hpc(x, y, dsun_meters=None, angle_units='arcsec'):
 
     """
 
-    # Calculate the z coordinate by assuming that it is on the surface of the Sun
-    z = np.sqrt(rsun_meters ** 2 - x ** 2 - y ** 2)
-
     if dsun_meters is None:
         dsun_meters = sun.constants.au.si.value
     elif isinstance(dsun_meters, u.Quantity):
         dsun_meters = dsun_meters.si.value
 
-    zeta = dsun_meters - z
-    distance = np.sqrt(x**2 + y**2 + zeta**2)
-    hpcx = np.rad2deg(np.arctan2(x, zeta))
-    hpcy = np.rad2deg(np.arcsin(y / distance))
+    hpcx, hpcy = _hcc_to_hpc(x, y, dsun_meters)
+    hpcx = np.rad2deg(hpcx)
+    hpcy = np.rad2deg(hpcy)
 
     if angle_units == 'arcsec':
         hpcx = 60 * 60 * hpcx
@@ -302,15 +350,8 @@ def convert_hcc_hg(x, y, z=None, b0_deg=0, l0_deg=0, radius=False):
     ...                          z=695508000.0 + 8000000.0, radius=True)
     (0.01873188196651189, 3.6599471896203317, 704945784.41465974)
     """
-    if z is None:
-        z = np.sqrt(rsun_meters**2 - x**2 - y**2)
-
-    cosb = np.cos(np.deg2rad(b0_deg))
-    sinb = np.sin(np.deg2rad(b0_deg))
-
-    hecr = np.sqrt(x**2 + y**2 + z**2)
-    hgln = np.arctan2(x, z * cosb - y * sinb) + np.deg2rad(l0_deg)
-    hglt = np.arcsin((y * cosb + z * sinb) / hecr)
+    hgln, hglt, hecr = _hcc_to_hg(x, y, z, np.deg2rad(b0_deg),
+                                  np.deg2rad(l0_deg))
 
     if radius:
         return np.rad2deg(hgln), np.rad2deg(hglt), hecr
@@ -360,23 +401,8 @@ def convert_hg_hcc(hglon_deg, hglat_deg, b0_deg=0, l0_deg=0, occultation=False,
     ...                          r=704945784.41465974, z=True)
     (230000.0, 45000000.0, 703508000.0)
     """
-    lon = np.deg2rad(hglon_deg)
-    lat = np.deg2rad(hglat_deg)
-
-    cosb = np.cos(np.deg2rad(b0_deg))
-    sinb = np.sin(np.deg2rad(b0_deg))
-
-    lon = lon - np.deg2rad(l0_deg)
-
-    cosx = np.cos(lon)
-    sinx = np.sin(lon)
-    cosy = np.cos(lat)
-    siny = np.sin(lat)
-
-    # Perform the conversion.
-    x = r * cosy * sinx
-    y = r * (siny * cosb - cosy * cosx * sinb)
-    zz = r * (siny * sinb + cosy * cosx * cosb)
+    x, y, zz = _hg_to_hcc(np.deg2rad(hglon_deg), np.deg2rad(hglat_deg),
+                          np.deg2rad(b0_deg), np.deg2rad(l0_deg), r)
 
     if occultation:
         x[zz < 0] = np.nan